@@ -0,0 +1,114 @@
+"""Seeded generator of synthetic left and right datasets for the benchmarks."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+RelationshipType = Literal["1:1", "1:m", "m:1", "m:m"]
+
+FORMATS = {
+    "csv": lambda df, path: df.to_csv(path, index=False),
+    "parquet": lambda df, path: df.to_parquet(path, index=False),
+    "feather": lambda df, path: df.to_feather(path),
+    "xlsx": lambda df, path: df.to_excel(path, index=False),
+}
+"""Writers by file format, which is also the file extension."""
+
+
+def _keys(
+    rng: np.random.Generator, keys: np.ndarray, rows: int, many: bool
+) -> np.ndarray:
+    """Returns `rows` keys, repeating keys 1-4 times when `many`."""
+    if many:
+        keys = np.repeat(keys, rng.integers(1, 5, len(keys)))
+    return rng.permutation(keys[:rows])
+
+
+def _columns(
+    rng: np.random.Generator, rows: int, columns: int, prefix: str
+) -> dict[str, np.ndarray]:
+    """Returns value columns cycling through integer, float, date and text."""
+    generators = [
+        lambda: rng.integers(0, 1_000_000, rows),
+        lambda: np.round(rng.normal(1_000, 250, rows), 2),
+        lambda: np.datetime64("2020-01-01")
+        + rng.integers(0, 1_500, rows).astype("timedelta64[D]"),
+        lambda: np.array([f"{prefix}{i}" for i in range(50)])[
+            rng.integers(0, 50, rows)
+        ],
+    ]
+    return {f"col_{i}": generators[i % len(generators)]() for i in range(columns)}
+
+
+def _duplicate(rng: np.random.Generator, df: pd.DataFrame, rate: float) -> pd.DataFrame:
+    """Overwrites a fraction `rate` of the records with copies of other records."""
+    copies = int(len(df) * rate)
+    if not copies or len(df) < 2:
+        return df
+
+    targets = rng.choice(len(df), copies, replace=False)
+    sources = rng.integers(0, len(df), copies)
+    df.iloc[targets] = df.iloc[sources].to_numpy()
+    return df
+
+
+def generate(
+    rows: int = 100_000,
+    columns: int = 8,
+    overlap: float = 0.8,
+    duplicate_rate: float = 0.01,
+    relationship: RelationshipType = "1:1",
+    seed: int = 0,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns a left and right dataset of about `rows` records each, keyed on `key`
+    with `columns` value columns.
+
+    A fraction `overlap` of the right keys is drawn from the left keys. The many
+    side(s) of `relationship` repeat keys 1-4 times. A fraction `duplicate_rate`
+    of each dataset's records are exact copies of other records.
+    """
+    if relationship not in ("1:1", "1:m", "m:1", "m:m"):
+        raise ValueError(f"Unknown relationship type ({relationship}).")
+    if not 0 <= overlap <= 1:
+        raise ValueError("overlap must be between 0 and 1.")
+
+    rng = np.random.default_rng(seed)
+    left_many, right_many = (side == "m" for side in relationship.split(":"))
+
+    universe = np.array([f"K{i:010d}" for i in rng.permutation(rows * 3)])
+    left_keys = universe[:rows]
+    shared = int(rows * overlap)
+    right_keys = np.concatenate(
+        [rng.permutation(left_keys)[:shared], universe[rows : 2 * rows - shared]]
+    )
+
+    frames = []
+    for keys, many, prefix in (
+        (left_keys, left_many, "left"),
+        (right_keys, right_many, "right"),
+    ):
+        keys = _keys(rng, keys, rows, many)
+        df = pd.DataFrame({"key": keys, **_columns(rng, len(keys), columns, prefix)})
+        frames.append(_duplicate(rng, df, duplicate_rate))
+
+    return frames[0], frames[1]
+
+
+def write(
+    left: pd.DataFrame, right: pd.DataFrame, directory: Path, format: str = "csv"
+) -> tuple[Path, Path]:
+    """Writes both datasets to `directory` and returns their paths."""
+    if format not in FORMATS:
+        raise ValueError(
+            f"Unknown format ({format}). Available formats: {', '.join(FORMATS)}."
+        )
+
+    paths = directory / f"left.{format}", directory / f"right.{format}"
+    for df, path in zip((left, right), paths):
+        FORMATS[format](df, path)
+
+    return paths
@@ -0,0 +1,250 @@
+"""
+Times every stage of a reconciliation of synthetic datasets and records the
+process' peak memory, optionally comparing the results against a baseline.
+
+    python -m benchmarks.run --rows 1000000 --output baseline.json
+    python -m benchmarks.run --rows 1000000 --baseline baseline.json
+"""
+from __future__ import annotations
+
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import typer
+from typing_extensions import Annotated
+
+from benchmarks.generate import FORMATS, generate, write
+from recon.reconcile import Reconcile
+
+Step = Callable[[Reconcile, Path], Any]
+
+STEPS: list[tuple[str, Step]] = [
+    ("all_data", lambda recon, _: recon.all_data),
+    ("both", lambda recon, _: recon.both),
+    ("left_both", lambda recon, _: recon.left_both),
+    ("right_both", lambda recon, _: recon.right_both),
+    ("left_only", lambda recon, _: recon.left_only),
+    ("right_only", lambda recon, _: recon.right_only),
+    ("left_duplicate", lambda recon, _: recon.left_duplicate),
+    ("right_duplicate", lambda recon, _: recon.right_duplicate),
+    ("info", lambda recon, _: recon.info()),
+    ("to_xlsx", lambda recon, directory: recon.to_xlsx(directory / "output.xlsx")),
+    ("to_stdout", lambda recon, _: recon.to_stdout()),
+]
+"""Steps timed after `read_files`, in order, on the same Reconcile object."""
+
+NOISE_SECONDS = 0.05
+"""Steps quicker than this, in both runs, are never reported as regressions."""
+
+
+def peak_rss_mb() -> float:
+    """Returns the peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in KiB elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _time(function: Callable[[], Any]) -> dict[str, Optional[float]]:
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        try:
+            function()
+        except ValueError:
+            # e.g. components too large for an xlsx worksheet
+            return {"seconds": None, "peak_rss_mb": peak_rss_mb()}
+        seconds = time.perf_counter() - start
+
+    return {"seconds": seconds, "peak_rss_mb": peak_rss_mb()}
+
+
+def _generate_files(directory: Path, format: str, *args) -> tuple[Path, Path]:
+    left, right = generate(*args)
+    return write(left, right, directory, format)
+
+
+def run_once(
+    left: Path, right: Path, directory: Path, workers: int = 1
+) -> dict[str, dict]:
+    """Reads and reconciles the datasets once, timing every step."""
+    recon = None
+
+    def read_files():
+        nonlocal recon
+        recon = Reconcile.read_files(
+            left, right, left_on="key", right_on="key", workers=workers
+        )
+
+    results = {"read_files": _time(read_files)}
+    for name, step in STEPS:
+        results[name] = _time(lambda: step(recon, directory))
+
+    return results
+
+
+def run(left: Path, right: Path, repeat: int = 3, workers: int = 1) -> dict[str, dict]:
+    """
+    Returns the quickest time of every step across :param:`repeat` runs, and the
+    peak RSS once the step finished. Peak RSS never decreases, so a step's
+    increase over the previous one is what it allocated beyond earlier peaks.
+    """
+    best: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(repeat):
+            for name, result in run_once(left, right, Path(directory), workers).items():
+                if name not in best:
+                    best[name] = result
+                    continue
+                if result["seconds"] is not None and (
+                    best[name]["seconds"] is None
+                    or result["seconds"] < best[name]["seconds"]
+                ):
+                    best[name]["seconds"] = result["seconds"]
+                best[name]["peak_rss_mb"] = max(
+                    best[name]["peak_rss_mb"], result["peak_rss_mb"]
+                )
+
+    return best
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Returns the steps which are more than `threshold` times slower or larger."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        seconds, base_seconds = result["seconds"], base["seconds"]
+        if (
+            seconds is not None
+            and base_seconds is not None
+            and max(seconds, base_seconds) >= NOISE_SECONDS
+            and seconds > base_seconds * threshold
+        ):
+            regressions.append(
+                f"{name}: {seconds:.3f}s vs. {base_seconds:.3f}s "
+                f"({seconds / base_seconds:.2f}x)"
+            )
+        if result["peak_rss_mb"] > base["peak_rss_mb"] * threshold:
+            regressions.append(
+                f"{name}: peak RSS {result['peak_rss_mb']:,.0f} MiB vs. "
+                f"{base['peak_rss_mb']:,.0f} MiB"
+            )
+
+    return regressions
+
+
+def _format(result: Optional[dict], key: str) -> str:
+    if result is None or result[key] is None:
+        return "-"
+    return f"{result[key]:.3f}" if key == "seconds" else f"{result[key]:,.0f}"
+
+
+def report(results: dict[str, dict], baseline: Optional[dict[str, dict]]) -> str:
+    lines = [
+        f"{'step':<16}{'seconds':>10}{'baseline':>10}{'peak MiB':>10}"
+        f"{'baseline':>10}"
+    ]
+    for name, result in results.items():
+        base = baseline.get(name) if baseline else None
+        lines.append(
+            f"{name:<16}{_format(result, 'seconds'):>10}"
+            f"{_format(base, 'seconds'):>10}"
+            f"{_format(result, 'peak_rss_mb'):>10}"
+            f"{_format(base, 'peak_rss_mb'):>10}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(
+    rows: Annotated[int, typer.Option(help="Records per dataset.")] = 100_000,
+    columns: Annotated[int, typer.Option(help="Value columns per dataset.")] = 8,
+    overlap: Annotated[
+        float, typer.Option(help="Fraction of the right keys found on the left.")
+    ] = 0.8,
+    duplicates: Annotated[
+        float, typer.Option(help="Fraction of records which are exact copies.")
+    ] = 0.01,
+    relationship: Annotated[
+        str, typer.Option(help="Key relationship: 1:1, 1:m, m:1 or m:m.")
+    ] = "1:1",
+    seed: Annotated[int, typer.Option(help="Random seed.")] = 0,
+    format: Annotated[
+        str, typer.Option(help=f"Input file format: {', '.join(FORMATS)}.")
+    ] = "csv",
+    repeat: Annotated[
+        int, typer.Option(help="Runs per step, keeping the quickest.")
+    ] = 3,
+    workers: Annotated[
+        int, typer.Option(help="Processes classifying the records, see all_data.")
+    ] = 1,
+    output: Annotated[
+        Optional[Path], typer.Option(help="Saves the results as JSON.")
+    ] = None,
+    baseline: Annotated[
+        Optional[Path],
+        typer.Option(help="Compares against results saved with --output."),
+    ] = None,
+    threshold: Annotated[
+        float, typer.Option(help="Slowdown or growth ratio reported as a regression.")
+    ] = 1.25,
+):
+    params = {
+        "rows": rows,
+        "columns": columns,
+        "overlap": overlap,
+        "duplicates": duplicates,
+        "relationship": relationship,
+        "seed": seed,
+        "format": format,
+        "workers": workers,
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Generated in a child process so that it doesn't raise this one's peak RSS
+        with ProcessPoolExecutor(1) as pool:
+            left_path, right_path = pool.submit(
+                _generate_files,
+                Path(directory),
+                format,
+                rows,
+                columns,
+                overlap,
+                duplicates,
+                relationship,
+                seed,
+            ).result()
+        results = run(left_path, right_path, repeat, workers)
+
+    base = None
+    if baseline is not None:
+        saved = json.loads(baseline.read_text())
+        if saved["params"] != params:
+            print(f"Warning: the baseline was run with {saved['params']}.")
+        base = saved["steps"]
+
+    print(report(results, base))
+
+    if output is not None:
+        output.write_text(json.dumps({"params": params, "steps": results}, indent=2))
+
+    if base is not None:
+        regressions = compare(results, base, threshold)
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(regressions))
+            raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
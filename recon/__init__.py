@@ -1,3 +1,16 @@
+from recon.batch import BatchJob
+from recon.partition import reconcile_partitioned
+from recon.readers import register_reader
 from recon.reconcile import Reconcile, Relationship
+from recon.sketch import KeySketch
+from recon.snapshot import Snapshot
 
-__all__ = ["Reconcile", "Relationship"]
+__all__ = [
+    "BatchJob",
+    "KeySketch",
+    "Reconcile",
+    "Relationship",
+    "Snapshot",
+    "reconcile_partitioned",
+    "register_reader",
+]
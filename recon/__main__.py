@@ -1 +1,3 @@
-from recon.main import app  # noqa
+from recon.main import app
+
+app()
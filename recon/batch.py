@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from recon.reconcile import DEFAULT_SUFFIXES, Key, Reconcile, ReconciledStats
+from recon.utils import FilePath, ensure_list
+
+MEMORY_PER_INPUT_BYTE = 5
+"""
+Rough in-memory size of a dataset per byte of its file, used to estimate the
+memory a job needs when its `memory_mb` isn't given.
+"""
+
+READ_OPTIONS = (
+    "columns",
+    "dtype_backend",
+    "key_normalizers",
+    "fuzzy_threshold",
+    "match_tolerance",
+    "engine",
+)
+"""Job options passed onto :meth:`Reconcile.read_df`, or used to read the files."""
+
+
+@dataclass
+class BatchJob:
+    name: str
+    left: FilePath
+    right: FilePath
+    left_on: Key
+    right_on: Key
+    output_file: Optional[str] = None
+    """Path to save the components to. `{name}` is replaced by the job's name."""
+    recon_components: list[str] = field(default_factory=lambda: ["all"])
+    suffixes: tuple[str, str] = DEFAULT_SUFFIXES
+    left_kwargs: dict[str, Any] = field(default_factory=dict)
+    right_kwargs: dict[str, Any] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)
+    """Any of `READ_OPTIONS`."""
+    memory_mb: Optional[int] = None
+    """Memory the job needs, estimated from the size of its files by default."""
+
+    def __post_init__(self) -> None:
+        unknown = [option for option in self.options if option not in READ_OPTIONS]
+        if unknown:
+            raise ValueError(
+                f"Unknown options ({', '.join(unknown)}) for job {self.name}. "
+                f"Available options: {', '.join(READ_OPTIONS)}."
+            )
+
+    @property
+    def output_path(self) -> Optional[str]:
+        if self.output_file is None:
+            return None
+        return self.output_file.replace("{name}", self.name)
+
+    def estimated_bytes(self) -> int:
+        if self.memory_mb is not None:
+            return self.memory_mb * 1024**2
+        size = sum(
+            os.path.getsize(path)
+            for path in (self.left, self.right)
+            if os.path.exists(path)
+        )
+        return size * MEMORY_PER_INPUT_BYTE
+
+
+@dataclass
+class BatchResult:
+    name: str
+    seconds: float = 0.0
+    relationship: Optional[str] = None
+    left_stats: Optional[ReconciledStats] = None
+    right_stats: Optional[ReconciledStats] = None
+    output_file: Optional[str] = None
+    error: Optional[str] = None
+    """Why the job failed, or None if it succeeded."""
+
+
+_shared_frames: dict[tuple, pd.DataFrame] = {}
+"""Datasets used by several jobs, read once per worker process."""
+
+
+def _read_key(path: FilePath, columns, kwargs: dict[str, Any]) -> tuple:
+    return (
+        str(Path(path).resolve()),
+        None if columns is None else tuple(columns),
+        json.dumps(kwargs, sort_keys=True, default=str),
+    )
+
+
+def _read(
+    path: FilePath, columns, kwargs: dict[str, Any], shared: bool
+) -> pd.DataFrame:
+    if not shared:
+        return Reconcile._read_obj(path, columns=columns, **kwargs)
+
+    key = _read_key(path, columns, kwargs)
+    if key not in _shared_frames:
+        _shared_frames[key] = Reconcile._read_obj(path, columns=columns, **kwargs)
+    return _shared_frames[key]
+
+
+def _columns(job: BatchJob, on: Key) -> Optional[list[str]]:
+    """Columns loaded for one side, as :meth:`Reconcile.read_files` does."""
+    columns = job.options.get("columns")
+    if columns is None:
+        return None
+    return [*ensure_list(on), *columns, *(job.options.get("match_tolerance") or {})]
+
+
+def run_job(job: BatchJob, shared: tuple[bool, bool] = (False, False)) -> BatchResult:
+    """
+    Reconciles a single job, saving its components if it has an `output_file`.
+    Shared inputs are kept in memory for later jobs of the same process. Errors
+    are reported on the result rather than raised.
+    """
+    start = time.perf_counter()
+    try:
+        left_df = _read(
+            job.left, _columns(job, job.left_on), job.left_kwargs, shared[0]
+        )
+        right_df = _read(
+            job.right, _columns(job, job.right_on), job.right_kwargs, shared[1]
+        )
+        options = {k: v for k, v in job.options.items() if k != "columns"}
+        recon = Reconcile.read_df(
+            left_df, right_df, job.left_on, job.right_on, job.suffixes, **options
+        )
+        recon.left_sheet_name = job.left_kwargs.get("sheet_name", None)
+        recon.right_sheet_name = job.right_kwargs.get("sheet_name", None)
+
+        output_file = job.output_path
+        if output_file is not None:
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+            recon.to_file(output_file, job.recon_components)
+
+        return BatchResult(
+            name=job.name,
+            seconds=time.perf_counter() - start,
+            relationship=recon.relationship.name,
+            left_stats=recon.left_stats,
+            right_stats=recon.right_stats,
+            output_file=output_file,
+        )
+    except Exception as e:
+        return BatchResult(
+            name=job.name,
+            seconds=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+def _shared_inputs(jobs: list[BatchJob]) -> list[tuple[bool, bool]]:
+    """Whether each side of every job reads a file which another side also reads."""
+    keys = [
+        (
+            _read_key(job.left, _columns(job, job.left_on), job.left_kwargs),
+            _read_key(job.right, _columns(job, job.right_on), job.right_kwargs),
+        )
+        for job in jobs
+    ]
+    counts = Counter(key for pair in keys for key in pair)
+    return [(counts[left] > 1, counts[right] > 1) for left, right in keys]
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    processes: Optional[int] = None,
+    memory_budget_mb: Optional[int] = None,
+) -> list[BatchResult]:
+    """
+    Runs the jobs on a pool of :param:`processes`, returning their results in the
+    order of `jobs`.
+
+    Jobs are started in order as long as the estimated memory of the running jobs
+    stays within :param:`memory_budget_mb`, though at least one job always runs.
+    Files read by several jobs are read once per worker process and reused.
+    """
+    shared = _shared_inputs(jobs)
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1:
+        try:
+            return [run_job(job, sides) for job, sides in zip(jobs, shared)]
+        finally:
+            _shared_frames.clear()
+
+    budget = None if memory_budget_mb is None else memory_budget_mb * 1024**2
+    results: dict[int, BatchResult] = {}
+    running: dict[Future, tuple[int, int]] = {}
+    pending = list(enumerate(jobs))
+
+    with ProcessPoolExecutor(processes) as executor:
+        while pending or running:
+            in_use = sum(estimate for _, estimate in running.values())
+            while pending and len(running) < processes:
+                i, job = pending[0]
+                estimate = job.estimated_bytes()
+                if running and budget is not None and in_use + estimate > budget:
+                    break
+
+                pending.pop(0)
+                running[executor.submit(run_job, job, shared[i])] = (i, estimate)
+                in_use += estimate
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, _ = running.pop(future)
+                results[i] = future.result()
+
+    return [results[i] for i in range(len(jobs))]
+
+
+def summary(results: list[BatchResult]) -> pd.DataFrame:
+    """Returns one row per job with its status, relationship and stats."""
+    rows = []
+    for result in results:
+        row: dict[str, Any] = {
+            "name": result.name,
+            "status": "failed" if result.error else "ok",
+            "seconds": round(result.seconds, 3),
+            "relationship": result.relationship,
+        }
+        for side, stats in (
+            ("left", result.left_stats),
+            ("right", result.right_stats),
+        ):
+            for name in ReconciledStats.__dataclass_fields__:
+                row[f"{side}_{name}"] = None if stats is None else getattr(stats, name)
+        row["output_file"] = result.output_file
+        row["error"] = result.error
+        rows.append(row)
+
+    frame = pd.DataFrame(rows)
+    stats = [col for col in frame.columns if col.startswith(("left_", "right_"))]
+    return frame.astype({col: "Int64" for col in stats})
+
+
+def _load_yaml(text: str) -> Any:
+    try:
+        import yaml
+    except ImportError as e:
+        raise ImportError(
+            "Reading YAML manifests requires PyYAML. Install it with "
+            "`pip install pyyaml`, or write the manifest as JSON."
+        ) from e
+    return yaml.safe_load(text)
+
+
+def load_manifest(path: FilePath) -> tuple[list[BatchJob], dict[str, Any]]:
+    """
+    Reads a YAML or JSON manifest of jobs. Returns the jobs, with the manifest's
+    `defaults` applied to each of them, and its remaining settings:
+    `processes`, `memory_budget_mb` and `summary`. Relative file paths are
+    resolved against the manifest's directory.
+    """
+    path = Path(path)
+    text = path.read_text()
+    manifest = json.loads(text) if path.suffix.lower() == ".json" else _load_yaml(text)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+        raise ValueError(f"{path} must hold a mapping with a list of jobs.")
+
+    defaults = manifest.get("defaults") or {}
+    base = path.parent
+    jobs = []
+    for i, entry in enumerate(manifest["jobs"]):
+        spec = {"name": f"job-{i + 1}", **defaults, **entry}
+        missing = [
+            key for key in ("left", "right", "left_on", "right_on") if key not in spec
+        ]
+        if missing:
+            raise ValueError(f"Job {spec['name']} is missing {', '.join(missing)}.")
+
+        options = {key: spec.pop(key) for key in READ_OPTIONS if key in spec}
+        for key in ("left", "right", "output_file"):
+            if spec.get(key) is not None:
+                spec[key] = str(base / spec[key])
+        if "suffixes" in spec:
+            spec["suffixes"] = tuple(spec["suffixes"])
+
+        try:
+            jobs.append(BatchJob(**spec, options=options))
+        except TypeError as e:
+            raise ValueError(f"Job {spec['name']} is invalid: {e}") from None
+
+    settings = {
+        key: manifest[key]
+        for key in ("processes", "memory_budget_mb", "summary")
+        if key in manifest
+    }
+    if "summary" in settings:
+        settings["summary"] = str(base / settings["summary"])
+
+    return jobs, settings
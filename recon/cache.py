@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from recon.utils import FilePath
+
+CACHE_VERSION = 1
+"""Bump to invalidate entries written by older versions."""
+
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024**3
+
+
+class InputCache:
+    """
+    On-disk cache of parsed datasets, so that repeated runs against the same file
+    skip parsing it.
+
+    Entries are keyed by the file's resolved path, size and modification time (or
+    content hash when `content_hash` is set) together with the reader arguments.
+    They are stored as Feather files where the DataFrame allows it, otherwise
+    pickled. The least recently used entries are evicted once the cache grows
+    beyond `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: FilePath,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        content_hash: bool = False,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def key(self, data: Any, **kwargs) -> Optional[str]:
+        """
+        Returns the cache key for reading `data` with `kwargs`, or None when the
+        input can't be cached: streams, missing files and arguments which can't be
+        serialised deterministically, such as callables.
+        """
+        if not isinstance(data, (str, PathLike)):
+            return None
+
+        try:
+            file = Path(data).resolve()
+            stat = file.stat()
+        except OSError:
+            return None
+
+        fingerprint: dict[str, Any] = {
+            "version": CACHE_VERSION,
+            "pandas": pd.__version__,
+            "path": str(file),
+            "size": stat.st_size,
+            "kwargs": kwargs,
+        }
+        if self.content_hash:
+            fingerprint["sha256"] = _file_digest(file)
+        else:
+            fingerprint["mtime_ns"] = stat.st_mtime_ns
+
+        try:
+            serialised = json.dumps(fingerprint, sort_keys=True)
+        except TypeError:
+            return None
+
+        return hashlib.sha256(serialised.encode()).hexdigest()
+
+    def _entries(self, key: str) -> list[Path]:
+        return [self.path / f"{key}.feather", self.path / f"{key}.pkl"]
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        for entry in self._entries(key):
+            if not entry.exists():
+                continue
+
+            try:
+                if entry.suffix == ".feather":
+                    df = pd.read_feather(entry)
+                else:
+                    df = pd.read_pickle(entry)
+            except Exception:
+                # Corrupt or unreadable entries are treated as a miss
+                entry.unlink(missing_ok=True)
+                return None
+
+            # Refresh the entry's position within the LRU order
+            os.utime(entry)
+            return df
+
+        return None
+
+    def store(self, key: str, df: pd.DataFrame) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(fd)
+
+        try:
+            try:
+                df.to_feather(tmp)
+                entry = self.path / f"{key}.feather"
+            except Exception:
+                # Non-default indexes and mixed type columns aren't supported by
+                # Feather.
+                df.to_pickle(tmp, protocol=pickle.HIGHEST_PROTOCOL)
+                entry = self.path / f"{key}.pkl"
+            os.replace(tmp, entry)
+        finally:
+            Path(tmp).unlink(missing_ok=True)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until within `max_bytes`."""
+        entries = [
+            (entry.stat(), entry)
+            for entry in self.path.iterdir()
+            if entry.suffix in (".feather", ".pkl")
+        ]
+        total = sum(stat.st_size for stat, _ in entries)
+
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def read(
+        self, reader: Callable[..., pd.DataFrame], data: Any, **kwargs
+    ) -> pd.DataFrame:
+        """Returns the cached DataFrame for `data`, reading and storing it on a miss."""
+        key = self.key(data, **kwargs)
+        if key is None:
+            return reader(data, **kwargs)
+
+        df = self.load(key)
+        if df is None:
+            df = reader(data, **kwargs)
+            self.store(key, df)
+
+        return df
+
+
+def _file_digest(file: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
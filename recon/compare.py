@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+Tolerance = Union[float, str, pd.Timedelta]
+"""
+Largest difference still treated as equal: a number for numeric columns, or a
+`pandas.Timedelta` (or string such as "1D") for date columns.
+"""
+
+
+def _is_numeric(values: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(values.dtype)
+
+
+def _is_datetime(values: pd.Series) -> bool:
+    return pd.api.types.is_datetime64_any_dtype(values.dtype)
+
+
+def _equal(left: pd.Series, right: pd.Series, tolerance: Tolerance) -> np.ndarray:
+    """Compares non-missing values. Missing values compare as not equal."""
+    if _is_numeric(left) and _is_numeric(right):
+        tolerance = tolerance if isinstance(tolerance, (int, float)) else 0
+        difference = left.to_numpy(dtype="float64", na_value=np.nan) - right.to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+        return np.abs(difference) <= tolerance
+
+    if _is_datetime(left) and _is_datetime(right):
+        tolerance = (
+            pd.Timedelta(0)
+            if isinstance(tolerance, (int, float))
+            else pd.Timedelta(tolerance)
+        )
+        return ((left - right).abs() <= tolerance).fillna(False).to_numpy(dtype=bool)
+
+    if left.dtype == right.dtype:
+        equal = left == right
+    else:
+        # Values of different kinds, e.g. numbers and strings, compare as text
+        equal = left.astype("string") == right.astype("string")
+
+    return equal.fillna(False).to_numpy(dtype=bool)
+
+
+def mismatches(
+    left: pd.Series, right: pd.Series, tolerance: Tolerance = 0
+) -> np.ndarray:
+    """
+    Returns whether each pair of values differs, comparing column-wise. Missing
+    values equal each other and differ from any value.
+    """
+    left = left.reset_index(drop=True)
+    right = right.reset_index(drop=True)
+
+    left_missing = left.isna().to_numpy()
+    right_missing = right.isna().to_numpy()
+
+    return ~(left_missing & right_missing) & (
+        (left_missing ^ right_missing) | ~_equal(left, right, tolerance)
+    )
@@ -0,0 +1,554 @@
+from __future__ import annotations
+
+import numbers
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Classification:
+    """
+    Row positions of every recon component.
+
+    Positions index into the original left and right datasets. The `*_index`
+    arrays hold the row numbers each record occupies within `all_data`, which
+    lists records grouped by key in order of first appearance.
+    """
+
+    left_counts: np.ndarray
+    """Number of left records per key code."""
+    right_counts: np.ndarray
+    """Number of right records per key code."""
+    left_only: np.ndarray
+    right_only: np.ndarray
+    left_both: np.ndarray
+    right_both: np.ndarray
+    both_left: np.ndarray
+    """Left position of every matched pair."""
+    both_right: np.ndarray
+    """Right position of every matched pair."""
+    both_index: np.ndarray
+    left_only_index: np.ndarray
+    right_only_index: np.ndarray
+
+    def __post_init__(self) -> None:
+        # Positions are stored as int32 where they fit, halving their memory
+        if self.size <= np.iinfo(np.int32).max:
+            for name in self.__dataclass_fields__:
+                array = getattr(self, name)
+                if array.dtype.kind == "i" and array.dtype.itemsize > 4:
+                    setattr(self, name, array.astype(np.int32))
+
+    @property
+    def size(self) -> int:
+        """Number of records in `all_data`."""
+        return len(self.both_index) + len(self.left_only) + len(self.right_only)
+
+
+def code_dtype(n_keys: int) -> type:
+    """Returns the narrowest of int32 and int64 able to hold `n_keys` codes."""
+    return np.int32 if n_keys <= np.iinfo(np.int32).max else np.int64
+
+
+def _is_text(values: pd.Series) -> bool:
+    dtype = values.dtype
+    if isinstance(dtype, pd.StringDtype):
+        return True
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(
+            dtype.pyarrow_dtype
+        )
+    return False
+
+
+def _arrow_factorize(
+    left: pd.Series, right: pd.Series
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Dictionary encodes both sides' strings with Arrow as a single chunked array,
+    which shares one dictionary without concatenating the columns. Arrow hashes
+    the string buffers directly rather than one Python object at a time.
+    """
+    import pyarrow as pa
+
+    chunks = []
+    for values in (left, right):
+        array = pa.array(values.array)
+        chunks += array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+    if len({chunk.type for chunk in chunks}) > 1:
+        chunks = [chunk.cast(pa.large_string()) for chunk in chunks]
+
+    encoded = pa.chunked_array(chunks, type=chunks[0].type).dictionary_encode(
+        null_encoding="encode"
+    )
+    n_keys = len(encoded.chunks[-1].dictionary) if encoded.num_chunks else 0
+    codes = np.concatenate(
+        [chunk.indices.to_numpy(zero_copy_only=False) for chunk in encoded.chunks]
+        or [np.empty(0, dtype=np.int32)]
+    ).astype(code_dtype(n_keys), copy=False)
+
+    return codes[: len(left)], codes[len(left) :], n_keys
+
+
+def factorize_keys(
+    left: pd.Series, right: pd.Series
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Encodes the left and right keys into a shared code space of int32 codes, or
+    int64 beyond 2**31 keys.
+
+    Codes are assigned in order of first appearance, left before right. Missing
+    values are treated as a regular key, matching the behaviour of `pandas.merge`.
+    Strings are encoded with pyarrow when it's installed.
+    """
+    if _is_text(left) and _is_text(right):
+        try:
+            return _arrow_factorize(left, right)
+        except ImportError:
+            pass
+
+    codes, uniques = pd.factorize(
+        pd.concat([left, right], ignore_index=True), use_na_sentinel=False
+    )
+    codes = codes.astype(code_dtype(len(uniques)), copy=False)
+    return codes[: len(left)], codes[len(left) :], len(uniques)
+
+
+def encode_keys(
+    left: pd.DataFrame, right: pd.DataFrame
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Encodes the (composite) keys of both datasets into a shared space of dense
+    codes. Column pairs are factorized one at a time and packed into a single
+    int64 per record, so matching on several columns costs about as much as
+    matching on one, then renumbered densely as int32 where they fit.
+    """
+    left_codes, right_codes, n_keys = factorize_keys(left.iloc[:, 0], right.iloc[:, 0])
+
+    for i in range(1, left.shape[1]):
+        column_left, column_right, n_column = factorize_keys(
+            left.iloc[:, i], right.iloc[:, i]
+        )
+        if n_keys * n_column >= np.iinfo(np.int64).max:
+            left_codes, right_codes, n_keys = _densify(left_codes, right_codes)
+
+        left_codes = left_codes.astype(np.int64) * n_column + column_left
+        right_codes = right_codes.astype(np.int64) * n_column + column_right
+        n_keys *= n_column
+
+    if left.shape[1] > 1:
+        left_codes, right_codes, n_keys = _densify(left_codes, right_codes)
+
+    return left_codes, right_codes, n_keys
+
+
+def _value_hashes(values: pd.Series) -> np.ndarray:
+    """
+    Hashes a column so that equal values hash alike whatever the dtype, e.g. 3 as
+    int64, Int64, int64[pyarrow], a float or a Python int within an object
+    column. Missing values all hash alike. Values of different types, e.g. 1 and
+    "1", hash apart.
+    """
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        hashes = _numeric_hashes(values, missing)
+    elif values.dtype == object and pd.api.types.infer_dtype(
+        values, skipna=True
+    ) not in ("string", "empty"):
+        hashes = _object_hashes(values)
+    else:
+        hashes = pd.util.hash_pandas_object(
+            values.astype("string"), index=False
+        ).to_numpy()
+
+    hashes[missing] = np.iinfo(np.uint64).max
+    return hashes
+
+
+def _numeric_hashes(values: pd.Series, missing: np.ndarray) -> np.ndarray:
+    floats = values.to_numpy(dtype="float64", na_value=np.nan)
+    if pd.api.types.is_float_dtype(values.dtype):
+        integral = (np.floor(floats) == floats) & (np.abs(floats) < 2.0**63)
+        ints = np.where(integral, floats, 0).astype(np.int64)
+    else:
+        integral = ~missing
+        ints = values.to_numpy(dtype="int64", na_value=0)
+
+    return np.where(integral, pd.util.hash_array(ints), pd.util.hash_array(floats))
+
+
+def _object_hashes(values: pd.Series) -> np.ndarray:
+    """
+    Hashes an object column of mixed types. Numbers hash as within a numeric
+    column, strings as within a string column and other values as their string
+    form combined with their type.
+    """
+    objects = values.to_numpy()
+    types = np.array([type(value).__name__ for value in objects], dtype=object)
+    is_number = np.array(
+        [isinstance(value, numbers.Real) for value in objects], dtype=bool
+    )
+
+    hashes = pd.util.hash_pandas_object(values.astype("string"), index=False).to_numpy()
+    is_other = ~is_number & (types != "str")
+    hashes[is_other] ^= pd.util.hash_array(types[is_other])
+    if is_number.any():
+        number_values = pd.to_numeric(pd.Series(objects[is_number]))
+        hashes[is_number] = _numeric_hashes(
+            number_values, number_values.isna().to_numpy()
+        )
+    return hashes
+
+
+def _combine_hashes(df: pd.DataFrame) -> np.ndarray:
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    for i in range(df.shape[1]):
+        # FNV-1 style combination, overflowing as intended
+        hashes *= np.uint64(0x100000001B3)
+        hashes ^= _value_hashes(df.iloc[:, i])
+    return hashes
+
+
+def hash_keys(df: pd.DataFrame, keys: list[str]) -> np.ndarray:
+    """
+    Returns a 64-bit hash of every record's (composite) key.
+
+    Keys which match hash alike whatever the dtype pandas happened to infer, e.g.
+    4 within an int64 chunk of a file and 4.0 within a chunk with a blank key.
+    """
+    return _combine_hashes(df[keys])
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns a 64-bit hash of every record's values, ignoring the index. Values
+    hash alike across dtypes, so fingerprints taken on different runs or from
+    differently inferred chunks can be compared.
+    """
+    return _combine_hashes(df)
+
+
+def _densify(
+    left_codes: np.ndarray, right_codes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Renumbers sparse codes as 0..n-1 in order of first appearance."""
+    return factorize_keys(pd.Series(left_codes), pd.Series(right_codes))
+
+
+def _group_order(codes: np.ndarray):
+    """
+    Returns the positions sorted by key code (stable), the sorted codes and the
+    rank of every sorted position within its key.
+    """
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    positions = np.arange(len(codes))
+    is_first = np.ones(len(codes), dtype=bool)
+    is_first[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    rank = positions - np.maximum.accumulate(np.where(is_first, positions, 0))
+    return order, sorted_codes, rank
+
+
+def block_starts(left_counts: np.ndarray, right_counts: np.ndarray) -> np.ndarray:
+    """
+    Returns the first row of every key's block within `all_data`. Keys found on the
+    left produce the cartesian product of their records, otherwise one row per
+    right record.
+    """
+    group_sizes = np.where(
+        left_counts > 0, left_counts * np.maximum(right_counts, 1), right_counts
+    )
+    return np.cumsum(group_sizes) - group_sizes
+
+
+def _classify_rows(
+    left_positions: np.ndarray,
+    left_codes: np.ndarray,
+    right_positions: np.ndarray,
+    right_codes: np.ndarray,
+    left_counts: np.ndarray,
+    right_counts: np.ndarray,
+    group_starts: np.ndarray,
+) -> Classification:
+    """
+    Classifies the records at `left_positions` and `right_positions`. All records
+    of a key must be included. The counts and group starts cover every key.
+    """
+    left_order, left_sorted_codes, left_rank = _group_order(left_codes)
+    right_order, right_sorted_codes, right_rank = _group_order(right_codes)
+    left_order = left_positions[left_order]
+    right_order = right_positions[right_order]
+
+    left_matched = right_counts[left_sorted_codes] > 0
+    right_matched = left_counts[right_sorted_codes] > 0
+
+    # Expand every matched left record into one pair per right record of its key
+    matched_codes = left_sorted_codes[left_matched]
+    repeats = right_counts[matched_codes]
+    within = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    right_starts = np.searchsorted(right_sorted_codes, matched_codes)
+
+    both_left = np.repeat(left_order[left_matched], repeats)
+    both_right = right_order[np.repeat(right_starts, repeats) + within]
+    both_index = (
+        np.repeat(
+            group_starts[matched_codes] + left_rank[left_matched] * repeats, repeats
+        )
+        + within
+    )
+
+    return Classification(
+        left_counts=left_counts,
+        right_counts=right_counts,
+        left_only=left_order[~left_matched],
+        right_only=right_order[~right_matched],
+        left_both=left_order[left_matched],
+        right_both=right_order[right_matched],
+        both_left=both_left,
+        both_right=both_right,
+        both_index=both_index,
+        left_only_index=group_starts[left_sorted_codes[~left_matched]]
+        + left_rank[~left_matched],
+        right_only_index=group_starts[right_sorted_codes[~right_matched]]
+        + right_rank[~right_matched],
+    )
+
+
+def count_keys(
+    left_codes: np.ndarray, right_codes: np.ndarray, n_keys: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the number of left and right records per key code."""
+    return (
+        np.bincount(left_codes, minlength=n_keys),
+        np.bincount(right_codes, minlength=n_keys),
+    )
+
+
+def classify(
+    left_codes: np.ndarray, right_codes: np.ndarray, n_keys: int
+) -> Classification:
+    """
+    Classifies every left and right record in a single vectorized pass over the
+    key codes returned by :func:`factorize_keys`.
+    """
+    left_counts, right_counts = count_keys(left_codes, right_codes, n_keys)
+
+    return _classify_rows(
+        np.arange(len(left_codes)),
+        left_codes,
+        np.arange(len(right_codes)),
+        right_codes,
+        left_counts,
+        right_counts,
+        block_starts(left_counts, right_counts),
+    )
+
+
+def classify_asof(
+    left_codes: np.ndarray,
+    right_codes: np.ndarray,
+    n_keys: int,
+    left_values: pd.Series,
+    right_values: pd.Series,
+    tolerance: Union[float, pd.Timedelta],
+) -> Classification:
+    """
+    Classifies records by matching every left record to the right record with the
+    same key code whose value is nearest, if it's within `tolerance`. Records with
+    missing values don't match.
+
+    Both sides are sorted by value once, so matching takes O(n log n). A right
+    record can be matched by several left records. `all_data` lists the left
+    records in order, followed by the unmatched right records.
+    """
+    left_counts, right_counts = count_keys(left_codes, right_codes, n_keys)
+
+    def by_value(codes: np.ndarray, values: pd.Series) -> pd.DataFrame:
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            values = values.to_numpy(dtype="float64", na_value=np.nan)
+        frame = pd.DataFrame(
+            {"position": np.arange(len(codes)), "code": codes, "value": values}
+        )
+        return frame.dropna(subset=["value"]).sort_values("value", kind="stable")
+
+    matched = pd.merge_asof(
+        by_value(left_codes, left_values),
+        by_value(right_codes, right_values).rename(
+            columns={"position": "right_position"}
+        ),
+        on="value",
+        by="code",
+        tolerance=tolerance,
+        direction="nearest",
+    ).dropna(subset=["right_position"])
+
+    pairs = matched.sort_values("position")
+    both_left = pairs["position"].to_numpy(dtype=np.intp)
+    both_right = pairs["right_position"].to_numpy(dtype=np.intp)
+
+    left_matched = np.zeros(len(left_codes), dtype=bool)
+    left_matched[both_left] = True
+    right_matched = np.zeros(len(right_codes), dtype=bool)
+    right_matched[both_right] = True
+
+    left_only = np.flatnonzero(~left_matched)
+    right_only = np.flatnonzero(~right_matched)
+
+    return Classification(
+        left_counts=left_counts,
+        right_counts=right_counts,
+        left_only=left_only,
+        right_only=right_only,
+        left_both=both_left,
+        right_both=np.flatnonzero(right_matched),
+        both_left=both_left,
+        both_right=both_right,
+        both_index=both_left,
+        left_only_index=left_only,
+        right_only_index=len(left_codes) + np.arange(len(right_only)),
+    )
+
+
+SharedArraysSpec = tuple[str, list[tuple[str, str, int, int]]]
+"""Shared memory block name and the (name, dtype, length, offset) of every array."""
+
+
+@contextmanager
+def _share_arrays(arrays: dict[str, np.ndarray]) -> Iterator[SharedArraysSpec]:
+    """Copies `arrays` into a single shared memory block for the duration."""
+    layout = []
+    size = 0
+    for name, array in arrays.items():
+        layout.append((name, array.dtype.str, len(array), size))
+        size += array.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        for (name, dtype, length, offset), array in zip(layout, arrays.values()):
+            np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=offset)[:] = array
+        yield shm.name, layout
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _classify_partition(
+    spec: SharedArraysSpec, start: int, stop: int
+) -> Classification:
+    """Classifies the records whose key codes lie within [start, stop)."""
+    name, layout = spec
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        arrays = {
+            name: np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, dtype, length, offset in layout
+        }
+
+        def positions(codes: np.ndarray) -> np.ndarray:
+            return np.flatnonzero((codes >= start) & (codes < stop))
+
+        left_positions = positions(arrays["left_codes"])
+        right_positions = positions(arrays["right_codes"])
+        result = _classify_rows(
+            left_positions,
+            arrays["left_codes"][left_positions],
+            right_positions,
+            arrays["right_codes"][right_positions],
+            arrays["left_counts"],
+            arrays["right_counts"],
+            arrays["group_starts"],
+        )
+        # The counts are views onto the shared block and already known by the parent
+        result.left_counts = result.right_counts = np.empty(0, dtype=np.intp)
+        del arrays
+    finally:
+        shm.close()
+
+    return result
+
+
+def _code_ranges(
+    left_counts: np.ndarray, right_counts: np.ndarray, partitions: int
+) -> list[tuple[int, int]]:
+    """
+    Splits the key codes into `partitions` contiguous ranges holding about as many
+    records each.
+    """
+    records = np.cumsum(left_counts + right_counts)
+    total = records[-1] if len(records) else 0
+    bounds = np.searchsorted(
+        records, np.arange(1, partitions) * total / partitions, side="right"
+    )
+    bounds = np.unique(np.concatenate([[0], bounds, [len(records)]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # Not available on macOS or Windows
+        return os.cpu_count() or 1
+
+
+def classify_parallel(
+    left_codes: np.ndarray, right_codes: np.ndarray, n_keys: int, workers: int
+) -> Classification:
+    """
+    Classifies records like :func:`classify`, splitting the keys into contiguous
+    ranges of codes which are classified by a pool of up to `workers` processes,
+    never more than the available CPUs.
+
+    Every worker sorts its records by key, and all_data lists keys in code order,
+    so the results of consecutive ranges concatenate in the order of a single
+    pass. The codes and per-key counts are placed in shared memory rather than
+    being pickled to every worker.
+    """
+    workers = min(workers, available_cpus())
+    if workers <= 1:
+        return classify(left_codes, right_codes, n_keys)
+
+    left_counts, right_counts = count_keys(left_codes, right_codes, n_keys)
+    arrays = {
+        "left_codes": left_codes,
+        "right_codes": right_codes,
+        "left_counts": left_counts,
+        "right_counts": right_counts,
+        "group_starts": block_starts(left_counts, right_counts),
+    }
+    ranges = _code_ranges(left_counts, right_counts, workers)
+
+    with _share_arrays(arrays) as spec, ProcessPoolExecutor(workers) as executor:
+        parts = list(
+            executor.map(
+                _classify_partition,
+                repeat(spec),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+        )
+
+    def concat(field: str) -> np.ndarray:
+        return np.concatenate(
+            [getattr(part, field) for part in parts] or [np.empty(0, dtype=np.intp)]
+        )
+
+    return Classification(
+        left_counts=left_counts,
+        right_counts=right_counts,
+        **{
+            field: concat(field)
+            for field in Classification.__dataclass_fields__
+            if field not in ("left_counts", "right_counts")
+        },
+    )
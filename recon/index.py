@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from recon.engine import hash_keys
+from recon.readers import import_pyarrow
+from recon.reconcile import Key
+from recon.utils import (
+    FilePath,
+    arrow_compatible,
+    check_keys,
+    ensure_list,
+    replace_file,
+)
+
+INDEX_VERSION = 3
+"""Bump when the layout of saved key indexes changes."""
+
+DATA_FILE = "data.arrow"
+
+BATCH_ROWS = 1_000_000
+"""Rows per record batch of the columnar data."""
+
+
+@dataclass
+class KeyIndex:
+    """
+    On-disk index of a reference dataset: the hash of every record's key, sorted,
+    with the record's row position, alongside the dataset as an uncompressed Arrow
+    IPC file.
+
+    Loaded indexes are memory-mapped, so looking up the keys of a small dataset
+    costs a binary search per key, and only the matching records are read.
+    """
+
+    path: Path
+    on: Key
+    key_hashes: np.ndarray
+    """Sorted key hashes, see :func:`recon.engine.hash_keys`."""
+    positions: np.ndarray
+    """Row position of the record with each key hash."""
+    columns: list[str]
+
+    @staticmethod
+    def build(df: pd.DataFrame, on: Key, path: FilePath) -> KeyIndex:
+        """Saves the key index and columnar data of `df` to the directory `path`."""
+        import_pyarrow()
+        import pyarrow as pa
+
+        check_keys(df.columns, on, "left")
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        hashes = hash_keys(df, ensure_list(on))
+        positions = np.argsort(hashes, kind="stable")
+        key_hashes = hashes[positions]
+
+        table = pa.Table.from_pandas(
+            arrow_compatible(df.reset_index(drop=True)), preserve_index=False
+        )
+
+        def write_data(file) -> None:
+            with pa.ipc.new_file(file, table.schema) as writer:
+                writer.write_table(table, max_chunksize=BATCH_ROWS)
+
+        meta = {
+            "version": INDEX_VERSION,
+            "on": on,
+            "rows": len(df),
+            "columns": [str(col) for col in df.columns],
+        }
+        replace_file(directory / DATA_FILE, write_data)
+        replace_file(directory / "key_hashes.npy", lambda f: np.save(f, key_hashes))
+        replace_file(directory / "positions.npy", lambda f: np.save(f, positions))
+        replace_file(
+            directory / "meta.json", lambda f: f.write(json.dumps(meta).encode())
+        )
+
+        return KeyIndex(directory, on, key_hashes, positions, meta["columns"])
+
+    @staticmethod
+    def load(path: FilePath) -> KeyIndex:
+        directory = Path(path)
+        meta = json.loads((directory / "meta.json").read_text())
+        if meta["version"] != INDEX_VERSION:
+            raise ValueError(
+                f"Key index version {meta['version']} isn't supported. "
+                "Build the index again."
+            )
+
+        return KeyIndex(
+            path=directory,
+            on=meta["on"],
+            key_hashes=np.load(directory / "key_hashes.npy", mmap_mode="r"),
+            positions=np.load(directory / "positions.npy", mmap_mode="r"),
+            columns=meta["columns"],
+        )
+
+    def lookup(self, df: pd.DataFrame, on: Key) -> np.ndarray:
+        """
+        Returns the sorted row positions of the indexed records whose key hash
+        equals that of a record of `df`, whatever the dtype of either key.
+        """
+        check_keys(df.columns, on, "right")
+        wanted = np.unique(hash_keys(df, ensure_list(on)))
+        starts = np.searchsorted(self.key_hashes, wanted, side="left")
+        ends = np.searchsorted(self.key_hashes, wanted, side="right")
+
+        # Expand every [start, end) run of equal hashes into its positions
+        lengths = ends - starts
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        return np.sort(self.positions[np.repeat(starts, lengths) + offsets])
+
+    def take(
+        self, positions: np.ndarray, columns: Optional[list[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Reads the indexed records at `positions` from the memory-mapped data,
+        indexed by their row position within the reference dataset.
+        """
+        import_pyarrow()
+        import pyarrow as pa
+
+        with pa.memory_map(str(self.path / DATA_FILE)) as source:
+            table = pa.ipc.open_file(source).read_all()
+            if columns is not None:
+                table = table.select([col for col in self.columns if col in columns])
+            df = table.take(pa.array(positions, type=pa.int64())).to_pandas()
+
+        df.index = pd.Index(positions, dtype=np.int64)
+        return df
+
+    def matching(
+        self, df: pd.DataFrame, on: Key, columns: Optional[list[str]] = None
+    ) -> pd.DataFrame:
+        """Returns the indexed records sharing a key with `df`."""
+        return self.take(self.lookup(df, on), columns)
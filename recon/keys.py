@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import Callable, Union
+
+import numpy as np
+import pandas as pd
+
+KeyNormalizer = Union[str, Callable[[pd.Series], pd.Series]]
+"""
+The name of a built-in normalizer, or a function mapping a column of keys (as
+strings) to their normalized form.
+"""
+
+KEY_NORMALIZERS: dict[str, Callable[[pd.Series], pd.Series]] = {
+    "strip": lambda keys: keys.str.strip(),
+    "lower": lambda keys: keys.str.lower(),
+    "whitespace": lambda keys: keys.str.replace(r"\s+", " ", regex=True),
+    "leading_zeros": lambda keys: keys.str.replace(r"^0+(?=.)", "", regex=True),
+    "alphanumeric": lambda keys: keys.str.replace(r"[^0-9A-Za-z]", "", regex=True),
+}
+"""Built-in normalizers by name."""
+
+DEFAULT_FUZZY_THRESHOLD = 0.8
+
+NGRAM_SIZE = 3
+
+MAX_BLOCK_SIZE = 200
+"""
+N-grams shared by more keys than this, on either side, don't form candidate
+pairs. They say little about similarity and would approach an all-pairs
+comparison.
+"""
+
+SEPARATOR = "\x1f"
+"""Joins the fields of composite keys for fuzzy matching."""
+
+
+def normalize_keys(
+    keys: pd.DataFrame, normalizers: list[KeyNormalizer]
+) -> pd.DataFrame:
+    """Returns the key columns as strings with every normalizer applied in turn."""
+    if not normalizers:
+        return keys
+
+    functions = []
+    for normalizer in normalizers:
+        if callable(normalizer):
+            functions.append(normalizer)
+        elif normalizer in KEY_NORMALIZERS:
+            functions.append(KEY_NORMALIZERS[normalizer])
+        else:
+            raise ValueError(
+                f"Unknown key normalizer ({normalizer}). "
+                f"Available normalizers: {', '.join(KEY_NORMALIZERS)}."
+            )
+
+    normalized = {}
+    for col in keys.columns:
+        values = keys[col].astype("string")
+        for function in functions:
+            values = function(values)
+        normalized[col] = values
+
+    return pd.DataFrame(normalized, index=keys.index)
+
+
+def key_text(keys: pd.DataFrame) -> pd.Series:
+    """Returns every (composite) key as a single string."""
+    text = keys.iloc[:, 0].astype("string")
+    for i in range(1, keys.shape[1]):
+        text = text + SEPARATOR + keys.iloc[:, i].astype("string")
+    return text.fillna("")
+
+
+def _ngrams(text: pd.Series, n: int = NGRAM_SIZE) -> pd.DataFrame:
+    """
+    Returns the distinct padded n-grams of every string as (id, gram) rows, where
+    id is the string's position. Strings are sliced one offset at a time across
+    all of them rather than one string at a time.
+    """
+    padded = (" " * (n - 1)) + text.reset_index(drop=True) + " "
+    lengths = padded.str.len().fillna(0).to_numpy(dtype=np.int64)
+
+    parts = []
+    for offset in range(int(lengths.max(initial=0)) - n + 1):
+        ids = np.flatnonzero(lengths >= offset + n)
+        parts.append(
+            pd.DataFrame(
+                {"id": ids, "gram": padded.iloc[ids].str.slice(offset, offset + n)}
+            )
+        )
+
+    if not parts:
+        return pd.DataFrame({"id": np.empty(0, dtype=np.intp), "gram": []})
+
+    return pd.concat(parts, ignore_index=True).drop_duplicates()
+
+
+def fuzzy_pairs(
+    left: pd.Series,
+    right: pd.Series,
+    threshold: float = DEFAULT_FUZZY_THRESHOLD,
+    max_block_size: int = MAX_BLOCK_SIZE,
+) -> pd.DataFrame:
+    """
+    Returns the pairs of `left` and `right` strings whose trigram Jaccard
+    similarity is at least `threshold`, as `left`/`right` positions and a
+    `score`, best first.
+
+    Only strings sharing an n-gram are compared, found through an inverted index
+    of n-grams, so the work depends on the candidates rather than on every pair.
+    """
+    left_grams = _ngrams(left)
+    right_grams = _ngrams(right)
+
+    left_sizes = left_grams.groupby("id").size()
+    right_sizes = right_grams.groupby("id").size()
+
+    # Block on n-grams which are selective on both sides
+    left_freq = left_grams["gram"].value_counts()
+    right_freq = right_grams["gram"].value_counts()
+    selective = left_freq.index[left_freq <= max_block_size].intersection(
+        right_freq.index[right_freq <= max_block_size]
+    )
+
+    candidates = (
+        left_grams[left_grams["gram"].isin(selective)]
+        .merge(right_grams, on="gram", suffixes=("_left", "_right"))[
+            ["id_left", "id_right"]
+        ]
+        .drop_duplicates()
+    )
+
+    # Score the candidates on all of their n-grams, including unselective ones
+    candidates = (
+        candidates.merge(left_grams.rename(columns={"id": "id_left"}), on="id_left")
+        .merge(right_grams.rename(columns={"id": "id_right"}), on=["id_right", "gram"])
+        .groupby(["id_left", "id_right"])
+        .size()
+        .rename("shared")
+        .reset_index()
+    )
+
+    union = (
+        left_sizes.reindex(candidates["id_left"]).to_numpy()
+        + right_sizes.reindex(candidates["id_right"]).to_numpy()
+        - candidates["shared"].to_numpy()
+    )
+    candidates["score"] = candidates["shared"].to_numpy() / union
+
+    return (
+        candidates.loc[
+            candidates["score"] >= threshold, ["id_left", "id_right", "score"]
+        ]
+        .rename(columns={"id_left": "left", "id_right": "right"})
+        .sort_values(["score", "left", "right"], ascending=[False, True, True])
+        .reset_index(drop=True)
+    )
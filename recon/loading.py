@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass, field
+from os import PathLike
+from typing import Any, Callable, Iterable
+
+import pandas as pd
+
+from recon.engine import available_cpus
+from recon.readers import sniff_format
+
+PROCESS_READERS = {"excel"}
+"""
+Readers which hold the GIL while parsing, so are run in worker processes rather
+than threads when there are several to read. Only file paths are read in
+processes, as streams can't be shared.
+"""
+
+
+@dataclass(eq=False)
+class ReadTask:
+    """One dataset, or one sheet of it, to read with `read(data, **kwargs)`."""
+
+    side: str
+    data: Any
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def in_process(self) -> bool:
+        reader = self.kwargs.get("reader") or sniff_format(self.data)
+        return reader in PROCESS_READERS and isinstance(self.data, (str, PathLike))
+
+
+def sheet_tasks(side: str, data: Any, kwargs: dict[str, Any]) -> list[ReadTask]:
+    """Splits the reading of a list of `sheet_name` into a task per sheet."""
+    sheets = kwargs.get("sheet_name")
+    if not isinstance(sheets, (list, tuple)):
+        return [ReadTask(side, data, kwargs)]
+    if not sheets:
+        raise ValueError(f"The {side} sheet_name list is empty.")
+    return [ReadTask(side, data, {**kwargs, "sheet_name": sheet}) for sheet in sheets]
+
+
+def _timed_read(
+    read: Callable[..., pd.DataFrame], data: Any, kwargs: dict[str, Any]
+) -> tuple[pd.DataFrame, float]:
+    start = time.perf_counter()
+    df = read(data, **kwargs)
+    return df, time.perf_counter() - start
+
+
+def process_tasks(tasks: list[ReadTask]) -> list[ReadTask]:
+    """
+    Returns the tasks worth reading in worker processes: those of
+    `PROCESS_READERS`, if there are several of them and several CPUs. Starting a
+    process costs more than parsing a single sheet alone.
+    """
+    tasks = [task for task in tasks if task.in_process]
+    if len(tasks) < 2 or available_cpus() < 2:
+        return []
+    return tasks
+
+
+def read_concurrently(
+    read: Callable[..., pd.DataFrame],
+    tasks: Iterable[ReadTask],
+    on_read: Callable[[ReadTask, pd.DataFrame, float], None],
+) -> None:
+    """
+    Reads every task concurrently, calling `on_read` with the task, its DataFrame
+    and the seconds spent reading it as soon as each one finishes. The tasks of
+    :func:`process_tasks`, of either side, share a single pool of up to one
+    process per CPU, so `read` must be picklable. Other tasks run in a thread
+    each.
+
+    If `on_read` or a read raises, the tasks which haven't started are cancelled
+    and the error is raised without waiting for the running ones.
+    """
+    tasks = list(tasks)
+    in_process = set(process_tasks(tasks))
+    executors: list[Executor] = []
+    if in_process:
+        executors.append(ProcessPoolExecutor(min(len(in_process), available_cpus())))
+    if len(in_process) < len(tasks):
+        executors.append(ThreadPoolExecutor(len(tasks) - len(in_process)))
+
+    try:
+        futures: dict[Future, ReadTask] = {
+            executors[0 if task in in_process else -1].submit(
+                _timed_read, read, task.data, task.kwargs
+            ): task
+            for task in tasks
+        }
+        for future in as_completed(futures):
+            df, seconds = future.result()
+            on_read(futures[future], df, seconds)
+    except BaseException:
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    for executor in executors:
+        executor.shutdown()
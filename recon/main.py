@@ -1,46 +1,121 @@
+import json
+import sys
+from dataclasses import asdict
 from pathlib import Path
+from typing import Optional, Union
 
 import typer
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeElapsedColumn,
+)
+from rich.table import Table
 from typing_extensions import Annotated
 
-from recon.reconcile import Reconcile
+from recon.cache import DEFAULT_CACHE_MAX_BYTES
+from recon.partition import reconcile_partitioned
+from recon.profiling import StageTiming
+from recon.readers import url_reader
+from recon.reconcile import Key, Reconcile
+from recon.sketch import (
+    DEFAULT_PRECISION,
+    SKETCH_EXTENSION,
+    KeySketch,
+    OverlapEstimate,
+    sketch_file,
+)
+
+
+def parse_on(value: str) -> Key:
+    """Splits a comma separated composite key into its fields."""
+    fields = [field.strip() for field in value.split(",")]
+    return fields if len(fields) > 1 else value
+
+
+def parse_tolerance(value: str) -> Optional[dict[str, Union[float, str]]]:
+    """Parses `field=tolerance`, where the tolerance is a number or a timedelta."""
+    if not value:
+        return None
+
+    field, _, tolerance = value.partition("=")
+    try:
+        return {field.strip(): float(tolerance)}
+    except ValueError:
+        return {field.strip(): tolerance.strip()}
+
+
+def parse_list(value: str) -> Optional[list[str]]:
+    """Splits a comma separated option, or returns None if it's empty."""
+    return [field.strip() for field in value.split(",")] if value else None
+
+
+def parse_source(value: str) -> str:
+    """Checks that a dataset is an existing file, or a URL with a registered reader."""
+    if url_reader(value) is not None:
+        return value
+
+    path = Path(value)
+    if not path.is_file():
+        raise typer.BadParameter(f"File '{value}' does not exist.")
+    return str(path.resolve())
+
+
+def profile_table(timings: list[StageTiming]) -> Table:
+    """Lays out stage timings as a table, in the order the stages finished."""
+    table = Table(title="Profile")
+    for column in ("Stage", "Seconds", "Rows in", "Rows out", "Memory delta (MiB)"):
+        table.add_column(column, justify="left" if column == "Stage" else "right")
+
+    for timing in timings:
+        table.add_row(
+            timing.stage,
+            f"{timing.seconds:.3f}",
+            "" if timing.rows_in is None else f"{timing.rows_in:,d}",
+            "" if timing.rows_out is None else f"{timing.rows_out:,d}",
+            f"{timing.memory_delta / 1024**2:+,.1f}",
+        )
+
+    return table
 
 
 def main(
     left: Annotated[
-        Path,
+        str,
         typer.Argument(
             default=...,
-            help="Path to the left dataset (csv|xlsx).",
+            help=(
+                "Path to the left dataset (csv|xlsx|parquet|feather), or a "
+                "database URL such as sqlite:///ledger.db?table=gl."
+            ),
             show_default=False,
-            exists=True,
-            file_okay=True,
-            dir_okay=False,
-            writable=False,
-            readable=True,
-            resolve_path=True,
+            callback=parse_source,
         ),
     ],
     right: Annotated[
-        Path,
+        str,
         typer.Argument(
             default=...,
-            help="Path to the right dataset (csv|xlsx).",
+            help=(
+                "Path to the right dataset (csv|xlsx|parquet|feather), or a "
+                "database URL such as sqlite:///ledger.db?table=gl."
+            ),
             show_default=False,
-            exists=True,
-            file_okay=True,
-            dir_okay=False,
-            writable=False,
-            readable=True,
-            resolve_path=True,
+            callback=parse_source,
         ),
     ],
     left_on: Annotated[
         str,
         typer.Argument(
             default=...,
-            help="Reconcile using this field from the left dataset.",
+            help=(
+                "Reconcile using this field from the left dataset. Separate "
+                "multiple fields with commas for a composite key."
+            ),
             show_default=False,
         ),
     ],
@@ -48,7 +123,10 @@ def main(
         str,
         typer.Argument(
             default=...,
-            help="Reconcile using this field from the right dataset.",
+            help=(
+                "Reconcile using this field from the right dataset. Separate "
+                "multiple fields with commas for a composite key."
+            ),
             show_default=False,
         ),
     ],
@@ -88,15 +166,122 @@ def main(
             rich_help_panel="Input options",
         ),
     ] = "Sheet1",
+    columns: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Comma separated fields to load in addition to the keys. "
+                "All fields are loaded by default."
+            ),
+            show_default=False,
+            rich_help_panel="Input options",
+        ),
+    ] = "",
+    cache_dir: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Cache parsed datasets within this directory so that later runs "
+                "against unchanged files skip parsing them."
+            ),
+            show_default=False,
+            rich_help_panel="Input options",
+        ),
+    ] = "",
+    cache_max_mb: Annotated[
+        int,
+        typer.Option(
+            default=...,
+            help="Evict the least recently used cache entries beyond this size.",
+            show_default=True,
+            rich_help_panel="Input options",
+        ),
+    ] = DEFAULT_CACHE_MAX_BYTES
+    // 1024**2,
+    dtype_backend: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Dtypes to load datasets with: numpy_nullable or pyarrow. pyarrow "
+                "stores text columns more compactly."
+            ),
+            show_default=True,
+            rich_help_panel="Input options",
+        ),
+    ] = "numpy_nullable",
+    normalize: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Comma separated key normalizers applied before matching: strip, "
+                "lower, whitespace, leading_zeros, alphanumeric."
+            ),
+            show_default=False,
+            rich_help_panel="Matching options",
+        ),
+    ] = "",
+    fuzzy: Annotated[
+        float,
+        typer.Option(
+            default=...,
+            help=(
+                "List unmatched records whose keys have at least this trigram "
+                "similarity (0-1) as a fuzzy component. Disabled by default."
+            ),
+            show_default=False,
+            rich_help_panel="Matching options",
+        ),
+    ] = 0.0,
+    match_within: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Match records on the nearest value of a field within a tolerance, "
+                "in addition to the keys, e.g. date=3D or amount=0.01."
+            ),
+            show_default=False,
+            rich_help_panel="Matching options",
+        ),
+    ] = "",
     output_file: Annotated[
         str,
         typer.Option(
             default=...,
-            help="Path to save results to (xlsx).",
+            help=(
+                "Path to save results to. The extension selects the format: an "
+                "xlsx workbook, or a directory of .parquet or .csv files."
+            ),
+            show_default=False,
+            rich_help_panel="Output options",
+        ),
+    ] = "",
+    compare: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Comma separated fields to compare between matched records. "
+                "Mismatch counts are printed and mismatching records are saved as "
+                "a differences component."
+            ),
             show_default=False,
             rich_help_panel="Output options",
         ),
     ] = "",
+    tolerance: Annotated[
+        float,
+        typer.Option(
+            default=...,
+            help="Largest numeric difference treated as equal by --compare.",
+            show_default=True,
+            rich_help_panel="Output options",
+        ),
+    ] = 0.0,
     std_out: Annotated[
         bool,
         typer.Option(
@@ -113,45 +298,475 @@ def main(
             rich_help_panel="Output options",
         ),
     ] = False,
+    partitions: Annotated[
+        int,
+        typer.Option(
+            default=...,
+            help=(
+                "Reconcile csv files larger than memory by spilling them to this "
+                "many on-disk partitions. Results are saved as csv files within "
+                "the --output-file directory."
+            ),
+            show_default=False,
+            rich_help_panel="Performance options",
+        ),
+    ] = 0,
+    chunksize: Annotated[
+        int,
+        typer.Option(
+            default=...,
+            help="Rows read at a time when --partitions is used.",
+            show_default=True,
+            rich_help_panel="Performance options",
+        ),
+    ] = 100_000,
+    workers: Annotated[
+        int,
+        typer.Option(
+            default=...,
+            help="Number of processes used to classify records, at most one per CPU.",
+            show_default=True,
+            rich_help_panel="Performance options",
+        ),
+    ] = 1,
+    engine: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Engine which encodes and classifies the keys: pandas or polars. "
+                "polars runs multithreaded and ignores --workers."
+            ),
+            show_default=True,
+            rich_help_panel="Performance options",
+        ),
+    ] = "pandas",
+    profile: Annotated[
+        bool,
+        typer.Option(
+            default=...,
+            help=(
+                "Print the wall time, rows in and out and memory delta of every "
+                "stage to stderr."
+            ),
+            rich_help_panel="Performance options",
+        ),
+    ] = False,
+    profile_output: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help="Save the stage timings of --profile to this JSON file.",
+            show_default=False,
+            rich_help_panel="Performance options",
+        ),
+    ] = "",
 ):
     if left_suffix == right_suffix:
         print("Suffixes cannot be the same to avoid field name conflicts.")
         raise typer.Abort()
 
+    left_keys, right_keys = parse_on(left_on), parse_on(right_on)
+    fields = parse_list(columns)
+    compared = parse_list(compare)
+    if fields is not None and compared is not None:
+        fields += [field for field in compared if field not in fields]
+
+    if partitions:
+        if not output_file:
+            print("--partitions requires an --output-file directory.")
+            raise typer.Abort()
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+        ) as progress:
+            progress.add_task(description="Reconciling partitions...", total=None)
+            try:
+                report = reconcile_partitioned(
+                    left_file=left,
+                    right_file=right,
+                    left_on=left_keys,
+                    right_on=right_keys,
+                    output_dir=output_file,
+                    partitions=partitions,
+                    chunksize=chunksize,
+                    suffixes=(left_suffix, right_suffix),
+                    columns=fields,
+                )
+            except ValueError as e:
+                print(e)
+                raise typer.Abort()
+
+        print(f"Recon results saved to '{report.path}'.")
+        raise typer.Exit()
+
+    recon = None
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            transient=True,
+        ) as progress:
+            status = progress.add_task(description="Reading datasets...", total=None)
+
+            def on_stage(timing: StageTiming) -> None:
+                rows = (
+                    "" if timing.rows_out is None else f" ({timing.rows_out:,d} rows)"
+                )
+                progress.update(status, description=f"Finished {timing.stage}{rows}...")
+
+            writing: dict[str, int] = {}
+
+            def on_rows(component: str, written: int, total: int) -> None:
+                if component not in writing:
+                    writing[component] = progress.add_task(
+                        description=f"Writing {component}...", total=total
+                    )
+                progress.update(writing[component], completed=written)
+
+            try:
+                recon = Reconcile.read_files(
+                    left_file=left,
+                    right_file=right,
+                    left_on=left_keys,
+                    right_on=right_keys,
+                    suffixes=(left_suffix, right_suffix),
+                    left_kwargs={"sheet_name": left_sheet},
+                    right_kwargs={"sheet_name": right_sheet},
+                    workers=workers,
+                    columns=fields,
+                    cache_dir=cache_dir or None,
+                    cache_max_bytes=cache_max_mb * 1024**2,
+                    dtype_backend=dtype_backend,
+                    key_normalizers=parse_list(normalize),
+                    fuzzy_threshold=fuzzy or None,
+                    match_tolerance=parse_tolerance(match_within),
+                    on_stage=on_stage,
+                    engine=engine,
+                )
+            except ValueError as e:
+                print(e)
+                raise typer.Abort()
+
+            progress.update(status, description="Reconciling...")
+
+            differences = None
+            if compared is not None:
+                try:
+                    differences = recon.differences(compared, tolerance)
+                except ValueError as e:
+                    print(e)
+                    raise typer.Abort()
+                print(f"Mismatches by field:\n{differences.counts.to_string()}")
+
+            if info_only:
+                recon.info()
+                raise typer.Exit()
+
+            if std_out:
+                recon.to_stdout(["all"])
+                if differences is not None:
+                    print("--------- differences ----------")
+                    differences.data.to_csv(sys.stdout, index_label="index")
+                raise typer.Exit()
+
+            if output_file:
+                try:
+                    recon.to_file(
+                        output_file, ["all"], differences=differences, on_rows=on_rows
+                    )
+                except ValueError as e:
+                    print(e)
+                    raise typer.Abort()
+                print(f"Recon results saved to '{output_file}'.")
+                raise typer.Exit()
+    finally:
+        if recon is not None and profile:
+            Console(stderr=True).print(profile_table(recon.timings))
+        if recon is not None and profile_output:
+            Path(profile_output).write_text(
+                json.dumps([asdict(timing) for timing in recon.timings], indent=2)
+            )
+
+
+def batch(
+    manifest: Annotated[
+        Path,
+        typer.Argument(
+            default=...,
+            help=(
+                "YAML or JSON manifest listing the jobs, with optional defaults "
+                "applied to every job."
+            ),
+            show_default=False,
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+            resolve_path=True,
+        ),
+    ],
+    processes: Annotated[
+        int,
+        typer.Option(
+            default=...,
+            help="Worker processes. Defaults to the manifest's, or the CPU count.",
+            show_default=False,
+        ),
+    ] = 0,
+    memory_budget_mb: Annotated[
+        int,
+        typer.Option(
+            default=...,
+            help=(
+                "Start jobs only while the estimated memory of the running jobs "
+                "fits within this budget. Unlimited by default."
+            ),
+            show_default=False,
+        ),
+    ] = 0,
+    summary: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help=(
+                "Save the status and stats of every job to this csv or xlsx file. "
+                "Defaults to the manifest's, or recon_summary.csv."
+            ),
+            show_default=False,
+        ),
+    ] = "",
+):
+    """Runs every reconciliation listed within a manifest on a pool of processes."""
+    from recon.batch import load_manifest, run_batch
+    from recon.batch import summary as batch_summary
+
+    try:
+        jobs, settings = load_manifest(manifest)
+    except (ValueError, ImportError) as e:
+        print(e)
+        raise typer.Abort()
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
+        TimeElapsedColumn(),
         transient=True,
     ) as progress:
-        progress.add_task(description="Reading datasets...", total=None)
-        try:
-            recon = Reconcile.read_files(
-                left_file=left,
-                right_file=right,
-                left_on=left_on,
-                right_on=right_on,
-                suffixes=(left_suffix, right_suffix),
-                left_kwargs={"sheet_name": left_sheet},
-                right_kwargs={"sheet_name": right_sheet},
+        progress.add_task(description=f"Running {len(jobs):,d} jobs...", total=None)
+        results = run_batch(
+            jobs,
+            processes or settings.get("processes"),
+            memory_budget_mb or settings.get("memory_budget_mb"),
+        )
+
+    frame = batch_summary(results)
+    path = summary or settings.get("summary") or "recon_summary.csv"
+    if Path(path).suffix.lower() == ".xlsx":
+        frame.to_excel(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+    failed = frame.loc[frame["status"] == "failed"]
+    print(
+        f"{len(frame) - len(failed):,d} of {len(frame):,d} jobs succeeded. "
+        f"Summary saved to '{path}'."
+    )
+    for row in failed.itertuples():
+        print(f"{row.name}: {row.error}")
+    if len(failed):
+        raise typer.Exit(1)
+
+
+def estimate_table(estimate: OverlapEstimate) -> Table:
+    """Lays out an overlap estimate with a column per dataset."""
+    table = Table(title=f"Estimate (±{estimate.standard_error:.1%} per key count)")
+    for column in ("", "Left", "Right"):
+        table.add_column(column, justify="left" if not column else "right")
+
+    table.add_row("Records", f"{estimate.left_rows:,d}", f"{estimate.right_rows:,d}")
+    table.add_row(
+        "Distinct keys", f"{estimate.left_keys:,d}", f"{estimate.right_keys:,d}"
+    )
+    table.add_row(
+        "Keys on this side only",
+        f"{estimate.left_only_keys:,d}",
+        f"{estimate.right_only_keys:,d}",
+    )
+    table.add_row(
+        "Duplicate key rate",
+        f"{estimate.left_duplicate_rate:.1%}",
+        f"{estimate.right_duplicate_rate:.1%}",
+    )
+    table.caption = (
+        f"{estimate.common_keys:,d} common keys. "
+        f"Likely relationship: {estimate.relationship.name}."
+    )
+    return table
+
+
+def estimate(
+    left: Annotated[
+        str,
+        typer.Argument(
+            default=...,
+            help=f"Path to the left dataset, or a saved {SKETCH_EXTENSION} sketch.",
+            show_default=False,
+            callback=parse_source,
+        ),
+    ],
+    right: Annotated[
+        str,
+        typer.Argument(
+            default=...,
+            help=f"Path to the right dataset, or a saved {SKETCH_EXTENSION} sketch.",
+            show_default=False,
+            callback=parse_source,
+        ),
+    ],
+    left_on: Annotated[
+        str,
+        typer.Argument(
+            default=...,
+            help="Key field of the left dataset. Separate multiple with commas.",
+            show_default=False,
+        ),
+    ],
+    right_on: Annotated[
+        str,
+        typer.Argument(
+            default=...,
+            help="Key field of the right dataset. Separate multiple with commas.",
+            show_default=False,
+        ),
+    ],
+    left_sheet: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help="Sheet to read from left if left is a spreadsheet.",
+            show_default=True,
+        ),
+    ] = "Sheet1",
+    right_sheet: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help="Sheet to read from right if right is a spreadsheet.",
+            show_default=True,
+        ),
+    ] = "Sheet1",
+    normalize: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help="Comma separated key normalizers applied before sketching.",
+            show_default=False,
+        ),
+    ] = "",
+    precision: Annotated[
+        int,
+        typer.Option(
+            default=...,
+            help=(
+                "Sketches hold 2**precision one byte registers. Every extra bit "
+                "divides the error by about 1.4."
+            ),
+            show_default=True,
+        ),
+    ] = DEFAULT_PRECISION,
+    save_left: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help="Save the sketch of the left dataset to this file.",
+            show_default=False,
+        ),
+    ] = "",
+    save_right: Annotated[
+        str,
+        typer.Option(
+            default=...,
+            help="Save the sketch of the right dataset to this file.",
+            show_default=False,
+        ),
+    ] = "",
+    as_json: Annotated[
+        bool,
+        typer.Option(
+            "--json",
+            help="Print the estimate as JSON, e.g. for a scheduler.",
+        ),
+    ] = False,
+):
+    """
+    Estimates key counts, overlap, duplicate rates and the likely relationship
+    from sketches of the keys, streamed once in bounded memory.
+    """
+
+    def sketch(data: str, on: str, position: str, sheet: str) -> KeySketch:
+        if Path(data).suffix.lower() == SKETCH_EXTENSION:
+            return KeySketch.load(data)
+        return sketch_file(
+            data,
+            parse_on(on),
+            position,
+            {"sheet_name": sheet},
+            precision,
+            key_normalizers=parse_list(normalize),
+        )
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TimeElapsedColumn(),
+            transient=True,
+        ) as progress:
+            progress.add_task(description="Sketching keys...", total=None)
+            sketches = (
+                sketch(left, left_on, "left", left_sheet),
+                sketch(right, right_on, "right", right_sheet),
             )
-        except ValueError as e:
-            print(e)
-            raise typer.Abort()
+        result = Reconcile.estimate(*sketches, parse_on(left_on), parse_on(right_on))
+    except ValueError as e:
+        print(e)
+        raise typer.Abort()
 
-        progress.add_task(description="Reconciling...", total=None)
+    for data, path in zip(sketches, (save_left, save_right)):
+        if path:
+            data.save(path)
 
-        if info_only:
-            recon.info()
-            raise typer.Exit()
+    if as_json:
+        content = {
+            **asdict(result),
+            "relationship": result.relationship.name,
+            "left_only_keys": result.left_only_keys,
+            "right_only_keys": result.right_only_keys,
+        }
+        print(json.dumps(content, indent=2))
+    else:
+        Console().print(estimate_table(result))
 
-        if std_out:
-            recon.to_stdout(["all"])
-            raise typer.Exit()
 
-        if output_file:
-            recon.to_xlsx(output_file, ["all"])
-            print(f"Recon results saved to '{output_file}'.")
-            raise typer.Exit()
+COMMANDS = {"batch": batch, "estimate": estimate}
+"""Subcommands, run as `recon <command> ...`."""
 
 
-app = typer.run(main)
+def app() -> None:
+    """
+    Runs a subcommand, e.g. `recon batch MANIFEST`, when the first argument names
+    one of `COMMANDS`, otherwise a single reconciliation.
+    """
+    name = sys.argv[1] if len(sys.argv) > 1 else None
+    if name in COMMANDS:
+        command = typer.Typer(add_completion=False)
+        command.command()(COMMANDS[name])
+        command(args=sys.argv[2:], prog_name=f"recon {name}")
+    else:
+        typer.run(main)
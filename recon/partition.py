@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from recon.engine import hash_keys
+from recon.reconcile import (
+    DEFAULT_SUFFIXES,
+    FilePath,
+    Key,
+    Reconcile,
+    ReconciledArgs,
+    ReconciledStats,
+    Relationship,
+    get_relationship,
+)
+from recon.utils import check_keys, ensure_list
+
+PARTITIONED_COMPONENTS = [
+    "left_only",
+    "right_only",
+    "left_duplicate",
+    "right_duplicate",
+    "left_both",
+    "right_both",
+    "both",
+]
+"""Components written by :func:`reconcile_partitioned`, one csv file each."""
+
+
+@dataclass
+class PartitionedReport:
+    path: Path
+    args: ReconciledArgs
+    relationship: Relationship
+    left_stats: ReconciledStats
+    right_stats: ReconciledStats
+
+
+def _partition_path(directory: Path, position: str, partition: int) -> Path:
+    return directory / f"{position}-{partition:05d}.csv"
+
+
+def _spill(
+    file: FilePath,
+    on: Key,
+    position: str,
+    directory: Path,
+    partitions: int,
+    chunksize: int,
+    **kwargs,
+) -> list[str]:
+    """
+    Reads `file` in chunks and appends every row to the partition file selected by
+    the hash of its key. Returns the column names of the dataset.
+
+    Keys are read as the text of the file, unless given a dtype, as pandas infers
+    the dtype of every chunk on its own: a key of 4 would otherwise be 4 within
+    one chunk, 4.0 beside a blank key and "4" beside a text key.
+    """
+    keys = ensure_list(on)
+    dtype = kwargs.pop("dtype", None)
+    if dtype is None or isinstance(dtype, dict):
+        dtype = {**{key: str for key in keys}, **(dtype or {})}
+
+    columns: Optional[list[str]] = None
+    for chunk in pd.read_csv(file, chunksize=chunksize, dtype=dtype, **kwargs):
+        if columns is None:
+            columns = list(chunk.columns)
+            check_keys(columns, keys, position)
+
+        partition_ids = hash_keys(chunk, keys) % partitions
+        for partition, rows in chunk.groupby(partition_ids):
+            path = _partition_path(directory, position, partition)
+            rows.to_csv(path, mode="a", header=not path.exists(), index_label="index")
+
+    if columns is None:
+        # Header only file
+        columns = list(pd.read_csv(file, nrows=0, dtype=dtype, **kwargs).columns)
+        check_keys(columns, keys, position)
+
+    return columns
+
+
+def _read_partition(
+    directory: Path, position: str, partition: int, columns: list[str]
+) -> pd.DataFrame:
+    path = _partition_path(directory, position, partition)
+    if not path.exists():
+        return pd.DataFrame(columns=columns)
+
+    return pd.read_csv(path, index_col="index").rename_axis(index=None)
+
+
+def reconcile_partitioned(
+    left_file: FilePath,
+    right_file: FilePath,
+    left_on: Key,
+    right_on: Key,
+    output_dir: FilePath,
+    partitions: int = 16,
+    chunksize: int = 100_000,
+    suffixes: tuple[str, str] = DEFAULT_SUFFIXES,
+    left_kwargs: dict[str, Any] = {},
+    right_kwargs: dict[str, Any] = {},
+    tmp_dir: Optional[FilePath] = None,
+    columns: Optional[list[str]] = None,
+) -> PartitionedReport:
+    """
+    Reconciles two csv files which don't fit into memory.
+
+    Both files are read in chunks of `chunksize` rows and spilled to `partitions`
+    temporary files by the hash of their key. Records sharing a key always end up
+    in the same partition, so every partition is reconciled on its own and the
+    results are appended to one csv file per component within `output_dir`. Peak
+    memory therefore depends on the size of a partition rather than the input.
+
+    :param:`left_kwargs` and :param:`right_kwargs` are passed onto
+    `pandas.read_csv()`. :param:`columns` limits the columns loaded from either
+    dataset, in addition to the key columns.
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be a positive integer.")
+
+    if columns is not None:
+        left_wanted = {*ensure_list(left_on), *columns}
+        right_wanted = {*ensure_list(right_on), *columns}
+        left_kwargs = {**left_kwargs, "usecols": lambda col: col in left_wanted}
+        right_kwargs = {**right_kwargs, "usecols": lambda col: col in right_wanted}
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    left_stats = ReconciledStats()
+    right_stats = ReconciledStats()
+    left_unique = right_unique = True
+    headers: dict[str, list[str]] = {}
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="recon-") as tmp:
+        spill_dir = Path(tmp)
+        left_columns = _spill(
+            left_file, left_on, "left", spill_dir, partitions, chunksize, **left_kwargs
+        )
+        right_columns = _spill(
+            right_file,
+            right_on,
+            "right",
+            spill_dir,
+            partitions,
+            chunksize,
+            **right_kwargs,
+        )
+
+        for partition in range(partitions):
+            recon = Reconcile.read_df(
+                _read_partition(spill_dir, "left", partition, left_columns),
+                _read_partition(spill_dir, "right", partition, right_columns),
+                left_on=left_on,
+                right_on=right_on,
+                suffixes=suffixes,
+            )
+
+            for component in PARTITIONED_COMPONENTS:
+                frame: pd.DataFrame = getattr(recon, component)
+                first_write = component not in headers
+                if first_write:
+                    headers[component] = list(frame.columns)
+
+                frame[headers[component]].to_csv(
+                    output_path / f"{component}.csv",
+                    mode="w" if first_write else "a",
+                    header=first_write,
+                    # The merge index of `both` is only meaningful within a
+                    # partition. The original indexes are columns of `both`.
+                    index=component != "both",
+                    index_label="index",
+                )
+
+            left_stats.rows += len(recon.left)
+            left_stats.both_rows += len(recon.left_both)
+            left_stats.unique_rows += len(recon.left_only)
+            left_stats.duplicated_rows += len(recon.left_duplicate)
+            right_stats.rows += len(recon.right)
+            right_stats.both_rows += len(recon.right_both)
+            right_stats.unique_rows += len(recon.right_only)
+            right_stats.duplicated_rows += len(recon.right_duplicate)
+
+            # Keys never span partitions so uniqueness is decided locally
+            left_unique = left_unique and recon.is_left_unique
+            right_unique = right_unique and recon.is_right_unique
+
+    return PartitionedReport(
+        path=output_path,
+        args=ReconciledArgs(
+            left_on=left_on,
+            right_on=right_on,
+            left_suffix=suffixes[0],
+            right_suffix=suffixes[1],
+        ),
+        relationship=get_relationship(left_unique, right_unique),
+        left_stats=left_stats,
+        right_stats=right_stats,
+    )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from recon.engine import (
+    Classification,
+    block_starts,
+    code_dtype,
+    count_keys,
+    factorize_keys,
+)
+
+Engine = Literal["pandas", "polars"]
+"""
+Engine which encodes and classifies the keys. Components are returned as pandas
+DataFrames whichever engine is used.
+"""
+
+ENGINES = ("pandas", "polars")
+
+
+def import_polars():
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError(
+            "The polars engine requires polars. "
+            "Install it with `pip install recon-cli[polars]`."
+        ) from e
+    return pl
+
+
+def _key_column(left: pd.Series, right: pd.Series):
+    """
+    Returns both sides' values of a key column as a single polars Series, or their
+    pandas codes where polars can't hold the values, e.g. mixed Python objects.
+    """
+    pl = import_polars()
+
+    try:
+        return pl.from_pandas(pd.concat([left, right], ignore_index=True))
+    except (TypeError, ValueError, pl.exceptions.PolarsError):
+        pass
+
+    left_codes, right_codes, _ = factorize_keys(left, right)
+    return pl.Series(np.concatenate([left_codes, right_codes]))
+
+
+def encode_keys(
+    left: pd.DataFrame, right: pd.DataFrame
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Encodes the (composite) keys like :func:`recon.engine.encode_keys`, with a
+    single multithreaded polars group by over all key columns. Codes are numbered
+    in order of first appearance, left before right, and missing values are a
+    regular key.
+    """
+    pl = import_polars()
+
+    names = [f"key_{i}" for i in range(left.shape[1])]
+    keys = pl.DataFrame(
+        {
+            name: _key_column(left.iloc[:, i], right.iloc[:, i])
+            for i, name in enumerate(names)
+        }
+    )
+    # The first row of every key, ranked, numbers the keys by first appearance
+    codes = (
+        keys.lazy()
+        .with_row_index("row")
+        .select((pl.col("row").min().over(names).rank("dense") - 1).alias("code"))
+        .collect()
+        .get_column("code")
+        .to_numpy()
+    )
+
+    n_keys = int(codes.max()) + 1 if len(codes) else 0
+    codes = codes.astype(code_dtype(n_keys), copy=False)
+    return codes[: len(left)], codes[len(left) :], n_keys
+
+
+def classify(
+    left_codes: np.ndarray, right_codes: np.ndarray, n_keys: int
+) -> Classification:
+    """
+    Classifies every record like :func:`recon.engine.classify`, expanding the
+    matched pairs with a polars hash join. The plans of every component run
+    together on polars' thread pool.
+    """
+    pl = import_polars()
+
+    left_counts, right_counts = count_keys(left_codes, right_codes, n_keys)
+    group_starts = block_starts(left_counts, right_counts)
+
+    def side(codes: np.ndarray, counts: np.ndarray, other_counts: np.ndarray):
+        # Sorted by key, the rank of a record within its key is its distance from
+        # the key's first record on this side
+        offsets = np.cumsum(counts) - counts
+        return (
+            pl.LazyFrame(
+                {
+                    "code": codes,
+                    "position": np.arange(len(codes)),
+                    "start": group_starts[codes],
+                    "offset": offsets[codes],
+                    "repeats": other_counts[codes],
+                }
+            )
+            .sort("code", maintain_order=True)
+            .with_columns(rank=pl.int_range(pl.len()) - pl.col("offset"))
+        )
+
+    left = side(left_codes, left_counts, right_counts)
+    right = side(right_codes, right_counts, left_counts)
+
+    pairs = (
+        left.filter(pl.col("repeats") > 0)
+        .join(right.select("code", "position", "rank"), on="code", suffix="_right")
+        .select(
+            "position",
+            "position_right",
+            index=pl.col("start")
+            + pl.col("rank") * pl.col("repeats")
+            + pl.col("rank_right"),
+        )
+        .sort("index")
+    )
+
+    def in_key_order(frame, matched: bool):
+        # The index of an unmatched record is its key's start plus its rank
+        return frame.filter((pl.col("repeats") > 0) == matched).select(
+            "position", index=pl.col("start") + pl.col("rank")
+        )
+
+    (
+        pairs,
+        left_only,
+        right_only,
+        left_both,
+        right_both,
+    ) = pl.collect_all(
+        [
+            pairs,
+            in_key_order(left, False),
+            in_key_order(right, False),
+            in_key_order(left, True),
+            in_key_order(right, True),
+        ]
+    )
+
+    def array(frame, column: str) -> np.ndarray:
+        return frame.get_column(column).to_numpy().astype(np.int64, copy=False)
+
+    return Classification(
+        left_counts=left_counts,
+        right_counts=right_counts,
+        left_only=array(left_only, "position"),
+        right_only=array(right_only, "position"),
+        left_both=array(left_both, "position"),
+        right_both=array(right_both, "position"),
+        both_left=array(pairs, "position"),
+        both_right=array(pairs, "position_right"),
+        both_index=array(pairs, "index"),
+        left_only_index=array(left_only, "index"),
+        right_only_index=array(right_only, "index"),
+    )
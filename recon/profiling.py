@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+
+@dataclass
+class StageTiming:
+    stage: str
+    seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    memory_delta: int = 0
+    """Change in the resident memory of the process over the stage, in bytes."""
+
+
+StageCallback = Callable[[StageTiming], None]
+"""Called with the timing of every stage as it finishes."""
+
+RowsCallback = Callable[[str, int, int], None]
+"""Called with a component's name, rows written so far and total rows."""
+
+
+def current_rss() -> int:
+    """Returns the resident memory of this process in bytes, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    return psutil.Process().memory_info().rss
+
+
+class Profiler:
+    """
+    Records the wall time, rows and memory delta of named stages. Stages may be
+    nested, e.g. a component computed while writing, in which case the outer
+    stage includes the inner one.
+    """
+
+    def __init__(self, callback: Optional[StageCallback] = None) -> None:
+        self.callback = callback
+        self.timings: list[StageTiming] = []
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageTiming]:
+        """Times the enclosed block. Set `rows_out` on the yielded timing."""
+        timing = StageTiming(stage=name, rows_in=rows_in)
+        memory = current_rss()
+        start = time.perf_counter()
+
+        yield timing
+
+        timing.seconds = time.perf_counter() - start
+        timing.memory_delta = current_rss() - memory
+        self.record(timing)
+
+    def record(self, timing: StageTiming) -> None:
+        """Records a stage timed elsewhere, e.g. in another thread or process."""
+        self.timings.append(timing)
+        if self.callback is not None:
+            self.callback(timing)
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from io import IOBase, TextIOBase
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from recon.sql import read_url
+
+Reader = Callable[..., pd.DataFrame]
+"""
+Called as `reader(data, sheet_name=..., columns=..., **kwargs)` and returns the
+dataset as a DataFrame. Readers which don't support sheets ignore `sheet_name`.
+`columns` lists the columns to load, or None for all columns.
+"""
+
+
+@dataclass
+class ReaderSpec:
+    name: str
+    reader: Reader
+    extensions: tuple[str, ...] = ()
+    """Lower case file extensions, including the leading dot."""
+    magic: tuple[bytes, ...] = ()
+    """Leading bytes identifying the format."""
+    schemes: tuple[str, ...] = ()
+    """Lower case URL schemes identifying the format, e.g. sqlite."""
+
+
+_READERS: dict[str, ReaderSpec] = {}
+
+MAGIC_LENGTH = 8
+"""Number of leading bytes read to identify a format."""
+
+DEFAULT_READER = "csv"
+
+
+def register_reader(
+    name: str,
+    reader: Reader,
+    extensions: tuple[str, ...] = (),
+    magic: tuple[bytes, ...] = (),
+    schemes: tuple[str, ...] = (),
+) -> None:
+    """
+    Registers a reader for the given file extensions, magic bytes and URL schemes.
+    Registering an existing name replaces that reader. Later registrations take
+    precedence when formats are detected.
+    """
+    _READERS.pop(name, None)
+    _READERS[name] = ReaderSpec(
+        name,
+        reader,
+        tuple(ext.lower() for ext in extensions),
+        tuple(magic),
+        tuple(scheme.lower() for scheme in schemes),
+    )
+
+
+def get_reader(name: str) -> Reader:
+    try:
+        return _READERS[name].reader
+    except KeyError:
+        raise ValueError(
+            f"Unknown reader ({name}). Available readers: {', '.join(_READERS)}."
+        ) from None
+
+
+def file_extension(data: Any) -> str:
+    """Returns the lower case extension of a file path, or "" for other objects."""
+    if isinstance(data, (str, PathLike)):
+        return Path(data).suffix.lower()
+    return ""
+
+
+def _peek(data: Any) -> bytes:
+    """Returns the leading bytes of a file path or binary stream."""
+    if isinstance(data, (str, PathLike)):
+        try:
+            with open(data, "rb") as f:
+                return f.read(MAGIC_LENGTH)
+        except (OSError, ValueError):
+            return b""
+
+    if isinstance(data, IOBase) and not isinstance(data, TextIOBase):
+        if data.seekable():
+            position = data.tell()
+            head = data.read(MAGIC_LENGTH)
+            data.seek(position)
+            return head if isinstance(head, bytes) else b""
+
+    return b""
+
+
+def url_reader(data: Any) -> Optional[str]:
+    """Returns the name of the reader registered for the URL scheme of `data`."""
+    if not isinstance(data, str) or "://" not in data:
+        return None
+
+    scheme = data.split("://", 1)[0].lower()
+    for spec in reversed(_READERS.values()):
+        if scheme in spec.schemes:
+            return spec.name
+    return None
+
+
+def sniff_format(data: Any) -> str:
+    """
+    Returns the name of the reader for `data`, detected from the URL scheme, the
+    file extension and otherwise the leading bytes. Defaults to csv.
+    """
+    reader = url_reader(data)
+    if reader is not None:
+        return reader
+
+    specs = list(reversed(_READERS.values()))
+
+    extension = file_extension(data)
+    if extension:
+        for spec in specs:
+            if extension in spec.extensions:
+                return spec.name
+
+    head = _peek(data)
+    if head:
+        for spec in specs:
+            if any(head.startswith(magic) for magic in spec.magic):
+                return spec.name
+
+    return DEFAULT_READER
+
+
+def import_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet and Arrow IPC files requires pyarrow. "
+            "Install it with `pip install recon-cli[arrow]`."
+        ) from e
+
+
+def project(available: list[str], columns: Optional[list[str]]) -> Optional[list[str]]:
+    """Returns the available columns which were requested, in their file order."""
+    if columns is None:
+        return None
+    return [col for col in available if col in set(columns)]
+
+
+def read_csv(
+    data: Any,
+    sheet_name: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    if columns is not None:
+        wanted = set(columns)
+        kwargs["usecols"] = lambda col: col in wanted
+
+    return pd.read_csv(data, **kwargs)
+
+
+def read_tsv(
+    data: Any,
+    sheet_name: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Reads a tab separated file, unless another `sep` is passed."""
+    kwargs.setdefault("sep", "\t")
+    return read_csv(data, sheet_name, columns, **kwargs)
+
+
+def read_csv_pyarrow(
+    data: Any,
+    sheet_name: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Reads a csv file with pyarrow's multithreaded parser."""
+    import_pyarrow()
+
+    if columns is not None:
+        position = data.tell() if isinstance(data, IOBase) else None
+        header = pd.read_csv(data, nrows=0, **kwargs).columns
+        if position is not None:
+            data.seek(position)
+        kwargs["usecols"] = project(list(header), columns)
+
+    return pd.read_csv(data, engine="pyarrow", **kwargs)
+
+
+def read_excel(
+    data: Any,
+    sheet_name: Optional[str] = "Sheet1",
+    columns: Optional[list[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    if columns is not None:
+        wanted = set(columns)
+        kwargs["usecols"] = lambda col: col in wanted
+
+    return pd.read_excel(data, sheet_name, **kwargs)
+
+
+def read_parquet(
+    data: Any,
+    sheet_name: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Reads a Parquet file, memory-mapped where possible. Only the requested
+    `columns` are read. Row groups can be skipped by passing pyarrow `filters`.
+    """
+    import_pyarrow()
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(data, memory_map=True)
+    kwargs.setdefault("memory_map", True)
+
+    return pd.read_parquet(
+        data, columns=project(schema.names, columns), engine="pyarrow", **kwargs
+    )
+
+
+def read_arrow(
+    data: Any,
+    sheet_name: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Reads a Feather (Arrow IPC) file, memory-mapped where possible. Only the
+    requested `columns` are read.
+    """
+    import_pyarrow()
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    if columns is not None:
+        position = data.tell() if isinstance(data, IOBase) else None
+        try:
+            with pa.ipc.open_file(data) as reader:
+                names = reader.schema.names
+        except pa.ArrowInvalid:
+            # Feather version 1 files aren't Arrow IPC files
+            names = None
+        if position is not None:
+            data.seek(position)
+        if names is not None:
+            # Only the requested columns are read and decompressed
+            kwargs["columns"] = project(names, columns)
+
+    kwargs.setdefault("memory_map", True)
+    # Memory-mapped columns are only read once converted to pandas
+    table = feather.read_table(data, **kwargs)
+    if columns is not None and "columns" not in kwargs:
+        table = table.select(project(table.column_names, columns))
+
+    return table.to_pandas()
+
+
+register_reader(
+    "csv",
+    read_csv,
+    extensions=(".csv", ".txt", ".zip", ".gz", ".bz2", ".xz", ".zst"),
+)
+register_reader("tsv", read_tsv, extensions=(".tsv", ".tab"))
+register_reader("csv_pyarrow", read_csv_pyarrow)
+register_reader(
+    "excel",
+    read_excel,
+    extensions=(".xlsx", ".xlsm", ".xls", ".xlsb", ".ods"),
+    # Office Open XML and OpenDocument files are zip archives. Legacy xls files are
+    # OLE2 compound documents.
+    magic=(b"PK\x03\x04", b"\xd0\xcf\x11\xe0"),
+)
+register_reader(
+    "parquet", read_parquet, extensions=(".parquet", ".pq"), magic=(b"PAR1",)
+)
+register_reader(
+    "arrow",
+    read_arrow,
+    extensions=(".feather", ".arrow", ".ipc"),
+    magic=(b"ARROW1", b"FEA1"),
+)
+register_reader("sql", read_url, schemes=("sqlite",))
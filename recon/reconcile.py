@@ -1,19 +1,62 @@
 from __future__ import annotations
 
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from functools import cached_property
-from io import IOBase
-from os import PathLike
+from functools import cached_property, partial, wraps
+from itertools import chain
 from textwrap import dedent
-from typing import Any, Literal, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal, Optional, Union
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from recon import polars_engine, sql
+from recon.cache import DEFAULT_CACHE_MAX_BYTES, InputCache
+from recon.compare import Tolerance, mismatches
+from recon.engine import (
+    Classification,
+    classify_asof,
+    classify_parallel,
+    count_keys,
+    encode_keys,
+    row_fingerprints,
+)
+from recon.keys import (
+    DEFAULT_FUZZY_THRESHOLD,
+    KeyNormalizer,
+    fuzzy_pairs,
+    key_text,
+    normalize_keys,
+)
+from recon.loading import ReadTask, read_concurrently, sheet_tasks
+from recon.polars_engine import ENGINES, Engine, import_polars
+from recon.profiling import (
+    Profiler,
+    RowsCallback,
+    StageCallback,
+    StageTiming,
+    current_rss,
+)
+from recon.readers import get_reader, import_pyarrow, sniff_format
+from recon.utils import FilePath, check_keys, ensure_df, ensure_list, format_on
+from recon.writers import (
+    DEFAULT_CHUNKSIZE,
+    write_csv_dir,
+    write_parquet,
+    write_xlsx,
+    writer_for,
+)
 
-from recon.utils import ensure_df
+if TYPE_CHECKING:
+    from recon.batch import BatchJob, BatchResult
+    from recon.index import KeyIndex
+    from recon.sketch import KeySketch, OverlapEstimate
+    from recon.snapshot import Snapshot
 
-FilePath = Union[str, "PathLike[str]"]
+Key = Union[str, list[str]]
+"""A column name or, for composite keys, a list of column names."""
 Suffixes = Union[
     list[Union[str, None]], tuple[str, None], tuple[None, str], tuple[str, str]
 ]
@@ -29,30 +72,74 @@ RECON_COMPONENTS = Literal[
     "right",
     "both",
     "all_data",
+    "fuzzy",
     "all",
 ]
 
 DEFAULT_SUFFIXES = ("_left", "_right")
 
+DtypeBackend = Literal["numpy_nullable", "pyarrow"]
+"""Dtypes the datasets are normalised to when loaded, see `DataFrame.convert_dtypes`."""
+
 
 Relationship = Enum(
     "Relationship", ["ONE_TO_ONE", "ONE_TO_MANY", "MANY_TO_ONE", "MANY_TO_MANY", "NONE"]
 )
 
 
+def get_relationship(is_left_unique: bool, is_right_unique: bool) -> Relationship:
+    if is_left_unique and is_right_unique:
+        return Relationship.ONE_TO_ONE
+    elif is_left_unique and not is_right_unique:
+        return Relationship.ONE_TO_MANY
+    elif not is_left_unique and is_right_unique:
+        return Relationship.MANY_TO_ONE
+    else:
+        return Relationship.MANY_TO_MANY
+
+
 @dataclass
 class ReconciledData:
+    """
+    Components of a reconciliation. Those returned by :meth:`Reconcile.to_object`
+    are built from the row positions of the reconciliation when first accessed,
+    unless it has them cached, and are pickled as plain DataFrames without it.
+    """
+
     both: pd.DataFrame
     left_duplicate: pd.DataFrame
     right_duplicate: pd.DataFrame
     left_only: pd.DataFrame
     right_only: pd.DataFrame
 
+    @staticmethod
+    def _lazy(recon: Reconcile) -> ReconciledData:
+        data = object.__new__(ReconciledData)
+        data.__dict__["_recon"] = recon
+        return data
+
+    def __getattr__(self, name: str) -> pd.DataFrame:
+        # Only called for components which haven't been built yet
+        recon = self.__dict__.get("_recon")
+        if recon is None or name not in self.__dataclass_fields__:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        component = recon.__dict__.get(name)
+        if component is None:
+            component = getattr(type(recon), name).func(recon)
+        self.__dict__[name] = component
+        return component
+
+    def __getstate__(self) -> dict[str, pd.DataFrame]:
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
 
 @dataclass
 class ReconciledArgs:
-    left_on: str
-    right_on: str
+    left_on: Key
+    right_on: Key
     left_suffix: Optional[str] = None
     right_suffix: Optional[str] = None
     left_sheet_name: Optional[str] = None
@@ -67,6 +154,17 @@ class ReconciledStats:
     duplicated_rows: int = 0
 
 
+@dataclass
+class ReconciledDifferences:
+    data: pd.DataFrame
+    """
+    Matched records with at least one differing value, indexed like `both`. Only
+    the compared columns with differences are included.
+    """
+    counts: pd.Series
+    """Number of matched records with a differing value, per compared column."""
+
+
 @dataclass
 class ReconciledReport:
     data: ReconciledData
@@ -74,19 +172,107 @@ class ReconciledReport:
     relationship: Relationship
     left_stats: ReconciledStats
     right_stats: ReconciledStats
+    timings: list[StageTiming] = field(default_factory=list)
+
+
+def _duplicated(df: pd.DataFrame, fingerprints: np.ndarray) -> np.ndarray:
+    """
+    Flags the records which repeat an earlier record. Records sharing a
+    fingerprint are only candidates, whose values are compared so that a hash
+    collision is never reported as a duplicate.
+    """
+    candidates = np.flatnonzero(
+        pd.Series(fingerprints).duplicated(keep=False).to_numpy()
+    )
+    duplicated = np.zeros(len(df), dtype=bool)
+    if len(candidates):
+        duplicated[candidates] = df.iloc[candidates].duplicated(keep="first")
+    return duplicated
+
+
+def _sheet_names(sheet_name: Any) -> Optional[str]:
+    if isinstance(sheet_name, (list, tuple)):
+        return ", ".join(map(str, sheet_name))
+    return sheet_name
+
+
+def _total_rows(recon: "Reconcile") -> int:
+    return len(recon.left) + len(recon.right)
+
+
+def _timed(
+    stage: str,
+    rows_out: Callable[[Any], int] = len,
+    rows_in: Callable[["Reconcile"], int] = _total_rows,
+):
+    """Records the decorated method as a stage of the object's profiler."""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self: "Reconcile"):
+            with self._profiler.stage(stage, rows_in=rows_in(self)) as timing:
+                result = method(self)
+                timing.rows_out = rows_out(result)
+            return result
+
+        return wrapper
+
+    return decorator
 
 
 class Reconcile:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        workers: int = 1,
+        dtype_backend: DtypeBackend = "numpy_nullable",
+        key_normalizers: Optional[list[KeyNormalizer]] = None,
+        fuzzy_threshold: Optional[float] = None,
+        match_tolerance: Optional[dict[str, Tolerance]] = None,
+        on_stage: Optional[StageCallback] = None,
+        engine: Engine = "pandas",
+    ) -> None:
+        if dtype_backend not in ("numpy_nullable", "pyarrow"):
+            raise ValueError(
+                f"Unknown dtype backend ({dtype_backend}). "
+                "Use either numpy_nullable or pyarrow."
+            )
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine ({engine}). Use one of: {', '.join(ENGINES)}."
+            )
+
+        self.workers = workers
+        """Number of processes used to classify records."""
+        self.engine = engine
+        """
+        Engine which encodes and classifies the keys. The polars engine runs on
+        polars' own thread pool rather than `workers` processes.
+        """
+        self.dtype_backend = dtype_backend
+        self.key_normalizers = key_normalizers or []
+        """Applied in turn to the keys before they are matched."""
+        self.fuzzy_threshold = fuzzy_threshold
+        """Smallest similarity of unmatched keys listed by `fuzzy`."""
+        self.match_tolerance = match_tolerance
+        """
+        Column, found in both datasets, whose nearest values within the tolerance
+        match, e.g. {"date": "3D"}. Records are matched within their exact key.
+        """
+        self._profiler = Profiler(on_stage)
+
         self.left: pd.DataFrame
         self.right: pd.DataFrame
-        self.left_on: str
-        self.right_on: str
+        self.left_on: Key
+        self.right_on: Key
         self.left_sheet_name: Optional[str] = None
         self.right_sheet_name: Optional[str] = None
 
         self.suffixes: tuple[str, str]
 
+        self._left_keys: pd.DataFrame
+        self._right_keys: pd.DataFrame
+        """Key columns as matched, i.e. normalized."""
+
         self._output_dispatch = [
             "left_only",
             "right_only",
@@ -98,6 +284,7 @@ class Reconcile:
             "right",
             "both",
             "all_data",
+            "fuzzy",
         ]
         """List of property names available for output."""
 
@@ -112,6 +299,8 @@ class Reconcile:
             "right",
         ]
         """List of property names represented by "all"."""
+        if fuzzy_threshold is not None:
+            self._all.append("fuzzy")
 
     def _set_suffixes(self):
         # No valid suffix set -> use default
@@ -137,150 +326,497 @@ class Reconcile:
         # Ensure suffixes are set properly before mapping
         self._set_suffixes()
 
-        left_columns = set(self.left.reset_index(names="index").columns)
-        right_columns = set(self.right.reset_index(names="index").columns)
-        common_columns = left_columns & right_columns
-        left_only = left_columns - right_columns
-        right_only = right_columns - left_columns
+        left_columns = ["index", *self.left.columns]
+        right_columns = ["index", *self.right.columns]
+        common_columns = set(left_columns) & set(right_columns)
 
         # Where the merge on column has the same name pandas doesn't add a suffix
-        if self.left_on == self.right_on:
-            common_columns.remove(self.left_on)
-            left_columns.add(self.left_on)
-            right_columns.add(self.right_on)
-
-        left_map = {col: col for col in left_only}
-        left_map.update({col: col + self.suffixes[0] for col in common_columns})
+        common_columns -= set(self._shared_keys)
 
-        right_map = {col: col for col in right_only}
-        right_map.update({col: col + self.suffixes[1] for col in common_columns})
+        left_map = {
+            col: col + self.suffixes[0] if col in common_columns else col
+            for col in left_columns
+        }
+        right_map = {
+            col: col + self.suffixes[1] if col in common_columns else col
+            for col in right_columns
+        }
 
         return left_map, right_map
 
+    @property
+    def timings(self) -> list[StageTiming]:
+        """
+        Wall time, rows in and out and memory delta of every stage run so far:
+        reading, dtype conversion, key normalization and encoding, classification,
+        every component computed and every output written.
+        """
+        return self._profiler.timings
+
+    @property
+    def _shared_keys(self) -> list[str]:
+        """Key columns with the same name on both sides, which `all_data` coalesces."""
+        return [
+            left
+            for left, right in zip(
+                ensure_list(self.left_on), ensure_list(self.right_on)
+            )
+            if left == right
+        ]
+
     @cached_property
-    def all_data(self) -> pd.DataFrame:
-        self._left_name_map, self._right_name_map = self._map_column_names()
-
-        return pd.merge(
-            self.left.reset_index(names="index"),
-            self.right.reset_index(names="index"),
-            left_on=self.left_on,
-            right_on=self.right_on,
-            indicator=True,
-            how="outer",
-            suffixes=self.suffixes,
+    def _name_maps(self) -> tuple[dict[str, str], dict[str, str]]:
+        return self._map_column_names()
+
+    @cached_property
+    @_timed("encode_keys", rows_out=lambda codes: len(codes[0]) + len(codes[1]))
+    def _key_codes(self) -> tuple[np.ndarray, np.ndarray, int]:
+        if self._left_keys.shape[1] == 0:
+            # Without exact keys every record belongs to the same group
+            return (
+                np.zeros(len(self.left), dtype=np.int32),
+                np.zeros(len(self.right), dtype=np.int32),
+                1,
+            )
+        if self.engine == "polars":
+            return polars_engine.encode_keys(self._left_keys, self._right_keys)
+        return encode_keys(self._left_keys, self._right_keys)
+
+    @cached_property
+    def _match_on(self) -> tuple[pd.Series, pd.Series, Union[float, pd.Timedelta]]:
+        """
+        The left and right values of the `match_tolerance` column and its
+        tolerance, validated. Text is parsed as dates for timedelta tolerances.
+        """
+        if self.match_tolerance is None or len(self.match_tolerance) != 1:
+            raise ValueError("match_tolerance must name exactly one column.")
+
+        column, tolerance = next(iter(self.match_tolerance.items()))
+        for position, df in (("left", self.left), ("right", self.right)):
+            if column not in df.columns:
+                raise ValueError(
+                    f"{column} doesn't exist within the {position} dataset."
+                )
+        left, right = self.left[column], self.right[column]
+
+        if isinstance(tolerance, (int, float)):
+            if is_numeric_dtype(left.dtype) and is_numeric_dtype(right.dtype):
+                return left, right, float(tolerance)
+            raise ValueError(f"{column} must hold numbers within both datasets.")
+
+        try:
+            return pd.to_datetime(left), pd.to_datetime(right), pd.Timedelta(tolerance)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"{column} must hold dates within both datasets, and its tolerance "
+                f"({tolerance}) must be a timedelta."
+            ) from None
+
+    @cached_property
+    @_timed("classify", rows_out=lambda classification: classification.size)
+    def _classification(self) -> Classification:
+        if self.match_tolerance is not None:
+            return classify_asof(*self._key_codes, *self._match_on)
+        if self.engine == "polars":
+            return polars_engine.classify(*self._key_codes)
+
+        return classify_parallel(*self._key_codes, self.workers)
+
+    @cached_property
+    def _key_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        """Number of left and right records per key code."""
+        if "_classification" in self.__dict__:
+            return self._classification.left_counts, self._classification.right_counts
+        return count_keys(*self._key_codes)
+
+    @cached_property
+    @_timed("left_fingerprints", rows_in=lambda self: len(self.left))
+    def left_fingerprints(self) -> np.ndarray:
+        """
+        64-bit hash of every left record's values, computed once and reused for
+        duplicate and change detection.
+        """
+        return row_fingerprints(self.left)
+
+    @cached_property
+    @_timed("right_fingerprints", rows_in=lambda self: len(self.right))
+    def right_fingerprints(self) -> np.ndarray:
+        """
+        64-bit hash of every right record's values, computed once and reused for
+        duplicate and change detection.
+        """
+        return row_fingerprints(self.right)
+
+    @cached_property
+    def _left_duplicated(self) -> np.ndarray:
+        return _duplicated(self.left, self.left_fingerprints)
+
+    @cached_property
+    def _right_duplicated(self) -> np.ndarray:
+        return _duplicated(self.right, self.right_fingerprints)
+
+    def _side_frame(
+        self, position: Literal["left", "right"], positions: np.ndarray
+    ) -> pd.DataFrame:
+        """
+        Returns the records at `positions` with the original index as the first
+        column and the column names used within `all_data`. Positions of -1 result
+        in missing values.
+        """
+        if position == "left":
+            df, name_map = self.left, self._name_maps[0]
+        else:
+            df, name_map = self.right, self._name_maps[1]
+
+        index = pd.Series(df.index).convert_dtypes(dtype_backend=self.dtype_backend)
+        # Positions are stored compactly, pandas indexes with intp
+        positions = positions.astype(np.intp, copy=False)
+
+        frame = df.set_axis(pd.RangeIndex(len(df)), copy=False).reindex(positions)
+        frame.insert(0, "index", index.reindex(positions).array)
+        frame.index = pd.RangeIndex(len(frame))
+
+        return frame.rename(columns=name_map)
+
+    def _component(
+        self, position: Literal["left", "right"], positions: np.ndarray
+    ) -> pd.DataFrame:
+        index_name = self._name_maps[0 if position == "left" else 1]["index"]
+
+        return self._side_frame(position, positions).set_index(index_name)
+
+    def _combine(
+        self,
+        left_positions: np.ndarray,
+        right_positions: np.ndarray,
+        merge_codes: np.ndarray,
+    ) -> pd.DataFrame:
+        """Lays out matched records side by side like `pandas.merge`."""
+        left_frame = self._side_frame("left", left_positions)
+        right_frame = self._side_frame("right", right_positions)
+
+        for key in self._shared_keys:
+            left_frame[key] = left_frame[key].where(
+                left_positions >= 0, right_frame[key]
+            )
+        right_frame = right_frame.drop(columns=self._shared_keys)
+
+        frame = pd.concat([left_frame, right_frame], axis=1)
+        frame["_merge"] = pd.Categorical.from_codes(
+            merge_codes, categories=["left_only", "right_only", "both"]
         )
 
+        return frame
+
     @cached_property
+    @_timed("all_data")
+    def all_data(self) -> pd.DataFrame:
+        classification = self._classification
+
+        left_positions = np.full(classification.size, -1, dtype=np.intp)
+        left_positions[classification.both_index] = classification.both_left
+        left_positions[classification.left_only_index] = classification.left_only
+
+        right_positions = np.full(classification.size, -1, dtype=np.intp)
+        right_positions[classification.both_index] = classification.both_right
+        right_positions[classification.right_only_index] = classification.right_only
+
+        merge_codes = np.full(classification.size, 2, dtype=np.int8)
+        merge_codes[classification.left_only_index] = 0
+        merge_codes[classification.right_only_index] = 1
+
+        return self._combine(left_positions, right_positions, merge_codes)
+
+    @cached_property
+    @_timed("both")
     def both(self) -> pd.DataFrame:
-        return self.all_data.loc[self.all_data["_merge"] == "both"].convert_dtypes()
+        classification = self._classification
+        both = self._combine(
+            classification.both_left,
+            classification.both_right,
+            np.full(len(classification.both_index), 2, dtype=np.int8),
+        )
+        both.index = classification.both_index.astype(np.int64)
+
+        return both
 
     @cached_property
+    @_timed("left_both")
     def left_both(self) -> pd.DataFrame:
-        return (
-            self.both[self._left_name_map.values()]
-            .drop_duplicates()
-            .convert_dtypes()
-            .set_index(f"index{self.suffixes[0]}")
-        )
+        return self._component("left", self._classification.left_both)
 
     @cached_property
+    @_timed("right_both")
     def right_both(self) -> pd.DataFrame:
-        return (
-            self.both[self._right_name_map.values()]
-            .drop_duplicates()
-            .convert_dtypes()
-            .set_index(f"index{self.suffixes[1]}")
-        )
+        return self._component("right", self._classification.right_both)
 
     @cached_property
+    @_timed("left_only")
     def left_only(self) -> pd.DataFrame:
-        return (
-            self.all_data.loc[
-                self.all_data["_merge"] == "left_only",
-                list(self._left_name_map.values()),
-            ]
-            .convert_dtypes()
-            .set_index(f"index{self.suffixes[0]}")
-        )
+        return self._component("left", self._classification.left_only)
 
     @cached_property
+    @_timed("right_only")
     def right_only(self) -> pd.DataFrame:
-        return (
-            self.all_data.loc[
-                self.all_data["_merge"] == "right_only",
-                list(self._right_name_map.values()),
-            ]
-            .convert_dtypes()
-            .set_index(f"index{self.suffixes[1]}")
-        )
+        return self._component("right", self._classification.right_only)
 
     @cached_property
+    @_timed("left_duplicate")
     def left_duplicate(self) -> pd.DataFrame:
-        return (
-            self.left.loc[self.left.duplicated(keep="first")]
-            .rename_axis(index=f"index{self.suffixes[0]}")
-            .convert_dtypes()
+        return self.left.loc[self._left_duplicated].rename_axis(
+            index=f"index{self.suffixes[0]}"
         )
 
     @cached_property
+    @_timed("right_duplicate")
     def right_duplicate(self) -> pd.DataFrame:
-        return (
-            self.right.loc[self.right.duplicated(keep="first")]
-            .rename_axis(index=f"index{self.suffixes[1]}")
-            .convert_dtypes()
+        return self.right.loc[self._right_duplicated].rename_axis(
+            index=f"index{self.suffixes[1]}"
         )
 
+    @cached_property
+    @_timed("fuzzy")
+    def fuzzy(self) -> pd.DataFrame:
+        """
+        Candidate matches between `left_only` and `right_only` records whose keys
+        are similar, scored by the Jaccard similarity of their trigrams, best
+        first.
+        """
+        classification = self._classification
+        left_codes, right_codes, _ = self._key_codes
+
+        # Keys are compared once, using the first record of each
+        left_keys, left_first, left_key_ids = np.unique(
+            left_codes[classification.left_only],
+            return_index=True,
+            return_inverse=True,
+        )
+        right_keys, right_first, right_key_ids = np.unique(
+            right_codes[classification.right_only],
+            return_index=True,
+            return_inverse=True,
+        )
+        pairs = fuzzy_pairs(
+            key_text(self._left_keys.iloc[classification.left_only[left_first]]),
+            key_text(self._right_keys.iloc[classification.right_only[right_first]]),
+            self.fuzzy_threshold or DEFAULT_FUZZY_THRESHOLD,
+        )
+
+        records = pairs.merge(
+            pd.DataFrame(
+                {"left": left_key_ids, "left_position": classification.left_only}
+            ),
+            on="left",
+        ).merge(
+            pd.DataFrame(
+                {"right": right_key_ids, "right_position": classification.right_only}
+            ),
+            on="right",
+        )
+
+        # Both sides' keys are shown, so shared key names are suffixed as well
+        shared = self._shared_keys
+        left_frame = self._side_frame(
+            "left", records["left_position"].to_numpy()
+        ).rename(columns={key: key + self.suffixes[0] for key in shared})
+        right_frame = self._side_frame(
+            "right", records["right_position"].to_numpy()
+        ).rename(columns={key: key + self.suffixes[1] for key in shared})
+
+        frame = pd.concat([left_frame, right_frame], axis=1)
+        frame["score"] = records["score"].to_numpy()
+
+        return frame
+
     @cached_property
     def is_left_unique(self) -> bool:
-        return self.left[self.left_on].is_unique
+        return bool((self._key_counts[0] <= 1).all())
 
     @cached_property
     def is_right_unique(self) -> bool:
-        return self.right[self.right_on].is_unique
+        return bool((self._key_counts[1] <= 1).all())
+
+    def _stats(
+        self, rows: int, both_rows: int, duplicated: np.ndarray
+    ) -> ReconciledStats:
+        return ReconciledStats(
+            rows=rows,
+            both_rows=both_rows,
+            unique_rows=rows - both_rows,
+            duplicated_rows=int(duplicated.sum()),
+        )
 
     @cached_property
-    def relationship(self) -> Relationship:
-        if self.is_left_unique and self.is_right_unique:
-            return Relationship.ONE_TO_ONE
-        elif self.is_left_unique and not self.is_right_unique:
-            return Relationship.ONE_TO_MANY
-        elif not self.is_left_unique and self.is_right_unique:
-            return Relationship.MANY_TO_ONE
+    def left_stats(self) -> ReconciledStats:
+        """Row counts of the left components, computed without building them."""
+        if self.match_tolerance is not None:
+            both_rows = len(self._classification.left_both)
         else:
-            return Relationship.MANY_TO_MANY
+            left_counts, right_counts = self._key_counts
+            both_rows = int(left_counts[right_counts > 0].sum())
+
+        return self._stats(len(self.left), both_rows, self._left_duplicated)
+
+    @cached_property
+    def right_stats(self) -> ReconciledStats:
+        """Row counts of the right components, computed without building them."""
+        if self.match_tolerance is not None:
+            both_rows = len(self._classification.right_both)
+        else:
+            left_counts, right_counts = self._key_counts
+            both_rows = int(right_counts[left_counts > 0].sum())
+
+        return self._stats(len(self.right), both_rows, self._right_duplicated)
+
+    @cached_property
+    def relationship(self) -> Relationship:
+        return get_relationship(self.is_left_unique, self.is_right_unique)
+
+    def differences(
+        self,
+        columns: Optional[list[str]] = None,
+        tolerance: Union[Tolerance, dict[str, Tolerance]] = 0,
+    ) -> ReconciledDifferences:
+        """
+        Compares the values of matched records column by column.
+
+        :param:`columns` are columns found in both datasets, by default every
+        common column other than the keys. :param:`tolerance` is the largest
+        difference still treated as equal, either for every column or by column
+        name: a number for numeric columns or a `pandas.Timedelta` for dates.
+        Missing values equal each other.
+        """
+        keys = {*ensure_list(self.left_on), *ensure_list(self.right_on)}
+        if columns is None:
+            columns = [
+                col
+                for col in self.left.columns
+                if col in self.right.columns and col not in keys
+            ]
+
+        missing = [
+            col
+            for col in columns
+            if col not in self.left.columns or col not in self.right.columns
+        ]
+        if missing:
+            raise ValueError(
+                f"Columns ({', '.join(map(str, missing))}) don't exist within both "
+                "datasets."
+            )
+
+        classification = self._classification
+        with self._profiler.stage(
+            "differences", rows_in=len(classification.both_index)
+        ) as timing:
+            left_map, right_map = self._name_maps
+
+            counts = {}
+            differs = np.zeros(len(classification.both_index), dtype=bool)
+            values: dict[str, pd.Series] = {}
+            for col in columns:
+                left_values = self.left[col].take(classification.both_left)
+                right_values = self.right[col].take(classification.both_right)
+                col_tolerance = (
+                    tolerance.get(col, 0) if isinstance(tolerance, dict) else tolerance
+                )
+
+                mismatched = mismatches(left_values, right_values, col_tolerance)
+                counts[col] = int(mismatched.sum())
+                if counts[col]:
+                    differs |= mismatched
+                    values[left_map[col]] = left_values
+                    values[right_map[col]] = right_values
+
+            rows = np.flatnonzero(differs)
+            left_rows = classification.both_left[rows]
+            right_rows = classification.both_right[rows]
+            data = pd.DataFrame(
+                {
+                    left_map["index"]: self.left.index[left_rows],
+                    **{
+                        left_map[key]: self.left[key].take(left_rows).array
+                        for key in ensure_list(self.left_on)
+                    },
+                    right_map["index"]: self.right.index[right_rows],
+                    **{
+                        right_map[key]: self.right[key].take(right_rows).array
+                        for key in ensure_list(self.right_on)
+                        if key not in self._shared_keys
+                    },
+                    **{name: series.array[rows] for name, series in values.items()},
+                },
+                index=classification.both_index[rows].astype(np.int64),
+            )
+            timing.rows_out = len(data)
+
+        return ReconciledDifferences(
+            data=data, counts=pd.Series(counts, name="mismatches", dtype="int64")
+        )
 
     def info(self) -> None:
         left_stats = (
-            f"{len(self.left_both):,d} common + "
-            f"{len(self.left_only):,d} unique = "
-            f"{len(self.left):,d} records"
+            f"{self.left_stats.both_rows:,d} common + "
+            f"{self.left_stats.unique_rows:,d} unique = "
+            f"{self.left_stats.rows:,d} records"
         )
         right_stats = (
-            f"{len(self.right_both):,d} common + "
-            f"{len(self.left_only):,d} unique = "
-            f"{len(self.right):,d} records"
+            f"{self.right_stats.both_rows:,d} common + "
+            f"{self.right_stats.unique_rows:,d} unique = "
+            f"{self.right_stats.rows:,d} records"
         )
+        keys = f"{format_on(self.left_on)}:{format_on(self.right_on)}"
         report = dedent(
             f"""
         Reconciliation summary
 
         Left: {left_stats}
         Right: {right_stats}
-        Relationship: {self.relationship} ({self.left_on}:{self.right_on})
+        Relationship: {self.relationship} ({keys})
         """
         )
         print(report)
 
+    def to_snapshot(self, path: Optional[FilePath] = None) -> Snapshot:
+        """
+        Returns a :class:`recon.snapshot.Snapshot` of the per-key record counts and
+        row fingerprints, saved to the directory `path` if given. Later runs update
+        the snapshot with the records added and removed since.
+        """
+        from recon.snapshot import Snapshot
+
+        snapshot = Snapshot.from_frames(
+            self.left,
+            self.right,
+            self.left_on,
+            self.right_on,
+            self.left_fingerprints,
+            self.right_fingerprints,
+        )
+        if path is not None:
+            snapshot.save(path)
+
+        return snapshot
+
+    def release(
+        self, recon_components: Optional[list[RECON_COMPONENTS]] = None
+    ) -> None:
+        """
+        Drops the cached DataFrames of :param:`recon_components`, by default every
+        component including `all_data`. The row positions they're built from are
+        kept, so they're rebuilt if accessed again.
+        """
+        for component in recon_components or self._output_dispatch:
+            if component not in ("left", "right"):
+                self.__dict__.pop(component, None)
+
     def to_object(self) -> ReconciledReport:
+        """
+        Returns the report of the reconciliation. Its components are built when
+        accessed rather than copied up front.
+        """
         return ReconciledReport(
-            data=ReconciledData(
-                both=self.both,
-                left_duplicate=self.left_duplicate,
-                right_duplicate=self.right_duplicate,
-                left_only=self.left_only,
-                right_only=self.right_only,
-            ),
+            data=ReconciledData._lazy(self),
             args=ReconciledArgs(
                 left_on=self.left_on,
                 right_on=self.right_on,
@@ -290,144 +826,554 @@ class Reconcile:
                 right_sheet_name=self.right_sheet_name,
             ),
             relationship=self.relationship,
-            left_stats=ReconciledStats(
-                rows=len(self.left),
-                both_rows=len(self.left_both),
-                unique_rows=len(self.left_only),
-                duplicated_rows=len(self.left_duplicate),
-            ),
-            right_stats=ReconciledStats(
-                rows=len(self.right),
-                both_rows=len(self.right_both),
-                unique_rows=len(self.right_only),
-                duplicated_rows=len(self.right_duplicate),
-            ),
+            left_stats=self.left_stats,
+            right_stats=self.right_stats,
+            timings=list(self.timings),
         )
 
+    def _components(
+        self, recon_components: list[RECON_COMPONENTS]
+    ) -> Iterator[tuple[str, pd.DataFrame]]:
+        if recon_components == ["all"]:
+            write_list = self._all
+        else:
+            write_list = [x for x in recon_components if x in self._output_dispatch]
+
+        for component in write_list:
+            yield component, getattr(self, component)
+
+    def _write(self, writer, path: FilePath, components, **kwargs) -> None:
+        """Writes the components as an output stage of the profiler."""
+        with self._profiler.stage("write") as timing:
+            timing.rows_in = 0
+
+            def counted(components):
+                for name, frame in components:
+                    timing.rows_in += len(frame)
+                    yield name, frame
+
+            writer(path, counted(components), **kwargs)
+            timing.rows_out = timing.rows_in
+
     def to_xlsx(
         self,
         path: FilePath,
         recon_components: list[RECON_COMPONENTS] = ["all"],
+        on_rows: Optional[RowsCallback] = None,
         **kwargs,
     ) -> None:
-        if recon_components == ["all"]:
-            write_list = self._all
-        else:
-            write_list = [x for x in recon_components if x in self._output_dispatch]
+        """
+        Saves every component to its own worksheet. Rows are streamed to disk in
+        xlsxwriter's constant memory mode unless :param:`kwargs` are given, which
+        are passed onto `pandas.ExcelWriter` instead. :param:`on_rows` is called
+        with the progress of every component.
+        """
+        if not kwargs:
+            self._write(
+                write_xlsx, path, self._components(recon_components), on_rows=on_rows
+            )
+            return
 
         with pd.ExcelWriter(path, **kwargs) as writer:
-            for component in write_list:
-                getattr(self, component).to_excel(
-                    writer, sheet_name=component, index_label="index"
-                )
+            for component, frame in self._components(recon_components):
+                frame.to_excel(writer, sheet_name=component, index_label="index")
+
+    def to_csv_dir(
+        self,
+        path: FilePath,
+        recon_components: list[RECON_COMPONENTS] = ["all"],
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        on_rows: Optional[RowsCallback] = None,
+    ) -> None:
+        """Saves every component to `<path>/<component>.csv`."""
+        self._write(
+            write_csv_dir,
+            path,
+            self._components(recon_components),
+            chunksize=chunksize,
+            on_rows=on_rows,
+        )
+
+    def to_parquet(
+        self,
+        path: FilePath,
+        recon_components: list[RECON_COMPONENTS] = ["all"],
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        on_rows: Optional[RowsCallback] = None,
+    ) -> None:
+        """Saves every component to `<path>/<component>.parquet`."""
+        self._write(
+            write_parquet,
+            path,
+            self._components(recon_components),
+            chunksize=chunksize,
+            on_rows=on_rows,
+        )
+
+    def to_file(
+        self,
+        path: FilePath,
+        recon_components: list[RECON_COMPONENTS] = ["all"],
+        differences: Optional[ReconciledDifferences] = None,
+        on_rows: Optional[RowsCallback] = None,
+    ) -> None:
+        """
+        Saves the components with the writer matching the extension of `path`:
+        an xlsx workbook, or a directory of Parquet (.parquet) or csv (.csv or no
+        extension) files. :param:`differences` are saved as a `differences`
+        component if given. :param:`on_rows` is called with the progress of every
+        component.
+        """
+        components = self._components(recon_components)
+        if differences is not None:
+            components = chain(components, [("differences", differences.data)])
+
+        self._write(writer_for(path), path, components, on_rows=on_rows)
 
     def to_stdout(
         self, recon_components: list[RECON_COMPONENTS] = ["all"], **kwargs
     ) -> None:
-        if recon_components == ["all"]:
-            write_list = self._all
-        else:
-            write_list = [x for x in recon_components if x in self._output_dispatch]
-
         print("--------- START ----------")
-        for component in write_list:
+        for component, frame in self._components(recon_components):
             print(f"--------- {component} ----------")
-            getattr(self, component).to_csv(sys.stdout, index_label="index", **kwargs)
+            frame.to_csv(sys.stdout, index_label="index", **kwargs)
         print("--------- END ----------")
 
     @staticmethod
     def _read_obj(
         data: Any,
         sheet_name: str = "Sheet1",
+        columns: Optional[list[str]] = None,
         **kwargs,
     ):
-        initial_stream_position = 0
-        if isinstance(data, IOBase) and data.seekable():
-            initial_stream_position = data.tell()
-
-        try:
-            excel_file = pd.ExcelFile(data)
-        except Exception:
-            pass
-        else:
-            return pd.read_excel(excel_file, sheet_name, **kwargs)
-
-        if isinstance(data, IOBase) and data.seekable():
-            data.seek(initial_stream_position)
+        """
+        Reads a dataset with the reader registered for its format, which is
+        detected from the file extension or leading bytes. A `reader` keyword
+        argument selects a registered reader by name instead. Only `columns` are
+        loaded when specified.
+        """
+        reader = kwargs.pop("reader", None) or sniff_format(data)
 
-        return pd.read_csv(data, **kwargs)
+        return get_reader(reader)(
+            data, sheet_name=sheet_name, columns=columns, **kwargs
+        )
 
     @staticmethod
     def _load_df(
         recon_obj: "Reconcile",
         left_df: pd.DataFrame,
         right_df: pd.DataFrame,
-        left_on: str,
-        right_on: str,
+        left_on: Key,
+        right_on: Key,
         suffixes: tuple[str, str] = DEFAULT_SUFFIXES,
     ):
-        recon_obj.left = left_df
-        if left_on in recon_obj.left.columns:
-            recon_obj.left_on = left_on
-        else:
-            raise ValueError(
-                f"left_on ({left_on}) doesn't exist within the left dataset."
+        if recon_obj.dtype_backend == "pyarrow":
+            import_pyarrow()
+        if recon_obj.engine == "polars":
+            import_polars()
+
+        # Dtypes are inferred once here rather than for every component
+        with recon_obj._profiler.stage(
+            "convert_dtypes", rows_in=len(left_df) + len(right_df)
+        ) as timing:
+            recon_obj.left = left_df.convert_dtypes(
+                dtype_backend=recon_obj.dtype_backend
             )
+            recon_obj.right = right_df.convert_dtypes(
+                dtype_backend=recon_obj.dtype_backend
+            )
+            timing.rows_out = timing.rows_in
 
-        recon_obj.right = right_df
-        if right_on in recon_obj.right.columns:
-            recon_obj.right_on = right_on
-        else:
+        check_keys(left_df.columns, left_on, "left")
+        recon_obj.left_on = left_on
+
+        check_keys(right_df.columns, right_on, "right")
+        recon_obj.right_on = right_on
+
+        if len(ensure_list(left_on)) != len(ensure_list(right_on)):
             raise ValueError(
-                f"right_on ({right_on}) doesn't exist within the right dataset."
+                "left_on and right_on must have the same number of columns."
+            )
+        if recon_obj.match_tolerance is not None:
+            # Raises early if the column can't be matched within a tolerance
+            recon_obj._match_on
+        elif not ensure_list(left_on):
+            raise ValueError(
+                "left_on and right_on are required unless matching within a "
+                "match_tolerance."
             )
 
         recon_obj.suffixes = suffixes
 
+        # Keys are normalized once here and matched as normalized
+        with recon_obj._profiler.stage(
+            "normalize_keys", rows_in=len(recon_obj.left) + len(recon_obj.right)
+        ) as timing:
+            recon_obj._left_keys = normalize_keys(
+                recon_obj.left[ensure_list(left_on)], recon_obj.key_normalizers
+            )
+            recon_obj._right_keys = normalize_keys(
+                recon_obj.right[ensure_list(right_on)], recon_obj.key_normalizers
+            )
+            timing.rows_out = timing.rows_in
+
         return recon_obj
 
     @staticmethod
     def read_files(
         left_file: FilePath,
         right_file: FilePath,
-        left_on: str,
-        right_on: str,
+        left_on: Key,
+        right_on: Key,
         suffixes: tuple[str, str] = DEFAULT_SUFFIXES,
         left_kwargs: dict[str, Any] = {},
         right_kwargs: dict[str, Any] = {},
+        workers: int = 1,
+        columns: Optional[list[str]] = None,
+        cache_dir: Optional[FilePath] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        dtype_backend: DtypeBackend = "numpy_nullable",
+        key_normalizers: Optional[list[KeyNormalizer]] = None,
+        fuzzy_threshold: Optional[float] = None,
+        match_tolerance: Optional[dict[str, Tolerance]] = None,
+        on_stage: Optional[StageCallback] = None,
+        engine: Engine = "pandas",
     ):
         """
         Returns a :class:`Reconcile` object populated with data which can be queried.
 
-        :param:`left_kwargs` and :param:`right_kwargs` are
-        passed onto the `pandas.read_excel()` and `pandas.read_csv()` methods.
+        :param:`left_kwargs` and :param:`right_kwargs` are passed onto the
+        `pandas.read_excel()`, `pandas.read_csv()` and `pandas.read_parquet()`
+        methods, e.g. pyarrow `filters` to skip Parquet row groups. A list of
+        `sheet_name` reads the sheets as one dataset. Both datasets, and every
+        sheet, are read concurrently, see :func:`recon.loading.read_concurrently`,
+        and a missing key column raises as soon as its dataset is read.
+        :param:`workers` processes are used to classify the records.
+        :param:`columns` limits the columns loaded from either dataset, in
+        addition to the key columns. Columns missing from a dataset are ignored.
+        Parsed files are cached within :param:`cache_dir`, if set, so that later
+        runs against unchanged files skip parsing them.
+        Columns are converted to the nullable dtypes of :param:`dtype_backend`
+        once loaded. Keys are matched after applying :param:`key_normalizers`,
+        see `recon.keys.KEY_NORMALIZERS`. The `fuzzy` component, included in
+        "all" when :param:`fuzzy_threshold` is set, lists unmatched records with
+        similar keys. Records match on the nearest value of the
+        :param:`match_tolerance` column within its tolerance, instead of on equal
+        keys only, when set. :param:`on_stage` is called with the
+        :class:`recon.profiling.StageTiming` of every stage as it finishes.
+        Keys are encoded and classified by :param:`engine`, pandas or the
+        multithreaded polars.
         """
-        recon = Reconcile()
+        recon = Reconcile(
+            workers=workers,
+            dtype_backend=dtype_backend,
+            key_normalizers=key_normalizers,
+            fuzzy_threshold=fuzzy_threshold,
+            match_tolerance=match_tolerance,
+            on_stage=on_stage,
+            engine=engine,
+        )
+
+        left_columns = right_columns = None
+        if columns is not None:
+            columns = [*columns, *(match_tolerance or {})]
+            left_columns = [*ensure_list(left_on), *columns]
+            right_columns = [*ensure_list(right_on), *columns]
+
+        read = Reconcile._read_obj
+        if cache_dir is not None:
+            read = partial(InputCache(cache_dir, cache_max_bytes).read, read)
+
+        on = {"left": left_on, "right": right_on}
+        tasks = [
+            *sheet_tasks("left", left_file, {**left_kwargs, "columns": left_columns}),
+            *sheet_tasks(
+                "right", right_file, {**right_kwargs, "columns": right_columns}
+            ),
+        ]
+        frames: dict[ReadTask, pd.DataFrame] = {}
+        memory = current_rss()
+
+        def on_read(task: ReadTask, df: pd.DataFrame, seconds: float) -> None:
+            # Raises before the other side has finished reading
+            check_keys(df.columns, on[task.side], task.side)
+            frames[task] = df
+
+            nonlocal memory
+            rss = current_rss()
+            recon._profiler.record(
+                StageTiming(f"read_{task.side}", seconds, None, len(df), rss - memory)
+            )
+            memory = rss
 
-        left_df = Reconcile._read_obj(left_file, **left_kwargs)
-        recon.left_sheet_name = left_kwargs.get("sheet_name", None)
+        read_concurrently(read, tasks, on_read)
 
-        right_df = Reconcile._read_obj(right_file, **right_kwargs)
-        recon.right_sheet_name = right_kwargs.get("sheet_name", None)
+        def side_df(side: str) -> pd.DataFrame:
+            parts = [frames[task] for task in tasks if task.side == side]
+            return parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+
+        recon.left_sheet_name = _sheet_names(left_kwargs.get("sheet_name", None))
+        recon.right_sheet_name = _sheet_names(right_kwargs.get("sheet_name", None))
 
         recon = Reconcile._load_df(
-            recon, left_df, right_df, left_on, right_on, suffixes
+            recon, side_df("left"), side_df("right"), left_on, right_on, suffixes
         )
 
         return recon
 
+    @staticmethod
+    def build_index(
+        file: FilePath, on: Key, index_dir: FilePath, kwargs: dict[str, Any] = {}
+    ) -> KeyIndex:
+        """
+        Reads the reference dataset `file` once, passing :param:`kwargs` onto its
+        reader, and saves a :class:`recon.index.KeyIndex` of it to the directory
+        `index_dir` for :meth:`Reconcile.read_index`.
+        """
+        from recon.index import KeyIndex
+
+        return KeyIndex.build(Reconcile._read_obj(file, **kwargs), on, index_dir)
+
+    @staticmethod
+    def read_index(
+        index_dir: FilePath,
+        right_file: FilePath,
+        right_on: Key,
+        suffixes: tuple[str, str] = DEFAULT_SUFFIXES,
+        right_kwargs: dict[str, Any] = {},
+        workers: int = 1,
+        columns: Optional[list[str]] = None,
+        dtype_backend: DtypeBackend = "numpy_nullable",
+        on_stage: Optional[StageCallback] = None,
+        engine: Engine = "pandas",
+    ):
+        """
+        Returns a :class:`Reconcile` object of `right_file` against the records of
+        the reference dataset indexed within `index_dir` which share its keys.
+
+        Only the matching reference records are read from the memory-mapped
+        index, so the left components hold those records alone: `left_only` is
+        empty but for keys equal as strings which don't match as values. Indexed
+        keys are looked up as strings, so key normalizers aren't supported.
+        """
+        from recon.index import KeyIndex
+
+        recon = Reconcile(
+            workers=workers,
+            dtype_backend=dtype_backend,
+            on_stage=on_stage,
+            engine=engine,
+        )
+        index = KeyIndex.load(index_dir)
+
+        left_columns = right_columns = None
+        if columns is not None:
+            left_columns = [*ensure_list(index.on), *columns]
+            right_columns = [*ensure_list(right_on), *columns]
+
+        with recon._profiler.stage("read_right") as timing:
+            right_df = Reconcile._read_obj(
+                right_file, columns=right_columns, **right_kwargs
+            )
+            timing.rows_out = len(right_df)
+        recon.right_sheet_name = right_kwargs.get("sheet_name", None)
+
+        with recon._profiler.stage("read_left", rows_in=len(right_df)) as timing:
+            left_df = index.matching(right_df, right_on, left_columns)
+            timing.rows_out = len(left_df)
+
+        return Reconcile._load_df(
+            recon, left_df, right_df, index.on, right_on, suffixes
+        )
+
+    @staticmethod
+    def read_sql(
+        left: str,
+        right: str,
+        left_on: Key,
+        right_on: Key,
+        con: Any,
+        suffixes: tuple[str, str] = DEFAULT_SUFFIXES,
+        recon_components: Optional[list[RECON_COMPONENTS]] = None,
+        columns: Optional[list[str]] = None,
+        chunksize: int = sql.DEFAULT_SQL_CHUNKSIZE,
+        workers: int = 1,
+        dtype_backend: DtypeBackend = "numpy_nullable",
+        key_normalizers: Optional[list[KeyNormalizer]] = None,
+        on_stage: Optional[StageCallback] = None,
+        engine: Engine = "pandas",
+    ):
+        """
+        Returns a :class:`Reconcile` object of the tables, or queries, `left` and
+        `right` within the database :param:`con`: a `sqlite:///path/to.db` URL
+        or a DB-API connection. Rows are fetched :param:`chunksize` at a time and
+        indexed by their row number within the table or query.
+
+        When :param:`recon_components` excludes "all", key matching is pushed down
+        to the database, so only the records those components need are fetched,
+        e.g. just the unmatched left records for `left_only`. The other
+        components and stats then cover the fetched records alone. Keys are
+        compared by the database, null-safely, so key normalizers disable the
+        pushdown.
+        """
+        recon = Reconcile(
+            workers=workers,
+            dtype_backend=dtype_backend,
+            key_normalizers=key_normalizers,
+            on_stage=on_stage,
+            engine=engine,
+        )
+        left_keys, right_keys = ensure_list(left_on), ensure_list(right_on)
+
+        left_columns = right_columns = None
+        if columns is not None:
+            left_columns = [*left_keys, *columns]
+            right_columns = [*right_keys, *columns]
+
+        left_matched = right_matched = {True, False}
+        if (
+            recon_components is not None
+            and "all" not in recon_components
+            and not key_normalizers
+            and len(left_keys) == len(right_keys) > 0
+        ):
+            left_matched, right_matched = sql.needed_records(recon_components)
+
+        connection = sql.connect(con) if isinstance(con, str) else con
+        try:
+            # Raises before fetching any rows
+            check_keys(sql.source_columns(connection, left), left_on, "left")
+            check_keys(sql.source_columns(connection, right), right_on, "right")
+
+            with recon._profiler.stage("read_left") as timing:
+                left_df = sql.select(
+                    connection,
+                    left,
+                    left_columns,
+                    left_matched,
+                    left_keys,
+                    right,
+                    right_keys,
+                    chunksize,
+                )
+                timing.rows_out = len(left_df)
+
+            with recon._profiler.stage("read_right") as timing:
+                right_df = sql.select(
+                    connection,
+                    right,
+                    right_columns,
+                    right_matched,
+                    right_keys,
+                    left,
+                    left_keys,
+                    chunksize,
+                )
+                timing.rows_out = len(right_df)
+        finally:
+            if connection is not con:
+                connection.close()
+
+        return Reconcile._load_df(recon, left_df, right_df, left_on, right_on, suffixes)
+
+    @staticmethod
+    def estimate(
+        left: Union[FilePath, KeySketch],
+        right: Union[FilePath, KeySketch],
+        left_on: Key,
+        right_on: Key,
+        left_kwargs: dict[str, Any] = {},
+        right_kwargs: dict[str, Any] = {},
+        key_normalizers: Optional[list[KeyNormalizer]] = None,
+        precision: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> OverlapEstimate:
+        """
+        Estimates the key counts, overlap, duplicate rates and relationship of two
+        datasets from HyperLogLog sketches of their keys, streamed in a single
+        pass, see :func:`recon.sketch.sketch_file`. Either side may be a
+        :class:`recon.sketch.KeySketch` taken earlier, e.g. of yesterday's file.
+        """
+        from recon.sketch import (
+            DEFAULT_CHUNKSIZE,
+            DEFAULT_PRECISION,
+            KeySketch,
+            estimate,
+            sketch_file,
+        )
+
+        def sketch(data, on: Key, position: str, kwargs: dict[str, Any]):
+            if isinstance(data, KeySketch):
+                return data
+            return sketch_file(
+                data,
+                on,
+                position,
+                kwargs,
+                precision or DEFAULT_PRECISION,
+                chunksize or DEFAULT_CHUNKSIZE,
+                key_normalizers,
+            )
+
+        return estimate(
+            sketch(left, left_on, "left", left_kwargs),
+            sketch(right, right_on, "right", right_kwargs),
+        )
+
+    @staticmethod
+    def run_many(
+        jobs: list[BatchJob],
+        processes: Optional[int] = None,
+        memory_budget_mb: Optional[int] = None,
+    ) -> list[BatchResult]:
+        """
+        Runs many reconciliations, see :class:`recon.batch.BatchJob`, on a pool of
+        :param:`processes` and returns a :class:`recon.batch.BatchResult` for each.
+        Jobs start while their estimated memory fits within
+        :param:`memory_budget_mb`, and files shared by several jobs are read once
+        per process.
+        """
+        from recon.batch import run_batch
+
+        return run_batch(jobs, processes, memory_budget_mb)
+
     @staticmethod
     def read_df(
         left_df: Union[pd.DataFrame, pd.Series[Any]],
         right_df: Union[pd.DataFrame, pd.Series[Any]],
-        left_on: str,
-        right_on: str,
+        left_on: Key,
+        right_on: Key,
         suffixes: tuple[str, str] = DEFAULT_SUFFIXES,
+        workers: int = 1,
+        dtype_backend: DtypeBackend = "numpy_nullable",
+        key_normalizers: Optional[list[KeyNormalizer]] = None,
+        fuzzy_threshold: Optional[float] = None,
+        match_tolerance: Optional[dict[str, Tolerance]] = None,
+        on_stage: Optional[StageCallback] = None,
+        engine: Engine = "pandas",
     ):
         """
         Returns a :class:`Reconcile` object populated with data which can be queried.
+
+        :param:`workers` processes are used to classify the records. Columns are
+        converted to the nullable dtypes of :param:`dtype_backend` once loaded.
+        Keys are matched after applying :param:`key_normalizers`. The `fuzzy`
+        component, included in "all" when :param:`fuzzy_threshold` is set, lists
+        unmatched records with similar keys. Records match on the nearest value of
+        the :param:`match_tolerance` column within its tolerance, instead of on
+        equal keys only, when set. :param:`on_stage` is called with the timing of
+        every stage as it finishes. Keys are encoded and classified by
+        :param:`engine`, pandas or the multithreaded polars.
         """
-        recon = Reconcile()
+        recon = Reconcile(
+            workers=workers,
+            dtype_backend=dtype_backend,
+            key_normalizers=key_normalizers,
+            fuzzy_threshold=fuzzy_threshold,
+            match_tolerance=match_tolerance,
+            on_stage=on_stage,
+            engine=engine,
+        )
         recon = Reconcile._load_df(
             recon,
             ensure_df(left_df, "left"),
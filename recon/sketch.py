@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import base64
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from recon.engine import hash_keys
+from recon.keys import KeyNormalizer, normalize_keys
+from recon.readers import get_reader, import_pyarrow, sniff_format
+from recon.reconcile import Key, Relationship, get_relationship
+from recon.utils import FilePath, check_keys, ensure_list, replace_file
+
+SKETCH_VERSION = 3
+"""Bump when the layout of saved sketches changes."""
+
+SKETCH_EXTENSION = ".hll"
+
+DEFAULT_PRECISION = 16
+"""2**16 registers of one byte, for a standard error of about 0.4%."""
+
+DEFAULT_CHUNKSIZE = 1_000_000
+"""Rows of keys read at a time."""
+
+
+@dataclass
+class KeySketch:
+    """
+    HyperLogLog sketch of the keys of one dataset, together with its number of
+    records. Its size depends on the precision alone, whatever the number of
+    records, and sketches of the same precision can be merged.
+
+    Keys are hashed by value whatever their dtype, see
+    :func:`recon.engine.hash_keys`, so sketches taken from different formats, or
+    on different days, can be compared. Keys are only compared as strings once
+    key normalizers apply.
+    """
+
+    on: Key
+    rows: int
+    registers: np.ndarray
+
+    @staticmethod
+    def empty(on: Key, precision: int = DEFAULT_PRECISION) -> KeySketch:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18.")
+        return KeySketch(on, 0, np.zeros(2**precision, dtype=np.uint8))
+
+    @property
+    def precision(self) -> int:
+        return len(self.registers).bit_length() - 1
+
+    @property
+    def standard_error(self) -> float:
+        """Relative standard error of the distinct key estimate."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Adds the 64-bit key hashes of a chunk of records."""
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64(2 ** (64 - p) - 1)
+        # The exponent is the bit length of the remaining bits, so the register
+        # records the position of their leftmost set bit
+        _, exponent = np.frexp(rest.astype(np.float64))
+        np.maximum.at(self.registers, index, (64 - p + 1 - exponent).astype(np.uint8))
+        self.rows += len(hashes)
+
+    @property
+    def distinct(self) -> float:
+        """Estimated number of distinct keys."""
+        m = len(self.registers)
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m
+        estimate /= np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for few keys
+            estimate = m * math.log(m / zeros)
+        return min(estimate, float(self.rows))
+
+    @property
+    def duplicate_rate(self) -> float:
+        """Estimated share of records whose key an earlier record already has."""
+        return 1 - self.distinct / self.rows if self.rows else 0.0
+
+    @property
+    def is_unique(self) -> bool:
+        """
+        Whether every key is likely unique. Duplicate rates within three times the
+        standard error can't be told apart from none.
+        """
+        return self.duplicate_rate <= 3 * self.standard_error
+
+    def union(self, other: KeySketch) -> KeySketch:
+        if len(self.registers) != len(other.registers):
+            raise ValueError("Only sketches of the same precision can be merged.")
+        return KeySketch(
+            self.on, self.rows + other.rows, np.maximum(self.registers, other.registers)
+        )
+
+    def save(self, path: FilePath) -> None:
+        """Saves the sketch as JSON to `path`, replacing it atomically."""
+        content = {
+            "version": SKETCH_VERSION,
+            "on": self.on,
+            "rows": self.rows,
+            "registers": base64.b64encode(self.registers.tobytes()).decode(),
+        }
+        replace_file(Path(path), lambda f: f.write(json.dumps(content).encode()))
+
+    @staticmethod
+    def load(path: FilePath) -> KeySketch:
+        content = json.loads(Path(path).read_text())
+        if content.get("version") != SKETCH_VERSION:
+            raise ValueError(
+                f"Sketch version {content.get('version')} isn't supported. "
+                "Sketch the dataset again."
+            )
+        registers = np.frombuffer(base64.b64decode(content["registers"]), np.uint8)
+        return KeySketch(content["on"], content["rows"], registers.copy())
+
+
+def _key_chunks(
+    data: Any, on: Key, position: str, chunksize: int, **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the key columns of a dataset. csv, tsv and Parquet files are streamed
+    `chunksize` rows at a time, other formats are read with their key columns
+    only.
+    """
+    keys = ensure_list(on)
+    reader = kwargs.pop("reader", None) or sniff_format(data)
+
+    if reader == "tsv":
+        kwargs.setdefault("sep", "\t")
+    if reader in ("csv", "tsv"):
+        kwargs.pop("sheet_name", None)
+        wanted = set(keys)
+        chunks = pd.read_csv(
+            data,
+            usecols=lambda col: col in wanted,
+            chunksize=chunksize,
+            **kwargs,
+        )
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                check_keys(chunk.columns, on, position)
+            yield chunk
+        return
+
+    if reader == "parquet":
+        import_pyarrow()
+        import pyarrow.parquet as pq
+
+        file = pq.ParquetFile(data, memory_map=True)
+        check_keys(file.schema_arrow.names, on, position)
+        for batch in file.iter_batches(batch_size=chunksize, columns=keys):
+            yield batch.to_pandas()
+        return
+
+    df = get_reader(reader)(data, columns=keys, **kwargs)
+    check_keys(df.columns, on, position)
+    yield df[keys]
+
+
+def sketch_file(
+    data: Any,
+    on: Key,
+    position: str = "left",
+    kwargs: dict[str, Any] = {},
+    precision: int = DEFAULT_PRECISION,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    key_normalizers: Optional[list[KeyNormalizer]] = None,
+) -> KeySketch:
+    """
+    Sketches the keys of a dataset in a single pass. Only the key columns are
+    read, and memory doesn't grow with the number of records of streamed
+    formats. :param:`kwargs` are passed onto the reader.
+    """
+    sketch = KeySketch.empty(on, precision)
+    keys = ensure_list(on)
+    for chunk in _key_chunks(data, on, position, chunksize, **kwargs):
+        sketch.add(hash_keys(normalize_keys(chunk[keys], key_normalizers or []), keys))
+    return sketch
+
+
+@dataclass
+class OverlapEstimate:
+    """Estimated size and overlap of the keys of two datasets."""
+
+    left_rows: int
+    right_rows: int
+    left_keys: int
+    right_keys: int
+    common_keys: int
+    """Keys found within both datasets."""
+    left_duplicate_rate: float
+    right_duplicate_rate: float
+    relationship: Relationship
+    """Likely relationship, from the duplicate rates."""
+    standard_error: float
+    """Relative standard error of the key counts."""
+
+    @property
+    def left_only_keys(self) -> int:
+        return self.left_keys - self.common_keys
+
+    @property
+    def right_only_keys(self) -> int:
+        return self.right_keys - self.common_keys
+
+
+def estimate(left: KeySketch, right: KeySketch) -> OverlapEstimate:
+    """
+    Estimates the overlap of two datasets from their sketches. Common keys are
+    counted by inclusion-exclusion, so their error grows with the size of the
+    union rather than of the overlap.
+    """
+    left_keys, right_keys = left.distinct, right.distinct
+    common = left_keys + right_keys - left.union(right).distinct
+    common = min(max(common, 0.0), left_keys, right_keys)
+
+    return OverlapEstimate(
+        left_rows=left.rows,
+        right_rows=right.rows,
+        left_keys=round(left_keys),
+        right_keys=round(right_keys),
+        common_keys=round(common),
+        left_duplicate_rate=left.duplicate_rate,
+        right_duplicate_rate=right.duplicate_rate,
+        relationship=get_relationship(left.is_unique, right.is_unique),
+        standard_error=left.standard_error,
+    )
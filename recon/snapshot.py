@@ -0,0 +1,542 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+from recon.engine import hash_keys, row_fingerprints
+from recon.reconcile import Key, ReconciledStats, Relationship, get_relationship
+from recon.utils import FilePath, check_keys, ensure_list, replace_file
+
+SNAPSHOT_VERSION = 3
+"""Bump when the layout of saved snapshots changes."""
+
+
+@dataclass
+class RowIndex:
+    """Distinct row fingerprints of one dataset, sorted, with their counts."""
+
+    fingerprints: np.ndarray
+    counts: np.ndarray
+    keys: np.ndarray
+    """Key hash of every fingerprint."""
+
+    @staticmethod
+    def build(fingerprints: np.ndarray, keys: np.ndarray) -> RowIndex:
+        unique, first, counts = np.unique(
+            fingerprints, return_index=True, return_counts=True
+        )
+        return RowIndex(unique, counts, keys[first])
+
+    def count_of(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Returns the number of records with each of `fingerprints`."""
+        found, positions = _find(self.fingerprints, fingerprints)
+        counts = np.zeros(len(fingerprints), dtype=np.int64)
+        counts[found] = self.counts[positions[found]]
+        return counts
+
+
+@dataclass
+class ReconciledDelta:
+    """
+    Changes found by :meth:`Snapshot.update` and :meth:`Snapshot.diff`.
+
+    The component frames hold the added records only. Existing records whose
+    component changed are found through `keys`.
+    """
+
+    keys: pd.DataFrame
+    """
+    Every key touched by the change, indexed by key hash, with its record counts
+    and status before and after. Key values are missing for keys which only lost
+    records identified by fingerprint.
+    """
+    left_only: pd.DataFrame
+    right_only: pd.DataFrame
+    left_both: pd.DataFrame
+    right_both: pd.DataFrame
+    left_duplicate: pd.DataFrame
+    right_duplicate: pd.DataFrame
+
+
+@dataclass
+class Snapshot:
+    """
+    Compact state of a reconciliation: the per-key record counts and the row
+    fingerprints of both datasets, without any of their values.
+
+    A snapshot is updated from the records added and removed since it was taken,
+    at a cost which depends on the size of the change rather than the datasets.
+    Saved snapshots are directories of `.npy` arrays which are memory-mapped when
+    loaded.
+    """
+
+    left_on: Key
+    right_on: Key
+    keys: np.ndarray
+    """Sorted key hashes."""
+    left_counts: np.ndarray
+    """Number of left records per key."""
+    right_counts: np.ndarray
+    """Number of right records per key."""
+    left_rows: RowIndex
+    right_rows: RowIndex
+    left_stats: ReconciledStats
+    right_stats: ReconciledStats
+    left_multi_keys: int = 0
+    """Number of keys with more than one left record."""
+    right_multi_keys: int = 0
+    """Number of keys with more than one right record."""
+
+    @property
+    def relationship(self) -> Relationship:
+        return get_relationship(self.left_multi_keys == 0, self.right_multi_keys == 0)
+
+    @staticmethod
+    def from_frames(
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        left_on: Key,
+        right_on: Key,
+        left_fingerprints: Optional[np.ndarray] = None,
+        right_fingerprints: Optional[np.ndarray] = None,
+    ) -> Snapshot:
+        """
+        Returns the snapshot of `left` and `right`. Row fingerprints already taken
+        with :func:`recon.engine.row_fingerprints` are reused if given.
+        """
+        empty = Snapshot(
+            left_on=left_on,
+            right_on=right_on,
+            keys=np.empty(0, dtype=np.uint64),
+            left_counts=np.empty(0, dtype=np.int64),
+            right_counts=np.empty(0, dtype=np.int64),
+            left_rows=RowIndex.build(*_empty_hashes()),
+            right_rows=RowIndex.build(*_empty_hashes()),
+            left_stats=ReconciledStats(),
+            right_stats=ReconciledStats(),
+        )
+        snapshot, _ = empty._apply(
+            left,
+            right,
+            np.empty(0, dtype=np.uint64),
+            np.empty(0, dtype=np.uint64),
+            [],
+            (left_fingerprints, right_fingerprints),
+        )
+
+        return snapshot
+
+    def update(
+        self,
+        left: Optional[pd.DataFrame] = None,
+        right: Optional[pd.DataFrame] = None,
+        left_removed: Optional[pd.DataFrame] = None,
+        right_removed: Optional[pd.DataFrame] = None,
+    ) -> tuple[Snapshot, ReconciledDelta]:
+        """
+        Returns the snapshot after adding the records of `left` and `right` and
+        removing those of `left_removed` and `right_removed`, together with the
+        changes. Removals are applied first.
+        """
+        return self._apply(
+            left,
+            right,
+            self._fingerprints(left_removed, self.left_on, "left"),
+            self._fingerprints(right_removed, self.right_on, "right"),
+            [left_removed, right_removed],
+        )
+
+    def diff(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        left_fingerprints: Optional[np.ndarray] = None,
+        right_fingerprints: Optional[np.ndarray] = None,
+    ) -> tuple[Snapshot, ReconciledDelta]:
+        """
+        Returns the snapshot of the full `left` and `right` datasets, together with
+        the changes since this snapshot was taken. Records are matched to the
+        snapshot by fingerprint, so a changed record is a removal and an addition.
+        Row fingerprints already taken are reused if given.
+        """
+        check_keys(left.columns, self.left_on, "left")
+        check_keys(right.columns, self.right_on, "right")
+
+        left_added, left_added_fingerprints, left_removed = self._diff_side(
+            left, self.left_on, self.left_rows, left_fingerprints
+        )
+        right_added, right_added_fingerprints, right_removed = self._diff_side(
+            right, self.right_on, self.right_rows, right_fingerprints
+        )
+
+        return self._apply(
+            left_added,
+            right_added,
+            left_removed,
+            right_removed,
+            [],
+            (left_added_fingerprints, right_added_fingerprints),
+        )
+
+    @staticmethod
+    def _diff_side(
+        df: pd.DataFrame,
+        on: Key,
+        rows: RowIndex,
+        fingerprints: Optional[np.ndarray],
+    ) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """Returns the added records and their fingerprints, and the removed ones."""
+        if fingerprints is None:
+            fingerprints = row_fingerprints(df)
+        occurrence = pd.Series(fingerprints).groupby(fingerprints).cumcount().to_numpy()
+        is_added = occurrence >= rows.count_of(fingerprints)
+
+        current = RowIndex.build(fingerprints, hash_keys(df, ensure_list(on)))
+        removed = np.repeat(
+            rows.fingerprints,
+            np.maximum(rows.counts - current.count_of(rows.fingerprints), 0),
+        )
+
+        return df.loc[is_added], fingerprints[is_added], removed
+
+    @staticmethod
+    def _fingerprints(
+        df: Optional[pd.DataFrame], on: Key, position: Literal["left", "right"]
+    ) -> np.ndarray:
+        if df is None:
+            return np.empty(0, dtype=np.uint64)
+        check_keys(df.columns, on, position)
+        return row_fingerprints(df)
+
+    def _apply(
+        self,
+        left: Optional[pd.DataFrame],
+        right: Optional[pd.DataFrame],
+        left_removed: np.ndarray,
+        right_removed: np.ndarray,
+        removed_frames: list[Optional[pd.DataFrame]],
+        fingerprints: tuple[Optional[np.ndarray], Optional[np.ndarray]] = (None, None),
+    ) -> tuple[Snapshot, ReconciledDelta]:
+        for df, on, position in (
+            (left, self.left_on, "left"),
+            (right, self.right_on, "right"),
+        ):
+            if df is not None:
+                check_keys(df.columns, on, position)
+
+        left_added_keys, left_added = _hashes(left, self.left_on, fingerprints[0])
+        right_added_keys, right_added = _hashes(right, self.right_on, fingerprints[1])
+
+        left_rows, left_removed_keys = _remove(self.left_rows, left_removed, "left")
+        right_rows, right_removed_keys = _remove(
+            self.right_rows, right_removed, "right"
+        )
+        left_duplicated = _is_duplicate(left_rows, left_added)
+        right_duplicated = _is_duplicate(right_rows, right_added)
+        left_rows = _add(left_rows, left_added, left_added_keys)
+        right_rows = _add(right_rows, right_added, right_added_keys)
+
+        touched = np.unique(
+            np.concatenate(
+                [
+                    left_added_keys,
+                    right_added_keys,
+                    left_removed_keys,
+                    right_removed_keys,
+                ]
+            )
+        )
+        keys, (left_counts, right_counts) = _insert(
+            self.keys, touched, [self.left_counts, self.right_counts]
+        )
+        positions = np.searchsorted(keys, touched)
+        left_before, right_before = left_counts[positions], right_counts[positions]
+
+        np.add.at(left_counts, np.searchsorted(keys, left_added_keys), 1)
+        np.subtract.at(left_counts, np.searchsorted(keys, left_removed_keys), 1)
+        np.add.at(right_counts, np.searchsorted(keys, right_added_keys), 1)
+        np.subtract.at(right_counts, np.searchsorted(keys, right_removed_keys), 1)
+        left_after, right_after = left_counts[positions], right_counts[positions]
+
+        snapshot = Snapshot(
+            left_on=self.left_on,
+            right_on=self.right_on,
+            keys=keys,
+            left_counts=left_counts,
+            right_counts=right_counts,
+            left_rows=left_rows,
+            right_rows=right_rows,
+            left_stats=_update_stats(
+                self.left_stats,
+                (left_before, right_before),
+                (left_after, right_after),
+                left_rows,
+            ),
+            right_stats=_update_stats(
+                self.right_stats,
+                (right_before, left_before),
+                (right_after, left_after),
+                right_rows,
+            ),
+            left_multi_keys=self.left_multi_keys
+            + int((left_after > 1).sum() - (left_before > 1).sum()),
+            right_multi_keys=self.right_multi_keys
+            + int((right_after > 1).sum() - (right_before > 1).sum()),
+        )
+        snapshot._drop_empty_keys()
+
+        key_values = [
+            frame[ensure_list(on)].set_axis(ensure_list(self.left_on), axis=1)
+            for frame, on in (
+                (left, self.left_on),
+                (right, self.right_on),
+                *zip(removed_frames, (self.left_on, self.right_on)),
+            )
+            if frame is not None
+        ]
+        keys_frame = (
+            pd.concat(key_values, ignore_index=True).set_index(
+                np.concatenate(
+                    [
+                        hash_keys(frame, ensure_list(self.left_on))
+                        for frame in key_values
+                    ]
+                )
+            )
+            if key_values
+            else pd.DataFrame(columns=ensure_list(self.left_on))
+        )
+        keys_frame = keys_frame[~keys_frame.index.duplicated()].reindex(touched)
+        keys_frame.index.name = "key_hash"
+        keys_frame = keys_frame.assign(
+            left_rows_before=left_before,
+            right_rows_before=right_before,
+            left_rows=left_after,
+            right_rows=right_after,
+            status_before=_status(left_before, right_before),
+            status=_status(left_after, right_after),
+        )
+
+        left_matched = right_counts[np.searchsorted(keys, left_added_keys)] > 0
+        right_matched = left_counts[np.searchsorted(keys, right_added_keys)] > 0
+        left, right = _or_empty(left), _or_empty(right)
+        delta = ReconciledDelta(
+            keys=keys_frame,
+            left_only=left.loc[~left_matched],
+            right_only=right.loc[~right_matched],
+            left_both=left.loc[left_matched],
+            right_both=right.loc[right_matched],
+            left_duplicate=left.loc[left_duplicated],
+            right_duplicate=right.loc[right_duplicated],
+        )
+
+        return snapshot, delta
+
+    def _drop_empty_keys(self) -> None:
+        keep = (self.left_counts > 0) | (self.right_counts > 0)
+        if not keep.all():
+            self.keys = self.keys[keep]
+            self.left_counts = self.left_counts[keep]
+            self.right_counts = self.right_counts[keep]
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "keys": self.keys,
+            "left_counts": self.left_counts,
+            "right_counts": self.right_counts,
+            "left_fingerprints": self.left_rows.fingerprints,
+            "left_fingerprint_counts": self.left_rows.counts,
+            "left_fingerprint_keys": self.left_rows.keys,
+            "right_fingerprints": self.right_rows.fingerprints,
+            "right_fingerprint_counts": self.right_rows.counts,
+            "right_fingerprint_keys": self.right_rows.keys,
+        }
+
+    def save(self, path: FilePath) -> None:
+        """
+        Saves the snapshot to the directory `path`. Files are replaced atomically,
+        so a snapshot can be saved over the one it was loaded from.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "left_on": self.left_on,
+            "right_on": self.right_on,
+            "left_stats": asdict(self.left_stats),
+            "right_stats": asdict(self.right_stats),
+            "left_multi_keys": self.left_multi_keys,
+            "right_multi_keys": self.right_multi_keys,
+        }
+        for name, array in self._arrays().items():
+            replace_file(directory / f"{name}.npy", lambda f: np.save(f, array))
+        replace_file(
+            directory / "meta.json", lambda f: f.write(json.dumps(meta).encode())
+        )
+
+    @staticmethod
+    def load(path: FilePath, mmap: bool = True) -> Snapshot:
+        directory = Path(path)
+        meta = json.loads((directory / "meta.json").read_text())
+        if meta["version"] != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Snapshot version {meta['version']} isn't supported. "
+                "Reconcile the full datasets to take a new snapshot."
+            )
+
+        def array(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+
+        return Snapshot(
+            left_on=meta["left_on"],
+            right_on=meta["right_on"],
+            keys=array("keys"),
+            left_counts=array("left_counts"),
+            right_counts=array("right_counts"),
+            left_rows=RowIndex(
+                array("left_fingerprints"),
+                array("left_fingerprint_counts"),
+                array("left_fingerprint_keys"),
+            ),
+            right_rows=RowIndex(
+                array("right_fingerprints"),
+                array("right_fingerprint_counts"),
+                array("right_fingerprint_keys"),
+            ),
+            left_stats=ReconciledStats(**meta["left_stats"]),
+            right_stats=ReconciledStats(**meta["right_stats"]),
+            left_multi_keys=meta["left_multi_keys"],
+            right_multi_keys=meta["right_multi_keys"],
+        )
+
+
+def _empty_hashes() -> tuple[np.ndarray, np.ndarray]:
+    return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64)
+
+
+def _or_empty(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    return pd.DataFrame() if df is None else df
+
+
+def _hashes(
+    df: Optional[pd.DataFrame], on: Key, fingerprints: Optional[np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the key hashes and row fingerprints of `df`."""
+    if df is None:
+        return _empty_hashes()
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df)
+    return hash_keys(df, ensure_list(on)), fingerprints
+
+
+def _find(
+    sorted_values: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns whether each of `values` is within `sorted_values`, and where."""
+    positions = np.searchsorted(sorted_values, values)
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool), positions
+
+    found = sorted_values[np.minimum(positions, len(sorted_values) - 1)] == values
+    return found & (positions < len(sorted_values)), positions
+
+
+def _insert(
+    sorted_values: np.ndarray, values: np.ndarray, counts: list[np.ndarray]
+) -> tuple[np.ndarray, list[np.ndarray]]:
+    """
+    Inserts the missing `values` into `sorted_values`, with counts of 0. Returns
+    writable copies of the counts.
+    """
+    values = np.unique(values)
+    found, _ = _find(sorted_values, values)
+    missing = values[~found]
+    positions = np.searchsorted(sorted_values, missing)
+
+    return (
+        np.insert(sorted_values, positions, missing),
+        [np.insert(count, positions, 0) for count in counts],
+    )
+
+
+def _remove(
+    rows: RowIndex, fingerprints: np.ndarray, position: Literal["left", "right"]
+) -> tuple[RowIndex, np.ndarray]:
+    """Returns the rows without `fingerprints`, and the key hash of every removal."""
+    if len(fingerprints) == 0:
+        return rows, np.empty(0, dtype=np.uint64)
+
+    unique, removals = np.unique(fingerprints, return_counts=True)
+    found, positions = _find(rows.fingerprints, unique)
+    if not found.all() or (rows.counts[positions] < removals).any():
+        raise ValueError(
+            f"Some of the removed {position} records aren't within the snapshot."
+        )
+
+    counts = np.array(rows.counts)
+    counts[positions] -= removals
+    keep = counts > 0
+
+    return (
+        RowIndex(rows.fingerprints[keep], counts[keep], rows.keys[keep]),
+        np.repeat(rows.keys[positions], removals),
+    )
+
+
+def _is_duplicate(rows: RowIndex, fingerprints: np.ndarray) -> np.ndarray:
+    """Returns whether each added record repeats an existing or earlier record."""
+    return (rows.count_of(fingerprints) > 0) | pd.Series(
+        fingerprints
+    ).duplicated().to_numpy()
+
+
+def _add(rows: RowIndex, fingerprints: np.ndarray, keys: np.ndarray) -> RowIndex:
+    if len(fingerprints) == 0:
+        return rows
+
+    added = RowIndex.build(fingerprints, keys)
+    values, (counts, fingerprint_keys) = _insert(
+        rows.fingerprints, added.fingerprints, [rows.counts, rows.keys]
+    )
+    positions = np.searchsorted(values, added.fingerprints)
+    counts[positions] += added.counts
+    fingerprint_keys[positions] = added.keys
+
+    return RowIndex(values, counts, fingerprint_keys)
+
+
+def _update_stats(
+    stats: ReconciledStats,
+    before: tuple[np.ndarray, np.ndarray],
+    after: tuple[np.ndarray, np.ndarray],
+    rows: RowIndex,
+) -> ReconciledStats:
+    """
+    Updates `stats` with the change in record counts of the touched keys, given as
+    (this side, other side) before and after.
+    """
+    total = stats.rows + int(after[0].sum() - before[0].sum())
+    both = stats.both_rows + int(
+        after[0][after[1] > 0].sum() - before[0][before[1] > 0].sum()
+    )
+
+    return ReconciledStats(
+        rows=total,
+        both_rows=both,
+        unique_rows=total - both,
+        duplicated_rows=total - len(rows.fingerprints),
+    )
+
+
+def _status(left_counts: np.ndarray, right_counts: np.ndarray) -> np.ndarray:
+    return np.select(
+        [(left_counts > 0) & (right_counts > 0), left_counts > 0, right_counts > 0],
+        ["both", "left_only", "right_only"],
+        "none",
+    )
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+SQLITE_SCHEME = "sqlite"
+
+DEFAULT_SQL_CHUNKSIZE = 50_000
+"""Rows fetched from the cursor at a time."""
+
+QUERY_KEYWORDS = ("SELECT", "WITH", "VALUES")
+"""Leading keywords telling a query apart from a table name."""
+
+INDEX_COLUMN = "__recon_index"
+"""Row number of every record within its source, used as the DataFrame index."""
+
+MATCH_COMPONENTS: dict[str, tuple[set[bool], set[bool]]] = {
+    "left_only": ({False}, set()),
+    "right_only": (set(), {False}),
+    "left_both": ({True}, {True}),
+    "right_both": ({True}, {True}),
+    "both": ({True}, {True}),
+    "left": ({True, False}, set()),
+    "right": (set(), {True, False}),
+    "left_duplicate": ({True, False}, set()),
+    "right_duplicate": (set(), {True, False}),
+    "all_data": ({True, False}, {True, False}),
+    "fuzzy": ({False}, {False}),
+}
+"""
+Left and right records every component needs: those with a matching key on the
+other side (True) and those without (False).
+"""
+
+UNMATCHED_COMPONENTS = {"left", "right", "left_duplicate", "right_duplicate"}
+"""Components which don't depend on which records match."""
+
+
+def parse_url(url: str) -> tuple[str, Optional[str]]:
+    """
+    Splits a `sqlite:///path/to.db?table=name` URL into the database path and its
+    source: the `table` or `query` parameter, if any. As with SQLAlchemy, three
+    slashes precede a relative path and four an absolute one.
+    """
+    parts = urlsplit(url)
+    if parts.scheme.lower() != SQLITE_SCHEME or parts.netloc:
+        raise ValueError(
+            f"Unsupported database URL ({url}). Use sqlite:///path/to/file.db."
+        )
+
+    params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    if len(params) > 1 or set(params) - {"table", "query"}:
+        raise ValueError(
+            f"{url} must name either a table or a query, e.g. "
+            "sqlite:///ledger.db?table=gl."
+        )
+
+    return unquote(parts.path[1:]), params.get("table") or params.get("query")
+
+
+def connect(url: str) -> sqlite3.Connection:
+    """Opens the SQLite database of `url` read only."""
+    path = Path(parse_url(url)[0])
+    if not path.is_file():
+        raise FileNotFoundError(f"No such database: '{path}'")
+    return sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def quote(name: str) -> str:
+    """Quotes an identifier, e.g. a column name."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _subquery(source: str) -> str:
+    """Returns a table name, or a query, as SQL to select from."""
+    words = source.split(None, 1)
+    if words and words[0].upper() in QUERY_KEYWORDS:
+        return f"({source})"
+    return quote(source)
+
+
+def _fetch(con: Any, sql: str, chunksize: int = DEFAULT_SQL_CHUNKSIZE) -> pd.DataFrame:
+    """Runs `sql`, fetching its rows `chunksize` at a time."""
+    cursor = con.cursor()
+    try:
+        cursor.execute(sql)
+        names = [description[0] for description in cursor.description]
+
+        chunks = []
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+            chunks.append(pd.DataFrame.from_records(rows, columns=names))
+    finally:
+        cursor.close()
+
+    if not chunks:
+        return pd.DataFrame(columns=names)
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+
+def source_columns(con: Any, source: str) -> list[str]:
+    """Returns the column names of a table or query, without fetching any rows."""
+    return list(_fetch(con, f"SELECT * FROM {_subquery(source)} AS s LIMIT 0").columns)
+
+
+def _equal(con: Any) -> str:
+    """Null-safe equality, so missing keys match as they do for pandas."""
+    return "IS" if isinstance(con, sqlite3.Connection) else "IS NOT DISTINCT FROM"
+
+
+def select(
+    con: Any,
+    source: str,
+    columns: Optional[list[str]] = None,
+    matched: Optional[set[bool]] = None,
+    on: Optional[list[str]] = None,
+    other: Optional[str] = None,
+    other_on: Optional[list[str]] = None,
+    chunksize: int = DEFAULT_SQL_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    Fetches the records of `source`, indexed by their row number within it.
+
+    Only the `columns` which exist are selected, or all of them if None. Unless
+    :param:`matched` holds both True and False, the records are filtered within
+    the database on whether a record of `other` shares their key.
+    """
+    available = source_columns(con, source)
+    if columns is not None:
+        available = [col for col in available if col in set(columns)]
+    selected = ", ".join(f"s.{quote(col)}" for col in available)
+
+    sql = (
+        f"SELECT * FROM (SELECT ROW_NUMBER() OVER () - 1 AS {quote(INDEX_COLUMN)}"
+        f"{', ' if selected else ''}{selected} FROM {_subquery(source)} AS s) AS l"
+    )
+    if matched is not None and matched != {True, False}:
+        if not matched:
+            sql += " WHERE 0 = 1"
+        else:
+            condition = " AND ".join(
+                f"l.{quote(left)} {_equal(con)} r.{quote(right)}"
+                for left, right in zip(on or [], other_on or [])
+            )
+            exists = (
+                f"EXISTS (SELECT 1 FROM {_subquery(other or '')} AS r "
+                f"WHERE {condition})"
+            )
+            sql += f" WHERE {exists}" if True in matched else f" WHERE NOT {exists}"
+    sql += f" ORDER BY {quote(INDEX_COLUMN)}"
+
+    df = _fetch(con, sql, chunksize)
+    return df.set_index(INDEX_COLUMN).rename_axis(index=None)
+
+
+def needed_records(components: list[str]) -> tuple[set[bool], set[bool]]:
+    """
+    Returns the left and right records needed by `components`, see
+    `MATCH_COMPONENTS`. When any component depends on which records match, the
+    matched records of either side are fetched alongside those of the other, so
+    that they still match each other once fetched.
+    """
+    left: set[bool] = set()
+    right: set[bool] = set()
+    for component in components:
+        needed = MATCH_COMPONENTS.get(component, (set(), set()))
+        left |= needed[0]
+        right |= needed[1]
+
+    if True in left | right and set(components) - UNMATCHED_COMPONENTS:
+        left.add(True)
+        right.add(True)
+    return left, right
+
+
+def read_url(
+    data: str,
+    sheet_name: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    chunksize: int = DEFAULT_SQL_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    Reads the table or query of a `sqlite:///path/to.db?table=name` URL with a
+    chunked cursor. Only `columns` are fetched when specified.
+    """
+    _, source = parse_url(data)
+    if source is None:
+        raise ValueError(
+            f"{data} must name either a table or a query, e.g. "
+            "sqlite:///ledger.db?table=gl."
+        )
+
+    con = connect(data)
+    try:
+        return select(con, source, columns, chunksize=chunksize)
+    finally:
+        con.close()
@@ -1,7 +1,13 @@
-from typing import Literal, Union
+import os
+import tempfile
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Iterable, Literal, Union
 
 import pandas as pd
 
+FilePath = Union[str, "PathLike[str]"]
+
 
 def ensure_df(
     data: Union[pd.Series, pd.DataFrame],
@@ -12,3 +18,59 @@ def ensure_df(
     if isinstance(data, pd.DataFrame):
         return data
     raise ValueError("Object is not a pandas Series or DataFrame.")
+
+
+def ensure_list(on: Union[str, list[str]]) -> list[str]:
+    if isinstance(on, str):
+        return [on]
+    return list(on)
+
+
+def format_on(on: Union[str, list[str]]) -> str:
+    return " + ".join(ensure_list(on))
+
+
+def check_keys(columns: Iterable[Any], on: Union[str, list[str]], side: str) -> None:
+    """Raises a ValueError naming the key columns missing from `columns`."""
+    available = set(columns)
+    missing = [col for col in ensure_list(on) if col not in available]
+    if missing:
+        raise ValueError(
+            f"{side}_on ({format_on(missing)}) doesn't exist within the {side} "
+            "dataset."
+        )
+
+
+def replace_file(path: Path, write: Callable[[Any], Any]) -> None:
+    """
+    Calls `write` with a temporary binary file next to `path`, then atomically
+    replaces `path` with it, so readers never see a partly written file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+
+
+def arrow_compatible(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts object columns holding values of mixed types, which Arrow can't
+    represent, to strings.
+    """
+    mixed = [
+        col
+        for col in frame.columns
+        if frame[col].dtype == object
+        and pd.api.types.infer_dtype(frame[col], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return frame
+
+    frame = frame.copy()
+    for col in mixed:
+        frame[col] = frame[col].astype("string")
+
+    return frame
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from recon.profiling import RowsCallback
+from recon.utils import FilePath, arrow_compatible
+
+Components = Iterable[tuple[str, pd.DataFrame]]
+"""Pairs of component name and DataFrame, written in order."""
+
+DEFAULT_CHUNKSIZE = 50_000
+
+XLSX_MAX_ROWS = 1_048_576
+
+
+def _chunks(frame: pd.DataFrame, chunksize: int) -> Iterable[pd.DataFrame]:
+    for start in range(0, len(frame), chunksize):
+        yield frame.iloc[start : start + chunksize]
+
+
+def write_xlsx(
+    path: FilePath,
+    components: Components,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    on_rows: Optional[RowsCallback] = None,
+) -> None:
+    """
+    Writes every component to its own worksheet in xlsxwriter's constant memory
+    mode. Rows are flushed to disk as they are written, so memory use doesn't grow
+    with the number of rows. :param:`on_rows` is called after every chunk.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(
+        str(path),
+        {
+            "constant_memory": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            "remove_timezone": True,
+        },
+    )
+    try:
+        header_format = workbook.add_format({"bold": True})
+
+        for name, frame in components:
+            if len(frame) >= XLSX_MAX_ROWS:
+                raise ValueError(
+                    f"{name} has {len(frame):,d} rows which exceeds the xlsx limit "
+                    f"of {XLSX_MAX_ROWS - 1:,d}."
+                )
+
+            worksheet = workbook.add_worksheet(name)
+            worksheet.write_row(
+                0, 0, ["index", *map(str, frame.columns)], header_format
+            )
+
+            row = 1
+            for chunk in _chunks(frame.reset_index(), chunksize):
+                # xlsxwriter writes None as an empty cell
+                values = chunk.astype(object).where(chunk.notna(), None)
+                for record in values.itertuples(index=False, name=None):
+                    worksheet.write_row(row, 0, record)
+                    row += 1
+                if on_rows is not None:
+                    on_rows(name, row - 1, len(frame))
+    finally:
+        workbook.close()
+
+
+def write_csv_dir(
+    path: FilePath,
+    components: Components,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    on_rows: Optional[RowsCallback] = None,
+) -> None:
+    """
+    Writes every component to `<path>/<component>.csv`. :param:`on_rows` is called
+    after every chunk.
+    """
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for name, frame in components:
+        with open(directory / f"{name}.csv", "w", newline="") as file:
+            frame.iloc[:0].to_csv(file, index_label="index")
+            written = 0
+            for chunk in _chunks(frame, chunksize):
+                chunk.to_csv(file, header=False)
+                written += len(chunk)
+                if on_rows is not None:
+                    on_rows(name, written, len(frame))
+
+
+def _index_name(columns: pd.Index) -> str:
+    """
+    Returns "index", prefixed with underscores while a column already has that
+    name, e.g. "index" within all_data when the left suffix is empty.
+    """
+    name = "index"
+    while name in columns:
+        name = f"_{name}"
+    return name
+
+
+def write_parquet(
+    path: FilePath,
+    components: Components,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    on_rows: Optional[RowsCallback] = None,
+) -> None:
+    """
+    Writes every component to `<path>/<component>.parquet`, one row group per
+    chunk of rows. :param:`on_rows` is called after every chunk.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for name, frame in components:
+        frame = arrow_compatible(
+            frame.rename_axis(_index_name(frame.columns)).reset_index()
+        )
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+
+        with pq.ParquetWriter(directory / f"{name}.parquet", schema) as writer:
+            written = 0
+            for chunk in _chunks(frame, chunksize):
+                writer.write_table(
+                    pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                )
+                written += len(chunk)
+                if on_rows is not None:
+                    on_rows(name, written, len(frame))
+
+
+WRITERS = {
+    ".xlsx": write_xlsx,
+    ".parquet": write_parquet,
+    ".csv": write_csv_dir,
+    "": write_csv_dir,
+}
+"""Writer by output file extension. Parquet and csv outputs are directories."""
+
+
+def writer_for(path: FilePath):
+    extension = Path(path).suffix.lower()
+    try:
+        return WRITERS[extension]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported output format ({extension}). "
+            f"Use one of: {', '.join(ext or 'a directory' for ext in WRITERS)}."
+        ) from None
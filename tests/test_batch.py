@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon.batch import _shared_inputs, load_manifest, summary
+
+
+@pytest.fixture()
+def manifest(tmp_path: Path) -> Path:
+    pd.DataFrame({"acct": [1, 2, 3, 4], "amount": [1, 2, 3, 4]}).to_csv(
+        tmp_path / "gl.csv", index=False
+    )
+    for entity in ("a", "b"):
+        pd.DataFrame({"acct": [2, 3, 5], "amount": [2, 3, 5]}).to_csv(
+            tmp_path / f"bank_{entity}.csv", index=False
+        )
+
+    path = tmp_path / "manifest.json"
+    path.write_text(
+        json.dumps(
+            {
+                "processes": 2,
+                "defaults": {
+                    "left": "gl.csv",
+                    "left_on": "acct",
+                    "right_on": "acct",
+                    "output_file": "results/{name}",
+                },
+                "jobs": [
+                    {"name": "a", "right": "bank_a.csv"},
+                    {"name": "b", "right": "bank_b.csv", "columns": ["amount"]},
+                    {"name": "c", "right": "missing.csv"},
+                ],
+            }
+        )
+    )
+    return path
+
+
+def test_load_manifest(manifest: Path):
+    jobs, settings = load_manifest(manifest)
+
+    assert settings == {"processes": 2}
+    assert [job.name for job in jobs] == ["a", "b", "c"]
+    assert jobs[0].left == str(manifest.parent / "gl.csv")
+    assert jobs[1].options == {"columns": ["amount"]}
+    assert jobs[1].output_path == str(manifest.parent / "results" / "b")
+    # Only jobs a and c read the same columns of the GL
+    assert _shared_inputs(jobs) == [(True, False), (False, False), (True, False)]
+
+    with pytest.raises(ValueError, match="Unknown options"):
+        rc.BatchJob("x", "l.csv", "r.csv", "k", "k", options={"workers": 2})
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run_many(manifest: Path, processes: int):
+    jobs, _ = load_manifest(manifest)
+    results = rc.Reconcile.run_many(jobs, processes=processes, memory_budget_mb=1)
+
+    expected = rc.Reconcile.read_files(jobs[0].left, jobs[0].right, "acct", "acct")
+    assert [result.name for result in results] == ["a", "b", "c"]
+    assert results[0].left_stats == expected.left_stats
+    assert results[1].relationship == "ONE_TO_ONE"
+    assert results[2].error.startswith("FileNotFoundError")
+    assert (manifest.parent / "results" / "a" / "left_only.csv").exists()
+
+    frame = summary(results)
+    assert list(frame["status"]) == ["ok", "ok", "failed"]
+    assert list(frame["right_unique_rows"].fillna(-1)) == [1, 1, -1]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from recon.cache import InputCache
+
+
+def test_input_cache(tmp_path: Path):
+    data = tmp_path / "data.csv"
+    pd.DataFrame({"key": [1, 2], "value": ["a", "b"]}).to_csv(data, index=False)
+    cache = InputCache(tmp_path / "cache")
+    calls = []
+
+    def reader(data, **kwargs):
+        calls.append(kwargs)
+        return pd.read_csv(data)
+
+    first = cache.read(reader, data, sheet_name="Sheet1")
+    second = cache.read(reader, data, sheet_name="Sheet1")
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 1
+
+    # Different reader arguments and modified files are misses
+    cache.read(reader, data, sheet_name="Other")
+    assert len(calls) == 2
+    pd.DataFrame({"key": [1, 2, 3]}).to_csv(data, index=False)
+    cache.read(reader, data, sheet_name="Sheet1")
+    assert len(calls) == 3
+
+    # Callables can't be part of a key
+    cache.read(reader, data, usecols=lambda col: True)
+    cache.read(reader, data, usecols=lambda col: True)
+    assert len(calls) == 5
+
+
+def test_input_cache_eviction(tmp_path: Path):
+    cache = InputCache(tmp_path / "cache", max_bytes=0)
+    cache.store("a", pd.DataFrame({"mixed": [1, "a"]}))
+
+    assert list(cache.path.iterdir()) == []
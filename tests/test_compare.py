@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon.compare import mismatches
+
+
+def test_mismatches():
+    left = pd.Series([1.0, 2.0, None, None, 5.0])
+    right = pd.Series([1.0, 2.05, None, 4.0, 6.0], index=[9, 8, 7, 6, 5])
+
+    assert list(mismatches(left, right)) == [False, True, False, True, True]
+    assert list(mismatches(left, right, 0.1)) == [False, False, False, True, True]
+
+    dates = pd.Series(pd.to_datetime(["2023-01-01", "2023-01-02"]))
+    later = dates + pd.Timedelta(hours=12)
+    assert list(mismatches(dates, later)) == [True, True]
+    assert list(mismatches(dates, later, "1D")) == [False, False]
+
+    assert list(mismatches(pd.Series(["a", 1]), pd.Series(["a", "1"]))) == [False, True]
+    assert list(
+        mismatches(
+            pd.Series([1, 2]).convert_dtypes(), pd.Series(["1", "x"]).convert_dtypes()
+        )
+    ) == [False, True]
+
+
+def test_differences():
+    left = pd.DataFrame(
+        {"id": [1, 2, 2, 3], "amount": [10.0, 20.0, 21.0, 30.0], "memo": "x"}
+    )
+    right = pd.DataFrame({"id": [2, 3, 4], "amount": [20.0, 30.001, 40.0], "memo": "x"})
+    recon = rc.Reconcile.read_df(left, right, left_on="id", right_on="id")
+
+    differences = recon.differences()
+    assert differences.counts.to_dict() == {"amount": 2, "memo": 0}
+    assert list(differences.data.columns) == [
+        "index_left",
+        "id",
+        "index_right",
+        "amount_left",
+        "amount_right",
+    ]
+    pd.testing.assert_index_equal(
+        differences.data.index, recon.both.index[[1, 2]], check_exact=False
+    )
+
+    differences = recon.differences(["amount"], tolerance={"amount": 0.01})
+    assert list(differences.data["index_left"]) == [2]
+
+    with pytest.raises(ValueError, match=r"Columns \(nope\) don't exist"):
+        recon.differences(["nope"])
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recon import engine, polars_engine
+from recon.engine import (
+    classify,
+    classify_parallel,
+    encode_keys,
+    factorize_keys,
+    row_fingerprints,
+)
+
+
+def test_classify_matches_merge():
+    left = pd.Series([3, 1, 5, 3, 1, np.nan, 2])
+    right = pd.Series([1, 9, 1, 2, np.nan, 9, 4])
+
+    left_codes, right_codes, n_keys = factorize_keys(left, right)
+    classification = classify(left_codes, right_codes, n_keys)
+
+    merged = pd.merge(
+        left.rename("key").rename_axis("left_position").reset_index(),
+        right.rename("key").rename_axis("right_position").reset_index(),
+        on="key",
+        how="outer",
+        indicator=True,
+    )
+    both = merged.loc[merged["_merge"] == "both"]
+    left_only = merged.loc[merged["_merge"] == "left_only"]
+    right_only = merged.loc[merged["_merge"] == "right_only"]
+
+    assert classification.size == len(merged)
+    np.testing.assert_array_equal(classification.both_index, both.index)
+    np.testing.assert_array_equal(classification.both_left, both["left_position"])
+    np.testing.assert_array_equal(classification.both_right, both["right_position"])
+    np.testing.assert_array_equal(classification.left_only_index, left_only.index)
+    np.testing.assert_array_equal(classification.left_only, left_only["left_position"])
+    np.testing.assert_array_equal(classification.right_only_index, right_only.index)
+    np.testing.assert_array_equal(
+        classification.right_only, right_only["right_position"]
+    )
+    np.testing.assert_array_equal(classification.left_both, [1, 4, 5, 6])
+    np.testing.assert_array_equal(classification.right_both, [0, 2, 4, 3])
+
+
+@pytest.mark.parametrize("dtype", ["string", "string[pyarrow]"])
+def test_factorize_keys_strings(dtype: str):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+
+    left = pd.Series(["b", "a", None, "c", "a"], dtype=dtype)
+    right = pd.Series(["c", "d", None, "a"], dtype="string")
+
+    left_codes, right_codes, n_keys = factorize_keys(left, right)
+    expected, uniques = pd.factorize(
+        pd.concat([left.astype(object), right.astype(object)], ignore_index=True),
+        use_na_sentinel=False,
+    )
+
+    assert left_codes.dtype == right_codes.dtype == np.int32
+    assert n_keys == len(uniques)
+    np.testing.assert_array_equal(np.concatenate([left_codes, right_codes]), expected)
+
+
+def test_classify_parallel(monkeypatch: pytest.MonkeyPatch):
+    # Use the pool whatever the CPUs of the machine running the tests
+    monkeypatch.setattr(engine, "available_cpus", lambda: 3)
+    rng = np.random.default_rng(0)
+    left = pd.Series(rng.integers(0, 50, 200))
+    right = pd.Series(rng.integers(25, 75, 150))
+
+    left_codes, right_codes, n_keys = factorize_keys(left, right)
+    expected = classify(left_codes, right_codes, n_keys)
+    result = classify_parallel(left_codes, right_codes, n_keys, workers=3)
+
+    for field in expected.__dataclass_fields__:
+        np.testing.assert_array_equal(getattr(result, field), getattr(expected, field))
+
+    empty = np.empty(0, dtype=np.int32)
+    assert classify_parallel(empty, empty, 0, workers=3).size == 0
+
+
+def test_polars_engine():
+    pytest.importorskip("polars")
+    rng = np.random.default_rng(0)
+    left = pd.DataFrame(
+        {
+            "id": pd.array(rng.integers(0, 30, 200), dtype="Int64"),
+            "kind": pd.array(rng.choice(["a", "b", None], 200), dtype="string"),
+        }
+    )
+    right = pd.DataFrame(
+        {"id": pd.Series([1, "x", None] * 50), "kind": ["a", "b", None] * 50}
+    )
+
+    expected_codes = encode_keys(left, right)
+    codes = polars_engine.encode_keys(left, right)
+    assert codes[2] == expected_codes[2]
+    for result, expected in zip(codes[:2], expected_codes[:2]):
+        np.testing.assert_array_equal(result, expected)
+
+    expected = classify(*expected_codes)
+    result = polars_engine.classify(*codes)
+    for field in expected.__dataclass_fields__:
+        np.testing.assert_array_equal(getattr(result, field), getattr(expected, field))
+
+
+def test_row_fingerprints():
+    df = pd.DataFrame(
+        {"id": [1, 2, 2, None], "name": ["a", "b", "b", None], "x": [0.5, 2, 2, 3]}
+    )
+    fingerprints = row_fingerprints(df)
+
+    assert list(pd.Series(fingerprints).duplicated()) == list(df.duplicated())
+    # Numbers within object columns hash as numbers, apart from their strings
+    mixed = row_fingerprints(pd.DataFrame({"id": [1, "1", 2.5, "2.5", None]}))
+    np.testing.assert_array_equal(
+        mixed[[0, 2, 4]], row_fingerprints(pd.DataFrame({"id": [1, 2.5, None]}))
+    )
+    assert len(set(mixed)) == 5
+    np.testing.assert_array_equal(row_fingerprints(df.convert_dtypes()), fingerprints)
+    # A column's dtype doesn't change the fingerprint of its values
+    np.testing.assert_array_equal(
+        row_fingerprints(df.iloc[1:3].convert_dtypes()), fingerprints[1:3]
+    )
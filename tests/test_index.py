@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon.index import KeyIndex
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture()
+def master() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ref": ["a", "b", "c", "b", "d", "e"],
+            "amount": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    )
+
+
+def test_key_index(tmp_path: Path, master: pd.DataFrame):
+    built = KeyIndex.build(master, "ref", tmp_path / "index")
+    index = KeyIndex.load(tmp_path / "index")
+    assert isinstance(index.key_hashes, np.memmap)
+    np.testing.assert_array_equal(index.key_hashes, built.key_hashes)
+
+    daily = pd.DataFrame({"ref": ["b", "z", "e"]})
+    np.testing.assert_array_equal(index.lookup(daily, "ref"), [1, 3, 5])
+
+    matching = index.matching(daily, "ref", columns=["amount"])
+    assert list(matching.index) == [1, 3, 5]
+    assert list(matching["amount"]) == [2.0, 4.0, 6.0]
+
+    with pytest.raises(ValueError, match="right_on"):
+        index.lookup(daily, "missing")
+
+
+def test_read_index(tmp_path: Path, master: pd.DataFrame):
+    master.to_csv(tmp_path / "master.csv", index=False)
+    daily = pd.DataFrame({"ref": ["b", "z", "e"], "amount": [2.0, 0.0, 6.0]})
+    daily.to_csv(tmp_path / "daily.csv", index=False)
+
+    rc.Reconcile.build_index(tmp_path / "master.csv", "ref", tmp_path / "index")
+    recon = rc.Reconcile.read_index(tmp_path / "index", tmp_path / "daily.csv", "ref")
+    full = rc.Reconcile.read_files(
+        tmp_path / "master.csv", tmp_path / "daily.csv", "ref", "ref"
+    )
+
+    # Records are matched alike, though all_data positions differ
+    pd.testing.assert_frame_equal(
+        recon.both.reset_index(drop=True), full.both.reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(recon.right_only, full.right_only)
+    assert list(recon.left_both.index) == [1, 3, 5]
+    assert recon.left_only.empty
+
+
+def test_read_index_blank_key(tmp_path: Path):
+    pd.DataFrame({"id": [1, 2, 3, 4]}).to_csv(tmp_path / "master.csv", index=False)
+    # The blank key reads the daily keys as floats
+    (tmp_path / "daily.csv").write_text("id,amount\n2,1\n,2\n4,3\n")
+
+    rc.Reconcile.build_index(tmp_path / "master.csv", "id", tmp_path / "index")
+    recon = rc.Reconcile.read_index(tmp_path / "index", tmp_path / "daily.csv", "id")
+
+    assert list(recon.right_both.index) == [0, 2]
+    assert list(recon.right_only.index) == [1]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon.keys import fuzzy_pairs, normalize_keys
+
+
+def test_normalize_keys():
+    keys = pd.DataFrame({"ref": [" INV  001", "inv 001", None], "line": [1, 2, 3]})
+
+    normalized = normalize_keys(keys, ["strip", "lower", "whitespace"])
+    assert list(normalized["ref"].fillna("NA")) == ["inv 001", "inv 001", "NA"]
+    assert list(normalize_keys(keys, ["leading_zeros"])["line"]) == ["1", "2", "3"]
+    assert normalize_keys(keys, []) is keys
+
+    with pytest.raises(ValueError, match=r"Unknown key normalizer \(upper\)"):
+        normalize_keys(keys, ["upper"])
+
+
+def test_fuzzy_pairs():
+    left = pd.Series(["invoice 1001", "invoice 2002", "acme"])
+    right = pd.Series(["invoice 1010", "invoice 2002x", "zebra"])
+
+    pairs = fuzzy_pairs(left, right, threshold=0.6)
+    assert list(zip(pairs["left"], pairs["right"])) == [(1, 1), (0, 0)]
+    assert pairs["score"].is_monotonic_decreasing
+
+    # N-grams shared by too many keys don't form candidates on their own
+    assert fuzzy_pairs(pd.Series(["ab", "ab "]), pd.Series(["ab"]), 0, 1).empty
+
+
+def test_fuzzy_component():
+    left = pd.DataFrame({"ref": ["A-100", " a-200", "B-300"], "amount": [1, 2, 3]})
+    right = pd.DataFrame({"ref": ["a-100", "A-200", "B-3000"], "amount": [1, 2, 3]})
+
+    recon = rc.Reconcile.read_df(
+        left, right, "ref", "ref", key_normalizers=["strip", "lower"]
+    )
+    assert len(recon.both) == 2
+    assert "fuzzy" not in recon._all
+
+    recon = rc.Reconcile.read_df(left, right, "ref", "ref", fuzzy_threshold=0.5)
+    assert "fuzzy" in recon._all
+    assert list(recon.fuzzy["ref_left"]) == ["B-300"]
+    assert list(recon.fuzzy["index_right"]) == [2]
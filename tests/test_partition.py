@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import recon as rc
+
+
+@pytest.fixture()
+def left_df():
+    return pd.DataFrame(
+        {"key": [1, 1, 2, 3, 5, 6, 6], "amount": [10, 10, 20, 30, 50, 60, 61]}
+    )
+
+
+@pytest.fixture()
+def right_df():
+    return pd.DataFrame({"key": [1, 2, 2, 4, 6], "value": ["a", "b", "b", "d", "f"]})
+
+
+def test_reconcile_partitioned(
+    tmp_path: Path, left_df: pd.DataFrame, right_df: pd.DataFrame
+):
+    left_df.to_csv(tmp_path / "left.csv", index=False)
+    right_df.to_csv(tmp_path / "right.csv", index=False)
+
+    report = rc.reconcile_partitioned(
+        tmp_path / "left.csv",
+        tmp_path / "right.csv",
+        left_on="key",
+        right_on="key",
+        output_dir=tmp_path / "out",
+        partitions=3,
+        chunksize=2,
+    )
+    expected = rc.Reconcile.read_df(left_df, right_df, left_on="key", right_on="key")
+
+    assert report.relationship == expected.relationship
+    assert report.left_stats.rows == len(left_df)
+    assert report.left_stats.both_rows == len(expected.left_both)
+    assert report.left_stats.unique_rows == len(expected.left_only)
+    assert report.right_stats.duplicated_rows == len(expected.right_duplicate)
+
+    for component in ["left_only", "right_only", "left_both", "right_both"]:
+        result = pd.read_csv(report.path / f"{component}.csv", index_col="index")
+        assert sorted(result.index) == sorted(getattr(expected, component).index)
+
+    both = pd.read_csv(report.path / "both.csv")
+    assert len(both) == len(expected.both)
+
+
+def test_reconcile_partitioned_missing_key(tmp_path: Path, left_df: pd.DataFrame):
+    left_df.to_csv(tmp_path / "left.csv", index=False)
+
+    with pytest.raises(ValueError, match="left_on"):
+        rc.reconcile_partitioned(
+            tmp_path / "left.csv",
+            tmp_path / "left.csv",
+            left_on="missing",
+            right_on="key",
+            output_dir=tmp_path / "out",
+        )
+
+
+def test_reconcile_partitioned_blank_key(tmp_path: Path):
+    # The chunk holding the blank key reads its keys as floats
+    (tmp_path / "left.csv").write_text("k,v\n1,0\n2,1\n3,2\n4,3\n,4\n6,5\n")
+    pd.DataFrame({"k": range(1, 7)}).to_csv(tmp_path / "right.csv", index=False)
+
+    report = rc.reconcile_partitioned(
+        tmp_path / "left.csv",
+        tmp_path / "right.csv",
+        left_on="k",
+        right_on="k",
+        output_dir=tmp_path / "out",
+        partitions=4,
+        chunksize=3,
+    )
+    expected = rc.Reconcile.read_files(
+        tmp_path / "left.csv", tmp_path / "right.csv", "k", "k"
+    )
+    assert report.left_stats.both_rows == len(expected.left_both) == 5
+    assert report.right_stats.unique_rows == len(expected.right_only) == 1
+
+
+def test_reconcile_partitioned_text_key(tmp_path: Path):
+    # The first chunk reads its keys as text and the second as integers
+    (tmp_path / "left.csv").write_text("k\nA1\n4\n5\n4\n5\n6\n")
+    (tmp_path / "right.csv").write_text("k\nA1\n4\n")
+
+    report = rc.reconcile_partitioned(
+        tmp_path / "left.csv",
+        tmp_path / "right.csv",
+        left_on="k",
+        right_on="k",
+        output_dir=tmp_path / "out",
+        partitions=4,
+        chunksize=3,
+    )
+    expected = rc.Reconcile.read_files(
+        tmp_path / "left.csv", tmp_path / "right.csv", "k", "k"
+    )
+    assert report.left_stats == expected.left_stats
+    assert report.left_stats.both_rows == 3
+    assert report.relationship == expected.relationship
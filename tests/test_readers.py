@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon import readers
+
+
+@pytest.fixture()
+def xlsx_file():
+    xlsx_file = BytesIO()
+    pd.DataFrame({"Type": ["Maple", "Oak"]}).to_excel(xlsx_file, index=False)
+    xlsx_file.seek(0)
+    return xlsx_file
+
+
+@pytest.fixture()
+def csv_file():
+    return StringIO("Type,Leaf Color,Height\nMaple,Red,549\nOak,Green,783\n")
+
+
+def test_sniff_format(tmp_path: Path, xlsx_file: BytesIO, csv_file: StringIO):
+    assert readers.sniff_format(xlsx_file) == "excel"
+    assert xlsx_file.tell() == 0
+    assert readers.sniff_format(csv_file) == "csv"
+    assert readers.sniff_format(BytesIO(b"PAR1....")) == "parquet"
+    assert readers.sniff_format(tmp_path / "data.XLSX") == "excel"
+    assert readers.sniff_format(None) == "csv"
+
+    # Unknown extensions fall back to the leading bytes
+    path = tmp_path / "extract.dat"
+    path.write_bytes(b"ARROW1\x00\x00")
+    assert readers.sniff_format(path) == "arrow"
+
+
+def test_read_tsv(tmp_path: Path):
+    path = tmp_path / "trees.tsv"
+    path.write_text("Type\tLeaf Color\nMaple\tRed\nOak\tGreen\n")
+
+    assert readers.sniff_format(path) == "tsv"
+    df = rc.Reconcile._read_obj(path, columns=["Type"])
+    assert list(df.columns) == ["Type"]
+    assert list(df["Type"]) == ["Maple", "Oak"]
+
+
+def test_read_arrow_columns(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    feather = pytest.importorskip("pyarrow.feather")
+    path = tmp_path / "trees.feather"
+    pd.DataFrame({"Type": ["Maple"], "Height": [549], "Age": [40]}).to_feather(path)
+
+    calls = []
+    read_table = feather.read_table
+
+    def spy(*args, **kwargs):
+        calls.append(kwargs.get("columns"))
+        return read_table(*args, **kwargs)
+
+    monkeypatch.setattr(feather, "read_table", spy)
+    df = readers.read_arrow(path, columns=["Age", "Type", "missing"])
+    # Only the requested columns are read from the file, in file order
+    assert calls == [["Type", "Age"]]
+    assert list(df.columns) == ["Type", "Age"]
+
+
+def test_register_reader(csv_file: StringIO):
+    calls = []
+
+    def read_custom(data, sheet_name=None, columns=None, **kwargs):
+        calls.append(kwargs)
+        return pd.read_csv(data, **kwargs)
+
+    rc.register_reader("custom_csv", read_custom, extensions=(".custom",))
+    try:
+        assert readers.sniff_format("data.custom") == "custom_csv"
+        df = rc.Reconcile._read_obj(csv_file, reader="custom_csv", sep=",")
+        assert list(df.columns) == ["Type", "Leaf Color", "Height"]
+        assert calls == [{"sep": ","}]
+    finally:
+        readers._READERS.pop("custom_csv")
+
+    with pytest.raises(ValueError, match="Unknown reader"):
+        rc.Reconcile._read_obj(csv_file, reader="custom_csv")
@@ -2,15 +2,20 @@ from __future__ import annotations
 
 import csv
 import pickle
+import threading
 from io import BytesIO, StringIO
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
 import recon as rc
+from recon import loading, readers
+from recon.loading import sheet_tasks
+from recon.reconcile import ReconciledData
 
 
 @pytest.fixture()
@@ -74,26 +79,23 @@ def csv_file():
 
 def test_reconcile_attributes(s1: pd.Series, df2: pd.Series, recon: rc.Reconcile):
     # Expected data
-    left_only = (
-        pd.DataFrame({"left": [3], "index_left": [3]})
-        .convert_dtypes()
-        .set_index("index_left")
+    # Components keep the dtypes of the loaded datasets, here mixed objects
+    left_only = pd.DataFrame(
+        {"left": [3]},
+        dtype=object,
+        index=pd.Index([3], dtype="Int64", name="index_left"),
     )
-    left_duplicate = (
-        pd.DataFrame({"left": [1], "index_left": [1]})
-        .convert_dtypes()
-        .set_index("index_left")
+    left_duplicate = pd.DataFrame(
+        {"left": [1]}, dtype=object, index=pd.Index([1], name="index_left")
     )
 
-    right_only = (
-        pd.DataFrame({"right": [4], "index_right": [4]})
-        .convert_dtypes()
-        .set_index("index_right")
+    right_only = pd.DataFrame(
+        {"right": [4]},
+        dtype=object,
+        index=pd.Index([4], dtype="Int64", name="index_right"),
     )
-    right_duplicate = (
-        pd.DataFrame({"right": [2], "index_right": [2]})
-        .convert_dtypes()
-        .set_index("index_right")
+    right_duplicate = pd.DataFrame(
+        {"right": [2]}, dtype=object, index=pd.Index([2], name="index_right")
     )
 
     both = pd.DataFrame(
@@ -164,6 +166,57 @@ def test_read_files(tmp_path: Path, s1: pd.Series, df2: pd.DataFrame):
     assert recon2
 
 
+def test_read_files_concurrently(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "left.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"key": [1, 2]}).to_excel(writer, "Jan", index=False)
+        pd.DataFrame({"key": [3]}).to_excel(writer, "Feb", index=False)
+    pd.DataFrame({"key": [2, 3, 4]}).to_csv(tmp_path / "right.csv", index=False)
+
+    recon2 = rc.Reconcile.read_files(
+        path,
+        tmp_path / "right.csv",
+        left_on="key",
+        right_on="key",
+        left_kwargs={"sheet_name": ["Jan", "Feb"]},
+    )
+    assert list(recon2.left["key"]) == [1, 2, 3]
+    assert recon2.left_sheet_name == "Jan, Feb"
+    assert list(recon2.right_only["key"]) == [4]
+    assert [t.stage for t in recon2.timings].count("read_left") == 2
+
+    # Processes are only started for several sheets, on several CPUs
+    monkeypatch.setattr(loading, "available_cpus", lambda: 4)
+    one_sheet = sheet_tasks("left", path, {"sheet_name": "Jan"})
+    two_sheets = sheet_tasks("left", path, {"sheet_name": ["Jan", "Feb"]})
+    assert loading.process_tasks(one_sheet) == []
+    assert loading.process_tasks(two_sheets) == two_sheets
+    monkeypatch.setattr(loading, "available_cpus", lambda: 1)
+    assert loading.process_tasks(two_sheets) == []
+
+    # The left keys are validated without waiting for the right dataset
+    released = threading.Event()
+
+    def read_blocked(data, sheet_name=None, columns=None, **kwargs):
+        released.wait(10)
+        return pd.read_csv(data, **kwargs)
+
+    rc.register_reader("blocked", read_blocked)
+    try:
+        with pytest.raises(ValueError, match=r"left_on \(id\) doesn't exist"):
+            rc.Reconcile.read_files(
+                tmp_path / "right.csv",
+                tmp_path / "right.csv",
+                left_on="id",
+                right_on="key",
+                right_kwargs={"reader": "blocked"},
+            )
+        assert not released.is_set()
+    finally:
+        released.set()
+        readers._READERS.pop("blocked")
+
+
 def test__read_obj(csv_file, xlsx_file):
     # The different possible errors are tested partly for documentation purposes
     with pytest.raises(ValueError, match="Invalid file path or buffer object type"):
@@ -186,3 +239,227 @@ def test__read_obj(csv_file, xlsx_file):
 
     assert isinstance(rc.Reconcile._read_obj(xlsx_file, "Tree Data"), pd.DataFrame)
     assert isinstance(rc.Reconcile._read_obj(csv_file), pd.DataFrame)
+
+
+def test_composite_key():
+    left = pd.DataFrame(
+        {"entity": [1, 2, 1, 2, 3], "doc_no": ["x", "y", "y", "x", "z"], "v": range(5)}
+    )
+    right = pd.DataFrame(
+        {"entity": [2, 1, 9, 1], "document": ["y", "y", "q", "x"], "w": range(4)}
+    )
+
+    recon3 = rc.Reconcile.read_df(
+        left, right, left_on=["entity", "doc_no"], right_on=["entity", "document"]
+    )
+    expected = pd.merge(
+        left.reset_index(names="index"),
+        right.reset_index(names="index"),
+        left_on=["entity", "doc_no"],
+        right_on=["entity", "document"],
+        how="outer",
+        indicator=True,
+        suffixes=("_left", "_right"),
+    )
+
+    pd.testing.assert_frame_equal(
+        recon3.all_data, expected[recon3.all_data.columns], check_dtype=False
+    )
+    assert list(recon3.left_only.index) == [3, 4]
+    assert list(recon3.right_only.index) == [2]
+    assert recon3.relationship == rc.Relationship.ONE_TO_ONE
+
+    with pytest.raises(ValueError, match=r"left_on \(line\) doesn't exist"):
+        rc.Reconcile.read_df(
+            left, right, left_on=["entity", "line"], right_on=["entity", "document"]
+        )
+    with pytest.raises(ValueError, match="same number of columns"):
+        rc.Reconcile.read_df(left, right, left_on=["entity", "doc_no"], right_on="w")
+
+
+def test_read_files_columnar(tmp_path: Path):
+    pytest.importorskip("pyarrow")
+
+    left = pd.DataFrame({"key": [1, 2, 3, 4], "amount": [1.0, 2.0, 3.0, 4.0]})
+    left["unused"] = "x"
+    right = pd.DataFrame({"key": [2, 3, 5], "amount": [2.0, 3.5, 5.0], "memo": "y"})
+    left.to_parquet(tmp_path / "left.parquet", row_group_size=2)
+    right.to_feather(tmp_path / "right.feather")
+
+    recon2 = rc.Reconcile.read_files(
+        tmp_path / "left.parquet",
+        tmp_path / "right.feather",
+        left_on="key",
+        right_on="key",
+        columns=["amount"],
+    )
+    assert list(recon2.left.columns) == ["key", "amount"]
+    assert list(recon2.right.columns) == ["key", "amount"]
+    assert len(recon2.left_both) == 2
+
+    recon3 = rc.Reconcile.read_files(
+        tmp_path / "left.parquet",
+        tmp_path / "right.feather",
+        left_on="key",
+        right_on="key",
+        left_kwargs={"filters": [("key", ">", 2)]},
+    )
+    assert list(recon3.left["key"]) == [3, 4]
+
+
+def test_stats(recon: rc.Reconcile, capsys):
+    recon.info()
+    assert "Right: 4 common + 1 unique = 5 records" in capsys.readouterr().out
+    # Counts come from the key codes without building any component
+    assert not {"left_both", "left_only", "left_duplicate"} & set(vars(recon))
+
+    for side in ("left", "right"):
+        stats = getattr(recon, f"{side}_stats")
+        assert stats.rows == len(getattr(recon, side))
+        assert stats.both_rows == len(getattr(recon, f"{side}_both"))
+        assert stats.unique_rows == len(getattr(recon, f"{side}_only"))
+        assert stats.duplicated_rows == len(getattr(recon, f"{side}_duplicate"))
+
+
+def test_duplicates_mixed_types():
+    left = pd.DataFrame({"k": [1, "1", 2.5, "2.5", "1"], "v": ["x"] * 5})
+    right = pd.DataFrame({"k": [1, 1], "v": ["x", "x"]})
+    recon2 = rc.Reconcile.read_df(left, right, "k", "k")
+
+    # 1 and "1" are different values, as for DataFrame.duplicated
+    assert list(recon2.left_duplicate.index) == [4]
+    assert recon2.left_stats.duplicated_rows == 1
+
+    # Rows sharing a fingerprint are compared before being reported
+    recon2.__dict__["right_fingerprints"] = np.zeros(2, dtype=np.uint64)
+    recon2.__dict__["left_fingerprints"] = np.zeros(5, dtype=np.uint64)
+    assert list(recon2.right_duplicate.index) == [1]
+    assert list(recon2.left_duplicate.index) == [4]
+
+
+def test_dtype_backend():
+    pytest.importorskip("pyarrow")
+
+    left = pd.DataFrame({"key": ["a", "b", "c"], "amount": [1.0, None, 3.0]})
+    right = pd.DataFrame({"key": ["b", "c", "d"], "amount": [2, 3, 4]})
+
+    recon2 = rc.Reconcile.read_df(
+        left, right, left_on="key", right_on="key", dtype_backend="pyarrow"
+    )
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in recon2.left.dtypes)
+    assert isinstance(recon2.left_only["amount_left"].dtype, pd.ArrowDtype)
+    assert list(recon2.both["key"]) == ["b", "c"]
+    assert recon2.right_stats.unique_rows == 1
+
+    with pytest.raises(ValueError, match=r"Unknown dtype backend \(numpy\)"):
+        rc.Reconcile.read_df(left, right, "key", "key", dtype_backend="numpy")
+
+
+def test_match_tolerance():
+    invoices = pd.DataFrame(
+        {
+            "customer": ["a", "a", "b", "c"],
+            "date": ["2023-01-01", "2023-01-10", "2023-01-05", "2023-01-01"],
+            "amount": [10.0, 20.0, 30.0, 40.0],
+        }
+    )
+    payments = pd.DataFrame(
+        {
+            "customer": ["a", "b", "a", "b"],
+            "date": ["2023-01-03", "2023-01-20", "2023-01-11", "2023-01-06"],
+            "amount": [10.0, 30.0, 20.004, 30.0],
+        }
+    )
+
+    recon2 = rc.Reconcile.read_df(
+        invoices, payments, "customer", "customer", match_tolerance={"date": "3D"}
+    )
+    assert list(zip(recon2.both["index_left"], recon2.both["index_right"])) == [
+        (0, 0),
+        (1, 2),
+        (2, 3),
+    ]
+    assert list(recon2.left_only.index) == [3]
+    assert list(recon2.right_only.index) == [1]
+    assert recon2.right_stats.both_rows == 3
+    assert len(recon2.all_data) == 5
+
+    # Without exact keys, records match on the tolerance column alone
+    recon3 = rc.Reconcile.read_df(
+        invoices, payments, [], [], match_tolerance={"amount": 0.01}
+    )
+    assert list(recon3.left_only.index) == [3]
+
+    with pytest.raises(ValueError, match="must hold numbers"):
+        rc.Reconcile.read_df(invoices, payments, [], [], match_tolerance={"date": 1})
+    with pytest.raises(ValueError, match="exactly one column"):
+        rc.Reconcile.read_df(
+            invoices, payments, [], [], match_tolerance={"date": "1D", "amount": 1}
+        )
+
+
+def test_timings(s1: pd.Series, df2: pd.DataFrame, tmp_path: Path):
+    finished = []
+    recon2 = rc.Reconcile.read_df(
+        s1, df2, left_on="left", right_on="right", on_stage=finished.append
+    )
+    recon2.left_only
+    recon2.to_csv_dir(tmp_path, ["left_only", "right_only"])
+
+    stages = [timing.stage for timing in recon2.timings]
+    assert stages == [
+        "convert_dtypes",
+        "normalize_keys",
+        "encode_keys",
+        "classify",
+        "left_only",
+        "right_only",
+        "write",
+    ]
+    assert finished == recon2.timings
+
+    left_only = recon2.timings[stages.index("left_only")]
+    assert (left_only.rows_in, left_only.rows_out) == (10, 1)
+    assert recon2.timings[-1].rows_out == 2
+    assert recon2.to_object().timings == recon2.timings
+
+
+def test_polars_engine(s1: pd.Series, df2: pd.DataFrame, recon: rc.Reconcile):
+    pytest.importorskip("polars")
+    recon2 = rc.Reconcile.read_df(
+        s1, df2, left_on="left", right_on="right", engine="polars"
+    )
+
+    for component in ["all_data", "both", "left_only", "right_only", "left_both"]:
+        pd.testing.assert_frame_equal(
+            getattr(recon2, component), getattr(recon, component)
+        )
+    assert recon2.relationship == recon.relationship
+
+    with pytest.raises(ValueError, match="Unknown engine"):
+        rc.Reconcile.read_df(s1, df2, left_on="left", right_on="right", engine="x")
+
+
+def test_lazy_components(recon: rc.Reconcile):
+    report = recon.to_object()
+    # Components are built on access without being cached on the Reconcile object
+    pd.testing.assert_frame_equal(report.data.left_only, recon.left_only)
+    assert "both" not in vars(recon)
+    assert recon.left_duplicate is report.data.left_duplicate is not None
+    assert report.data.both is report.data.both
+
+    # Pickled reports hold their components rather than the datasets
+    data = pickle.loads(pickle.dumps(report.data))
+    assert "_recon" not in vars(data)
+    pd.testing.assert_frame_equal(data.right_only, recon.right_only)
+
+    data = ReconciledData(*[recon.left_only] * 5)
+    assert data.both is recon.left_only
+    with pytest.raises(AttributeError):
+        data.left_both
+
+    recon.all_data
+    recon.release()
+    assert not {"all_data", "both", "left_only"} & set(vars(recon))
+    assert recon._classification.both_left.dtype == np.int32
+    assert len(recon.all_data) == 7
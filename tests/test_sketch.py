@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon.sketch import KeySketch, sketch_file
+
+
+def test_estimate(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    left = pd.DataFrame({"id": rng.integers(0, 20_000, 30_000)})
+    right = pd.DataFrame({"id": np.arange(10_000, 40_000), "v": "x"})
+    left.to_csv(tmp_path / "left.csv", index=False)
+    right.to_csv(tmp_path / "right.csv", index=False)
+
+    result = rc.Reconcile.estimate(
+        tmp_path / "left.csv",
+        tmp_path / "right.csv",
+        "id",
+        "id",
+        chunksize=7_000,
+    )
+
+    left_keys = left["id"].nunique()
+    common = len(set(left["id"]) & set(right["id"]))
+    assert result.left_rows == 30_000
+    assert result.left_keys == pytest.approx(left_keys, rel=0.02)
+    assert result.right_keys == pytest.approx(30_000, rel=0.02)
+    assert result.common_keys == pytest.approx(common, rel=0.05)
+    assert result.left_duplicate_rate == pytest.approx(1 - left_keys / 30_000, abs=0.02)
+    assert result.relationship == rc.Relationship.MANY_TO_ONE
+
+    with pytest.raises(ValueError, match=r"left_on \(x\) doesn't exist"):
+        rc.Reconcile.estimate(tmp_path / "left.csv", tmp_path / "right.csv", "x", "id")
+
+
+def test_saved_sketch(tmp_path: Path):
+    pd.DataFrame({"id": range(1_000)}).to_csv(tmp_path / "today.csv", index=False)
+    pd.DataFrame({"id": range(500, 1_200)}).to_parquet(tmp_path / "yesterday.parquet")
+
+    yesterday = sketch_file(tmp_path / "yesterday.parquet", "id")
+    yesterday.save(tmp_path / "yesterday.hll")
+    loaded = KeySketch.load(tmp_path / "yesterday.hll")
+    np.testing.assert_array_equal(loaded.registers, yesterday.registers)
+
+    # Keys hash alike whatever the format they're read from
+    result = rc.Reconcile.estimate(tmp_path / "today.csv", loaded, "id", "id")
+    assert result.common_keys == pytest.approx(500, abs=5)
+    assert result.relationship == rc.Relationship.ONE_TO_ONE
+
+    with pytest.raises(ValueError, match="same precision"):
+        rc.Reconcile.estimate(tmp_path / "today.csv", loaded, "id", "id", precision=12)
+
+
+def test_sketch_formats(tmp_path: Path):
+    # The blank key reads the Parquet keys as floats
+    pd.DataFrame({"k": [*range(1_000), None]}).to_parquet(tmp_path / "left.parquet")
+    pd.DataFrame({"k": range(1_000)}).to_csv(tmp_path / "right.csv", index=False)
+
+    result = rc.Reconcile.estimate(
+        tmp_path / "left.parquet", tmp_path / "right.csv", "k", "k"
+    )
+    expected = rc.Reconcile.read_files(
+        tmp_path / "left.parquet", tmp_path / "right.csv", "k", "k"
+    )
+    assert result.common_keys == pytest.approx(len(expected.both), abs=10)
+    assert result.left_keys == pytest.approx(1_001, abs=10)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon.snapshot import Snapshot
+
+
+@pytest.fixture()
+def left():
+    return pd.DataFrame({"id": [1, 2, 2, 3], "amount": [10, 20, 20, 30]})
+
+
+@pytest.fixture()
+def right():
+    return pd.DataFrame({"ref": [2, 3, 4], "amount": [20, 31, 40]})
+
+
+def _stats(recon: rc.Reconcile):
+    return recon.left_stats, recon.right_stats, recon.relationship
+
+
+def test_snapshot(tmp_path: Path, left: pd.DataFrame, right: pd.DataFrame):
+    recon = rc.Reconcile.read_df(left, right, left_on="id", right_on="ref")
+    recon.to_snapshot(tmp_path)
+
+    snapshot = Snapshot.load(tmp_path)
+    assert (snapshot.left_stats, snapshot.right_stats, snapshot.relationship) == (
+        _stats(recon)
+    )
+
+    left_added = pd.DataFrame(
+        {"id": [4, 5, 1], "amount": [40, 50, 10]}, index=[4, 5, 6]
+    )
+    right_removed = right.iloc[[1]]
+    snapshot, delta = snapshot.update(left=left_added, right_removed=right_removed)
+    snapshot.save(tmp_path)
+
+    expected = rc.Reconcile.read_df(
+        pd.concat([left, left_added]), right.drop(index=1), "id", "ref"
+    )
+    snapshot = Snapshot.load(tmp_path)
+    assert (snapshot.left_stats, snapshot.right_stats, snapshot.relationship) == (
+        _stats(expected)
+    )
+
+    assert list(delta.left_only.index) == [5, 6]
+    assert list(delta.left_both.index) == [4]
+    assert list(delta.left_duplicate.index) == [6]
+    assert delta.keys.set_index("id")["status"].to_dict() == {
+        1: "left_only",
+        3: "left_only",
+        4: "both",
+        5: "left_only",
+    }
+    assert delta.keys.set_index("id")["status_before"][3] == "both"
+
+    with pytest.raises(ValueError, match="removed right records aren't within"):
+        snapshot.update(right_removed=right_removed)
+
+
+def test_snapshot_diff(left: pd.DataFrame, right: pd.DataFrame):
+    snapshot = rc.Reconcile.read_df(left, right, "id", "ref").to_snapshot()
+
+    changed = left.copy()
+    changed.loc[3, "amount"] = 33
+    changed.loc[4] = [9, 90]
+
+    snapshot, delta = snapshot.diff(changed, right)
+    assert list(delta.left_only.index) == [4]
+    assert list(delta.left_both.index) == [3]
+    assert set(delta.keys["id"]) == {3, 9}
+
+    expected = rc.Reconcile.read_df(changed, right, "id", "ref")
+    assert (snapshot.left_stats, snapshot.right_stats, snapshot.relationship) == (
+        _stats(expected)
+    )
+
+
+def test_snapshot_mixed_dtypes(left: pd.DataFrame, right: pd.DataFrame):
+    snapshot = rc.Reconcile.read_df(left, right, "id", "ref").to_snapshot()
+
+    # A blank key turns the other keys into floats
+    left_added = pd.DataFrame({"id": [4.0, None], "amount": [40, 50]}, index=[4, 5])
+    snapshot, delta = snapshot.update(left=left_added)
+
+    expected = rc.Reconcile.read_df(pd.concat([left, left_added]), right, "id", "ref")
+    assert (snapshot.left_stats, snapshot.right_stats, snapshot.relationship) == (
+        _stats(expected)
+    )
+    assert list(delta.left_both.index) == [4]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon import sql
+
+
+@pytest.fixture()
+def frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    left = pd.DataFrame({"k": [1, 1, 2, 3, None, 5], "v": list("abcdef")})
+    right = pd.DataFrame({"id": [1, 2, 2, None, 4], "w": list("vwxyz")})
+    return left, right
+
+
+@pytest.fixture()
+def database(tmp_path: Path, frames) -> Path:
+    path = tmp_path / "ledger.db"
+    with sqlite3.connect(path) as con:
+        frames[0].to_sql("gl", con, index=False)
+        frames[1].to_sql("bank", con, index=False)
+    con.close()
+    return path
+
+
+def test_read_sql(database: Path, frames):
+    expected = rc.Reconcile.read_df(*frames, left_on="k", right_on="id")
+    recon = rc.Reconcile.read_sql("gl", "bank", "k", "id", f"sqlite:///{database}")
+
+    for component in ["all_data", "both", "left_only", "right_only", "left_both"]:
+        pd.testing.assert_frame_equal(
+            getattr(recon, component),
+            getattr(expected, component),
+            check_dtype=False,
+            check_index_type=False,
+        )
+
+    with pytest.raises(ValueError, match=r"left_on \(x\) doesn't exist"):
+        rc.Reconcile.read_sql("gl", "bank", "x", "id", f"sqlite:///{database}")
+
+
+@pytest.mark.parametrize(
+    "components, rows",
+    [
+        (["left_only"], (2, 0)),
+        (["left_only", "right_only"], (2, 1)),
+        (["both"], (4, 4)),
+        (["left_duplicate"], (6, 0)),
+    ],
+)
+def test_read_sql_pushdown(database: Path, frames, components, rows):
+    expected = rc.Reconcile.read_df(*frames, left_on="k", right_on="id")
+    with sqlite3.connect(database) as con:
+        recon = rc.Reconcile.read_sql(
+            "gl",
+            "SELECT * FROM bank",
+            "k",
+            "id",
+            con,
+            recon_components=components,
+            chunksize=2,
+        )
+    con.close()
+
+    # Only the records the components need are fetched
+    assert (len(recon.left), len(recon.right)) == rows
+    for component in components:
+        # The index of both is its row within all_data, of the fetched records
+        pd.testing.assert_frame_equal(
+            getattr(recon, component).reset_index(drop=component == "both"),
+            getattr(expected, component).reset_index(drop=component == "both"),
+            check_dtype=False,
+            check_index_type=False,
+        )
+
+
+def test_read_files_url(database: Path):
+    recon = rc.Reconcile.read_files(
+        f"sqlite:///{database}?table=gl",
+        f"sqlite:///{database}?query=SELECT+id,+w+FROM+bank+WHERE+id+>+1",
+        left_on="k",
+        right_on="id",
+        columns=["v"],
+    )
+    assert list(recon.left.columns) == ["k", "v"]
+    assert list(recon.right_only["id"]) == [4]
+
+    with pytest.raises(ValueError, match="either a table or a query"):
+        sql.parse_url(f"sqlite:///{database}?table=gl&query=x")
+    with pytest.raises(FileNotFoundError):
+        sql.read_url("sqlite:///missing.db?table=gl")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import recon as rc
+from recon.writers import write_csv_dir, write_parquet, write_xlsx, writer_for
+
+
+@pytest.fixture()
+def recon():
+    left = pd.DataFrame(
+        {
+            "key": [1, 2, 2, 3],
+            "amount": [1.5, None, 2.5, 3.0],
+            "date": pd.to_datetime(["2023-01-01", None, "2023-01-03", "2023-01-04"]),
+        }
+    )
+    right = pd.DataFrame({"key": [2, 3, 4], "memo": ["b", None, "d"]})
+    return rc.Reconcile.read_df(left, right, left_on="key", right_on="key")
+
+
+@pytest.mark.parametrize("chunksize", [1, 50_000])
+def test_write_xlsx(tmp_path: Path, recon: rc.Reconcile, chunksize: int):
+    path = tmp_path / "results.xlsx"
+    write_xlsx(path, recon._components(["all"]), chunksize)
+
+    sheets = pd.read_excel(path, sheet_name=None, index_col="index")
+    assert list(sheets) == recon._all
+
+    for component, frame in sheets.items():
+        expected = getattr(recon, component)
+        assert list(frame.columns) == list(expected.columns)
+        assert len(frame) == len(expected)
+
+    assert sheets["left_both"]["amount"].isna().sum() == 1
+
+
+def test_write_csv_dir(tmp_path: Path, recon: rc.Reconcile):
+    progress = []
+    write_csv_dir(
+        tmp_path,
+        recon._components(["left_only", "right_only", "left_both"]),
+        1,
+        lambda *args: progress.append(args),
+    )
+    assert progress == [
+        ("left_only", 1, 1),
+        ("right_only", 1, 1),
+        ("left_both", 1, 3),
+        ("left_both", 2, 3),
+        ("left_both", 3, 3),
+    ]
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "left_both.csv",
+        "left_only.csv",
+        "right_only.csv",
+    ]
+    right_only = pd.read_csv(tmp_path / "right_only.csv", index_col="index")
+    assert list(right_only["key"]) == [4]
+
+
+def test_write_parquet(tmp_path: Path, recon: rc.Reconcile):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    write_parquet(tmp_path, recon._components(["all_data"]), 2)
+
+    file = pq.ParquetFile(tmp_path / "all_data.parquet")
+    assert file.num_row_groups == 3
+
+    all_data = pd.read_parquet(tmp_path / "all_data.parquet")
+    assert len(all_data) == len(recon.all_data)
+    assert list(all_data.columns) == ["index", *recon.all_data.columns]
+
+
+def test_write_parquet_empty_suffix(tmp_path: Path):
+    pytest.importorskip("pyarrow")
+    left = pd.DataFrame({"key": [1, 2], "amount": [1.0, 2.0]})
+    right = pd.DataFrame({"key": [2, 3], "amount": [2.0, 3.0]})
+    result = rc.Reconcile.read_df(left, right, "key", "key", suffixes=("", "_r"))
+
+    write_parquet(tmp_path, result._components(["all_data", "both"]))
+
+    # all_data already has an index column, from the left records
+    both = pd.read_parquet(tmp_path / "both.parquet")
+    assert list(both.columns) == ["_index", *result.both.columns]
+    assert list(both["_index"]) == list(result.both.index)
+
+
+def test_writer_for():
+    assert writer_for("results.XLSX") is write_xlsx
+    assert writer_for("results.parquet") is write_parquet
+    assert writer_for("results") is write_csv_dir
+
+    with pytest.raises(ValueError, match=r"Unsupported output format \(\.json\)"):
+        writer_for("results.json")